@@ -14,6 +14,14 @@
   var scorm = new SCORMWrapper();
   scorm.initialize();
 
+  // Slide bookmark lives in the 'nav' namespace of the shared suspend_data
+  // store, next to tracker / gamification data instead of overwriting it
+  var store = SuspendStore.get(scorm);
+  store.register('nav', { priority: 100, budget: 8 });
+
+  // Read before the SlideController reports slide 0 and overwrites it
+  var resumeIndex = store.get('nav');
+
   // Check current status — only set "incomplete" if not already completed
   // (This prevents resetting progress if the learner revisits)
   var currentStatus = scorm.getLessonStatus();
@@ -39,8 +47,8 @@
       }
 
       // Save bookmark so learner can resume at this slide
-      scorm.setBookmark(index.toString());
-      scorm.commit();
+      store.set('nav', index);
+      store.save();
     },
 
     // Called when learner clicks "Complete" on the last slide
@@ -71,12 +79,8 @@
 
   // ── Resume Support ───────────────────────────────────────────
   // If the learner left mid-way and comes back, resume where they were
-  var bookmark = scorm.getBookmark();
-  if (bookmark) {
-    var resumeIndex = parseInt(bookmark, 10);
-    if (!isNaN(resumeIndex) && resumeIndex > 0) {
-      controller.resumeFrom(resumeIndex);
-    }
+  if (typeof resumeIndex === 'number' && resumeIndex > 0) {
+    controller.resumeFrom(resumeIndex);
   }
 
   // ── Start Button ─────────────────────────────────────────────
@@ -93,8 +97,8 @@
   window.addEventListener('beforeunload', function() {
     var duration = Math.floor((new Date() - startTime) / 1000);
     scorm.setSessionTime(duration);
-    scorm.setBookmark(controller.currentIndex.toString());
-    scorm.commit();
+    store.set('nav', controller.currentIndex);
+    store.flush();
   });
 
 })();
@@ -14,6 +14,14 @@
   var scorm = new SCORMWrapper();
   scorm.initialize();
 
+  // Slide bookmark lives in the 'nav' namespace of the shared suspend_data
+  // store, next to tracker / gamification data instead of overwriting it
+  var store = SuspendStore.get(scorm);
+  store.register('nav', { priority: 100, budget: 8 });
+
+  // Read before the SlideController reports slide 0 and overwrites it
+  var resumeIndex = store.get('nav');
+
   var currentStatus = scorm.getLessonStatus();
   if (!currentStatus || currentStatus === 'not attempted') {
     scorm.setLessonStatus('incomplete');
@@ -112,8 +120,8 @@
       if (typeof sounds !== 'undefined') {
         sounds.whoosh();
       }
-      scorm.setBookmark(index.toString());
-      scorm.commit();
+      store.set('nav', index);
+      store.save();
     },
 
     onComplete: function() {
@@ -137,20 +145,16 @@
   });
 
   // ── Resume Support ───────────────────────────────────────────
-  var bookmark = scorm.getBookmark();
-  if (bookmark) {
-    var resumeIndex = parseInt(bookmark, 10);
-    if (!isNaN(resumeIndex) && resumeIndex > 0) {
-      controller.resumeFrom(resumeIndex);
-    }
+  if (typeof resumeIndex === 'number' && resumeIndex > 0) {
+    controller.resumeFrom(resumeIndex);
   }
 
   // ── Save on Exit ─────────────────────────────────────────────
   window.addEventListener('beforeunload', function() {
     var duration = Math.floor((new Date() - startTime) / 1000);
     scorm.setSessionTime(duration);
-    scorm.setBookmark(controller.currentIndex.toString());
-    scorm.commit();
+    store.set('nav', controller.currentIndex);
+    store.flush();
   });
 
 })();
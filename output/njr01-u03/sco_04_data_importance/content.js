@@ -6,6 +6,8 @@
   'use strict';
   var scorm = new SCORMWrapper();
   scorm.initialize();
+  var store = SuspendStore.get(scorm); store.register('nav', { priority: 100, budget: 8 });
+  var ri = store.get('nav');
   var currentStatus = scorm.getLessonStatus();
   if (!currentStatus || currentStatus === 'not attempted') { scorm.setLessonStatus('incomplete'); scorm.commit(); }
   var startTime = new Date();
@@ -147,7 +149,7 @@
 
   // ── Slide Controller ─────────────────────────────────────────
   var controller = new SlideController({
-    onSlideChange: function(index) { if (typeof sounds !== 'undefined') sounds.whoosh(); scorm.setBookmark(index.toString()); scorm.commit(); },
+    onSlideChange: function(index) { if (typeof sounds !== 'undefined') sounds.whoosh(); store.set('nav', index); store.save(); },
     onComplete: function() {
       var duration = Math.floor((new Date() - startTime) / 1000);
       scorm.setSessionTime(duration); scorm.setLessonStatus('completed'); scorm.commit();
@@ -156,7 +158,6 @@
       if (btn) { btn.textContent = 'تم ✓'; btn.disabled = true; btn.style.background = 'var(--color-success)'; btn.style.color = '#fff'; }
     }
   });
-  var bm = scorm.getBookmark();
-  if (bm) { var ri = parseInt(bm, 10); if (!isNaN(ri) && ri > 0) controller.resumeFrom(ri); }
-  window.addEventListener('beforeunload', function() { scorm.setSessionTime(Math.floor((new Date() - startTime) / 1000)); scorm.setBookmark(controller.currentIndex.toString()); scorm.commit(); });
+  if (typeof ri === 'number' && ri > 0) controller.resumeFrom(ri);
+  window.addEventListener('beforeunload', function() { scorm.setSessionTime(Math.floor((new Date() - startTime) / 1000)); store.set('nav', controller.currentIndex); store.flush(); });
 })();
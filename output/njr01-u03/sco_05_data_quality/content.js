@@ -5,6 +5,8 @@
 (function() {
   'use strict';
   var scorm = new SCORMWrapper(); scorm.initialize();
+  var store = SuspendStore.get(scorm); store.register('nav', { priority: 100, budget: 8 });
+  var ri = store.get('nav');
   var cs = scorm.getLessonStatus();
   if (!cs || cs === 'not attempted') { scorm.setLessonStatus('incomplete'); scorm.commit(); }
   var startTime = new Date();
@@ -76,11 +78,11 @@
 
   // ── Slide Controller ─────────────────────────────────────────
   var controller = new SlideController({
-    onSlideChange: function(i) { if (typeof sounds !== 'undefined') sounds.whoosh(); scorm.setBookmark(i.toString()); scorm.commit(); },
+    onSlideChange: function(i) { if (typeof sounds !== 'undefined') sounds.whoosh(); store.set('nav', i); store.save(); },
     onComplete: function() { var d=Math.floor((new Date()-startTime)/1000); scorm.setSessionTime(d); scorm.setLessonStatus('completed'); scorm.commit();
       if (typeof sounds !== 'undefined') sounds.celebration();
       var b=document.getElementById('nextBtn'); if(b){b.textContent='تم ✓';b.disabled=true;b.style.background='var(--color-success)';b.style.color='#fff';} }
   });
-  var bm=scorm.getBookmark(); if(bm){var ri=parseInt(bm,10);if(!isNaN(ri)&&ri>0)controller.resumeFrom(ri);}
-  window.addEventListener('beforeunload',function(){scorm.setSessionTime(Math.floor((new Date()-startTime)/1000));scorm.setBookmark(controller.currentIndex.toString());scorm.commit();});
+  if(typeof ri==='number'&&ri>0)controller.resumeFrom(ri);
+  window.addEventListener('beforeunload',function(){scorm.setSessionTime(Math.floor((new Date()-startTime)/1000));store.set('nav',controller.currentIndex);store.flush();});
 })();
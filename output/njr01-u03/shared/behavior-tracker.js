@@ -10,6 +10,8 @@
  * - Quiz behavioral signals: time-to-first-click, answer changes, deliberation
  * - Focus/blur tracking as attention proxy
  * - Idle detection
+ * - Low-overhead collection: scroll sampled once per animation frame,
+ *   timestamp-based idle detection, fixed-size typed-array event buffers
  * - Bloom's taxonomy performance tracking
  * - Data compression for SCORM 1.2 storage limits
  * - Works with both SCORM 1.2 and 2004
@@ -54,13 +56,101 @@
     // Maximum navigation path entries to store
     MAX_PATH_LENGTH: 50,
 
-    // Maximum focus/blur events to store in detail
+    // Maximum focus/blur events to keep in detail (ring buffer capacity)
     MAX_FOCUS_BLUR_EVENTS: 20,
 
+    // Maximum help-seeking events to keep in detail (ring buffer capacity)
+    MAX_HELP_EVENTS: 50,
+
+    // Maximum idle periods to keep in detail (ring buffer capacity)
+    MAX_IDLE_PERIODS: 20,
+
     // Maximum assessment interactions to store
-    MAX_ASSESSMENT_ENTRIES: 30
+    MAX_ASSESSMENT_ENTRIES: 30,
+
+    // String table size that triggers compaction down to the strings the
+    // rings still reference (ring refs are Uint16, so it must stay < 65535)
+    MAX_INTERNED_STRINGS: 1024,
+
+    // SuspendStore namespace, priority and byte budget. Behavior data is
+    // the largest and least critical block, so it gets the lowest priority.
+    STORE_NAMESPACE: 'bt',
+    STORE_PRIORITY: 10,
+    STORE_BUDGET: 2800
+  };
+
+  // =========================================================
+  // EVENT RING BUFFER
+  // =========================================================
+
+  /**
+   * Fixed-capacity event log backed by typed arrays.
+   * Once full, the oldest entry is overwritten, so memory and the cost of
+   * reading it back stay constant however long the session runs. Strings
+   * (event types, page IDs) are stored as indexes into the tracker's
+   * string table.
+   * @constructor
+   * @param {number} capacity
+   */
+  function EventRing(capacity) {
+    this.capacity = capacity;
+    this.ts = new Float64Array(capacity);
+    this.kind = new Uint16Array(capacity);
+    this.ref = new Uint16Array(capacity);
+    this.value = new Float64Array(capacity);
+    this.head = 0;
+    this.size = 0;
+    this.total = 0;
+  }
+
+  EventRing.prototype.push = function(ts, kind, ref, value) {
+    var i = this.head;
+    this.ts[i] = ts;
+    this.kind[i] = kind;
+    this.ref[i] = ref;
+    this.value[i] = value || 0;
+    this.head = (i + 1) % this.capacity;
+    if (this.size < this.capacity) this.size++;
+    this.total++;
+  };
+
+  /**
+   * Visit entries oldest to newest: fn(ts, kind, ref, value)
+   */
+  EventRing.prototype.forEach = function(fn) {
+    var start = (this.head - this.size + this.capacity) % this.capacity;
+    for (var n = 0; n < this.size; n++) {
+      var i = (start + n) % this.capacity;
+      fn(this.ts[i], this.kind[i], this.ref[i], this.value[i]);
+    }
   };
 
+  /**
+   * Rewrite the string indexes of the live entries. mapKind is null for
+   * rings whose kind is a constant rather than a string index.
+   */
+  EventRing.prototype.remap = function(mapKind, mapRef) {
+    var start = (this.head - this.size + this.capacity) % this.capacity;
+    for (var n = 0; n < this.size; n++) {
+      var i = (start + n) % this.capacity;
+      if (mapKind) this.kind[i] = mapKind(this.kind[i]);
+      this.ref[i] = mapRef(this.ref[i]);
+    }
+  };
+
+  // Schedule work for the next frame (falls back to a 16 ms timer)
+  var requestFrame = typeof requestAnimationFrame === 'function'
+    ? function(fn) { return requestAnimationFrame(fn); }
+    : function(fn) { return setTimeout(fn, 16); };
+
+  var cancelFrame = typeof cancelAnimationFrame === 'function'
+    ? function(id) { cancelAnimationFrame(id); }
+    : function(id) { clearTimeout(id); };
+
+  // Focus ring event kinds
+  var FOCUS = 0;
+  var BLUR = 1;
+
   // =========================================================
   // BEHAVIOR TRACKER CLASS
   // =========================================================
@@ -71,6 +161,7 @@
    */
   function BehaviorTracker(scormApi) {
     this.scorm = scormApi;
+    this.store = scormApi && global.SuspendStore ? global.SuspendStore.get(scormApi) : null;
     this.data = this._createEmptyDataSet();
     this.currentPage = null;
     this.pageStartTime = null;
@@ -80,6 +171,16 @@
     this.autoSaveTimer = null;
     this.scrollTracker = null;
     this.currentQuizState = null;
+
+    // Signal collection layer
+    this._strings = [''];
+    this._stringIndex = { '': 0 };
+    this._rings = this._createRings();
+    this._blurStart = null;
+    this._metrics = { docHeight: 0, winHeight: 0, stale: true };
+    this._frameId = null;
+    this._scrollPending = false;
+    this._resizeObserver = null;
   }
 
   // =========================================================
@@ -146,8 +247,11 @@
     }
     this._removeEventListeners();
 
-    // Final save
+    // Final save - written immediately, the page may be unloading
     this.save();
+    if (this.store) {
+      this.store.flush();
+    }
   };
 
   // =========================================================
@@ -304,11 +408,7 @@
     this.currentQuizState.hintsUsed += 1;
 
     // Also record as help-seeking event
-    this.data.engagement.helpSeekingEvents.push({
-      type: 'hint',
-      ts: Date.now(),
-      question: this.currentQuizState.questionId
-    });
+    this._recordHelpSeeking('hint', this.currentQuizState.questionId);
   };
 
   /**
@@ -424,11 +524,20 @@
    * @param {string} target - What they accessed
    */
   BehaviorTracker.prototype.trackHelpSeeking = function(type, target) {
-    this.data.engagement.helpSeekingEvents.push({
-      type: type,
-      ts: Date.now(),
-      target: target
-    });
+    this._recordHelpSeeking(type, target);
+  };
+
+  /**
+   * Internal: Log a help-seeking event and update its running counts.
+   */
+  BehaviorTracker.prototype._recordHelpSeeking = function(type, target) {
+    this._pushEvent(this._rings.help, Date.now(), this._intern(type), this._intern(target || ''), 0);
+
+    var summary = this.data.engagement.helpSeekingSummary;
+    summary.total += 1;
+    if (type === 'hint') {
+      summary.hints += 1;
+    }
   };
 
   /**
@@ -536,47 +645,51 @@
   // FOCUS/BLUR TRACKING (Attention Proxy)
   // =========================================================
 
+  /**
+   * Focus and blur update the blur summary incrementally, so summaries
+   * never rescan the event log. A tab switch fires both visibilitychange
+   * and window blur; only the first transition is counted.
+   */
   BehaviorTracker.prototype._setupFocusTracking = function() {
     var self = this;
 
     this._onFocus = function() {
+      var now = Date.now();
+      if (self.isFocused) return;
       self.isFocused = true;
 
-      // Record event (limited to prevent data bloat)
-      if (self.data.engagement.focusBlurEvents.length < CONFIG.MAX_FOCUS_BLUR_EVENTS) {
-        self.data.engagement.focusBlurEvents.push({
-          type: 'focus',
-          ts: Date.now(),
-          page: self.currentPage || ''
-        });
+      self._pushEvent(self._rings.focus, now, FOCUS, self._intern(self.currentPage || ''), 0);
+
+      if (self._blurStart !== null) {
+        var duration = now - self._blurStart;
+        var summary = self.data.engagement.focusBlurSummary;
+        summary.totalBlurDuration += duration;
+        if (duration > summary.longestBlur) summary.longestBlur = duration;
+        self._blurStart = null;
       }
     };
 
     this._onBlur = function() {
       var now = Date.now();
+      if (!self.isFocused) return;
       self.isFocused = false;
 
-      // Record event
-      if (self.data.engagement.focusBlurEvents.length < CONFIG.MAX_FOCUS_BLUR_EVENTS) {
-        self.data.engagement.focusBlurEvents.push({
-          type: 'blur',
-          ts: now,
-          page: self.currentPage || ''
-        });
-      }
+      self._pushEvent(self._rings.focus, now, BLUR, self._intern(self.currentPage || ''), 0);
+      self._blurStart = now;
 
       // Update summary
       self.data.engagement.focusBlurSummary.totalBlurs += 1;
     };
 
-    document.addEventListener('visibilitychange', function() {
+    this._onVisibilityChange = function() {
       if (document.hidden) {
         self._onBlur();
       } else {
         self._onFocus();
       }
-    });
+    };
 
+    document.addEventListener('visibilitychange', this._onVisibilityChange);
     window.addEventListener('focus', self._onFocus);
     window.addEventListener('blur', self._onBlur);
   };
@@ -585,50 +698,55 @@
   // IDLE DETECTION
   // =========================================================
 
+  /**
+   * Idle periods are detected by comparing timestamps when input arrives,
+   * instead of clearing and re-arming a timer on every mousemove.
+   * A period counts as idle once IDLE_THRESHOLD passes without input; it
+   * is recorded when it lasted at least IDLE_THRESHOLD beyond that.
+   */
   BehaviorTracker.prototype._setupIdleDetection = function() {
     var self = this;
-    var idleTimer = null;
-    var idleStart = null;
-
-    function resetIdleTimer() {
-      self.lastInteractionTime = Date.now();
-
-      // If we were idle, record the idle period
-      if (idleStart !== null) {
-        var idleDuration = Date.now() - idleStart;
-        if (idleDuration >= CONFIG.IDLE_THRESHOLD) {
-          self.data.engagement.idlePeriods.push({
-            start: idleStart,
-            duration: idleDuration,
-            page: self.currentPage || ''
-          });
-        }
-        idleStart = null;
-      }
 
-      // Reset the timer
-      if (idleTimer) clearTimeout(idleTimer);
-      idleTimer = setTimeout(function() {
-        idleStart = Date.now();
-      }, CONFIG.IDLE_THRESHOLD);
+    function onInteraction() {
+      var now = Date.now();
+      var gap = now - self.lastInteractionTime;
+
+      if (gap >= CONFIG.IDLE_THRESHOLD * 2) {
+        self._recordIdlePeriod(self.lastInteractionTime + CONFIG.IDLE_THRESHOLD, now);
+      }
+      self.lastInteractionTime = now;
     }
 
     // Track user interactions for idle detection
     this._interactionEvents = ['mousemove', 'keydown', 'scroll', 'click', 'touchstart'];
-    this._resetIdleTimer = resetIdleTimer;
+    this._onInteraction = onInteraction;
 
     for (var i = 0; i < this._interactionEvents.length; i++) {
-      document.addEventListener(this._interactionEvents[i], resetIdleTimer, { passive: true });
+      document.addEventListener(this._interactionEvents[i], onInteraction, { passive: true });
     }
 
-    // Start the initial timer
-    resetIdleTimer();
+    this.lastInteractionTime = Date.now();
+  };
+
+  BehaviorTracker.prototype._recordIdlePeriod = function(start, end) {
+    var duration = end - start;
+    this._pushEvent(this._rings.idle, start, 0, this._intern(this.currentPage || ''), duration);
+
+    var summary = this.data.engagement.idleSummary;
+    summary.count += 1;
+    summary.totalDuration += duration;
   };
 
   // =========================================================
   // SCROLL TRACKING
   // =========================================================
 
+  /**
+   * Scroll events only mark a sample as pending; the position is read
+   * once per animation frame. Document and viewport heights are cached
+   * and refreshed only when a ResizeObserver (or window resize, where
+   * ResizeObserver is unavailable) reports a change.
+   */
   BehaviorTracker.prototype._setupScrollTracking = function() {
     var self = this;
 
@@ -640,35 +758,63 @@
     };
 
     this._onScroll = function() {
-      if (!self.scrollTracker) return;
-
-      var scrollTop = window.pageYOffset || document.documentElement.scrollTop;
-      var docHeight = Math.max(
-        document.body.scrollHeight,
-        document.documentElement.scrollHeight
-      );
-      var winHeight = window.innerHeight;
-      var scrollPercent = Math.round((scrollTop / (docHeight - winHeight)) * 100) || 0;
-
-      // Update max depth
-      self.scrollTracker.maxDepth = Math.max(
-        self.scrollTracker.maxDepth,
-        Math.min(scrollPercent, 100)
-      );
-
-      // Detect scroll reversals
-      var currentDirection = scrollTop > self.scrollTracker.lastScrollTop ? 'down' : 'up';
-      if (self.scrollTracker.lastDirection !== null &&
-          currentDirection !== self.scrollTracker.lastDirection) {
-        self.scrollTracker.reversals += 1;
-      }
-      self.scrollTracker.lastDirection = currentDirection;
-      self.scrollTracker.lastScrollTop = scrollTop;
+      if (!self.scrollTracker || self._scrollPending) return;
+      self._scrollPending = true;
+      self._frameId = requestFrame(self._sampleFrame);
+    };
+
+    this._sampleFrame = function() {
+      self._frameId = null;
+      self._scrollPending = false;
+      self._sampleScroll();
     };
 
+    this._onResize = function() {
+      self._metrics.stale = true;
+    };
+
+    if (typeof ResizeObserver === 'function') {
+      this._resizeObserver = new ResizeObserver(this._onResize);
+      this._resizeObserver.observe(document.documentElement);
+      if (document.body) this._resizeObserver.observe(document.body);
+    }
+    window.addEventListener('resize', this._onResize, { passive: true });
     window.addEventListener('scroll', this._onScroll, { passive: true });
   };
 
+  BehaviorTracker.prototype._refreshMetrics = function() {
+    this._metrics.docHeight = Math.max(
+      document.body.scrollHeight,
+      document.documentElement.scrollHeight
+    );
+    this._metrics.winHeight = window.innerHeight;
+    this._metrics.stale = false;
+  };
+
+  BehaviorTracker.prototype._sampleScroll = function() {
+    if (!this.scrollTracker) return;
+    if (this._metrics.stale) this._refreshMetrics();
+
+    var scrollTop = window.pageYOffset || document.documentElement.scrollTop;
+    var range = this._metrics.docHeight - this._metrics.winHeight;
+    var scrollPercent = Math.round((scrollTop / range) * 100) || 0;
+
+    // Update max depth
+    this.scrollTracker.maxDepth = Math.max(
+      this.scrollTracker.maxDepth,
+      Math.min(scrollPercent, 100)
+    );
+
+    // Detect scroll reversals
+    var currentDirection = scrollTop > this.scrollTracker.lastScrollTop ? 'down' : 'up';
+    if (this.scrollTracker.lastDirection !== null &&
+        currentDirection !== this.scrollTracker.lastDirection) {
+      this.scrollTracker.reversals += 1;
+    }
+    this.scrollTracker.lastDirection = currentDirection;
+    this.scrollTracker.lastScrollTop = scrollTop;
+  };
+
   BehaviorTracker.prototype._resetScrollTracking = function() {
     if (this.scrollTracker) {
       this.scrollTracker.maxDepth = 0;
@@ -676,6 +822,8 @@
       this.scrollTracker.reversals = 0;
       this.scrollTracker.lastDirection = null;
     }
+    // A new page usually means new content height
+    this._metrics.stale = true;
   };
 
   // =========================================================
@@ -694,30 +842,26 @@
     this._updateAttentionRatio();
     this._updateFocusBlurSummary();
 
-    // Compress data for storage
-    var compressed = this._compressData();
-    var jsonString = JSON.stringify(compressed);
-
-    // Check size
-    if (jsonString.length > CONFIG.MAX_SUSPEND_DATA) {
-      // Progressively reduce data to fit
-      compressed = this._reduceData(compressed, jsonString.length);
-      jsonString = JSON.stringify(compressed);
+    // Hand the compact schema to the shared store; it is shrunk to the
+    // namespace budget (via _reduceData) when the store serializes it
+    if (this.store) {
+      this._registerStore();
+      this.store.set(CONFIG.STORE_NAMESPACE, this._compressData());
     }
 
-    // Store via SCORM API
     try {
-      if (typeof this.scorm.setBookmark === 'function') {
-        this.scorm.setBookmark(jsonString);
-      } else if (typeof this.scorm.setValue === 'function') {
-        this.scorm.setValue('cmi.suspend_data', jsonString);
+      // Without suspend-store.js the tracker owns suspend_data (JSON)
+      if (!this.store) {
+        this._writeSuspendData();
       }
 
       // Also store interactions via cmi.interactions for detailed quiz data
       this._saveInteractionsToScorm();
 
-      // Commit
-      if (typeof this.scorm.commit === 'function') {
+      // Writes suspend_data and commits once for every engine
+      if (this.store) {
+        this.store.save();
+      } else if (typeof this.scorm.commit === 'function') {
         this.scorm.commit();
       }
 
@@ -728,6 +872,41 @@
     }
   };
 
+  /**
+   * Write the compact schema to cmi.suspend_data as JSON, for pages that
+   * don't load the shared SuspendStore.
+   * @private
+   */
+  BehaviorTracker.prototype._writeSuspendData = function() {
+    var compressed = this._compressData();
+    var jsonString = JSON.stringify(compressed);
+
+    if (jsonString.length > CONFIG.MAX_SUSPEND_DATA) {
+      compressed = this._reduceData(compressed, jsonString.length);
+      jsonString = JSON.stringify(compressed);
+    }
+
+    if (typeof this.scorm.setBookmark === 'function') {
+      this.scorm.setBookmark(jsonString);
+    } else if (typeof this.scorm.setValue === 'function') {
+      this.scorm.setValue('cmi.suspend_data', jsonString);
+    }
+  };
+
+  /**
+   * Read the JSON written by _writeSuspendData.
+   * @private
+   */
+  BehaviorTracker.prototype._readSuspendData = function() {
+    var stored = null;
+    if (typeof this.scorm.getBookmark === 'function') {
+      stored = this.scorm.getBookmark();
+    } else if (typeof this.scorm.getValue === 'function') {
+      stored = this.scorm.getValue('cmi.suspend_data');
+    }
+    return stored && typeof stored === 'string' ? JSON.parse(stored) : null;
+  };
+
   /**
    * Restore previously saved data from SCORM.
    */
@@ -735,19 +914,15 @@
     if (!this.scorm) return;
 
     try {
-      var stored = null;
-
-      if (typeof this.scorm.getBookmark === 'function') {
-        stored = this.scorm.getBookmark();
-      } else if (typeof this.scorm.getValue === 'function') {
-        stored = this.scorm.getValue('cmi.suspend_data');
+      var stored;
+      if (this.store) {
+        this._registerStore();
+        stored = this.store.get(CONFIG.STORE_NAMESPACE);
+      } else {
+        stored = this._readSuspendData();
       }
-
-      if (stored && typeof stored === 'string' && stored.length > 0) {
-        var parsed = JSON.parse(stored);
-        if (parsed && parsed.v === CONFIG.SCHEMA_VERSION) {
-          this.data = this._decompressData(parsed);
-        }
+      if (stored && stored.v === CONFIG.SCHEMA_VERSION) {
+        this.data = this._decompressData(stored);
       }
     } catch (e) {
       console.warn('BehaviorTracker: Failed to restore data', e);
@@ -756,6 +931,23 @@
     }
   };
 
+  /**
+   * Register the behavior namespace with the shared suspend_data store.
+   */
+  BehaviorTracker.prototype._registerStore = function() {
+    if (this._storeRegistered) return;
+    var self = this;
+
+    this.store.register(CONFIG.STORE_NAMESPACE, {
+      priority: CONFIG.STORE_PRIORITY,
+      budget: CONFIG.STORE_BUDGET,
+      reduce: function(compressed, size, budget) {
+        return self._reduceData(compressed, size, budget, global.SuspendStore.codec.size);
+      }
+    });
+    this._storeRegistered = true;
+  };
+
   /**
    * Save detailed interaction data to cmi.interactions.
    * Uses the SCORM interactions data model (separate from suspend_data).
@@ -832,7 +1024,7 @@
         tb: d.engagement.focusBlurSummary.totalBlurs,
         bd: Math.round(d.engagement.focusBlurSummary.totalBlurDuration / 1000),
         oc: d.engagement.optionalContentAccessed.length,
-        hs: d.engagement.helpSeekingEvents.length,
+        hs: d.engagement.helpSeekingSummary.total,
         cr: Math.round((d.engagement.completionRate.overall || 0) * 100)
       }
     };
@@ -972,6 +1164,7 @@
     data.engagement.attentionRatio = (compressed.e.ar || 0) / 100;
     data.engagement.focusBlurSummary.totalBlurs = compressed.e.tb || 0;
     data.engagement.focusBlurSummary.totalBlurDuration = (compressed.e.bd || 0) * 1000;
+    data.engagement.helpSeekingSummary.total = compressed.e.hs || 0;
 
     return data;
   };
@@ -979,22 +1172,27 @@
   /**
    * Progressively reduce data to fit within size limits.
    * Removes lowest-priority data first.
+   * @param {object} compressed - Compact schema (modified in place)
+   * @param {number} currentSize - Current size of the data
+   * @param {number} [target] - Size to fit within (default MAX_SUSPEND_DATA)
+   * @param {function} [measure] - Returns the size of a value (default JSON length)
    */
-  BehaviorTracker.prototype._reduceData = function(compressed, currentSize) {
-    var target = CONFIG.MAX_SUSPEND_DATA;
+  BehaviorTracker.prototype._reduceData = function(compressed, currentSize, target, measure) {
+    target = target || CONFIG.MAX_SUSPEND_DATA;
+    measure = measure || function(value) { return JSON.stringify(value).length; };
 
     // Priority 1: Truncate navigation path to last 20 entries
     if (currentSize > target && compressed.n.p) {
       if (compressed.n.p.length > 20) {
         compressed.n.p = compressed.n.p.slice(-20);
       }
-      currentSize = JSON.stringify(compressed).length;
+      currentSize = measure(compressed);
     }
 
     // Priority 2: Remove revisit details
     if (currentSize > target) {
       compressed.n.rv = {};
-      currentSize = JSON.stringify(compressed).length;
+      currentSize = measure(compressed);
     }
 
     // Priority 3: Reduce page timing to top 15 most-visited pages
@@ -1011,13 +1209,13 @@
         keepPages[pages[i].id] = compressed.t.p[pages[i].id];
       }
       compressed.t.p = keepPages;
-      currentSize = JSON.stringify(compressed).length;
+      currentSize = measure(compressed);
     }
 
     // Priority 4: Remove navigation path entirely
     if (currentSize > target) {
       compressed.n.p = [];
-      currentSize = JSON.stringify(compressed).length;
+      currentSize = measure(compressed);
     }
 
     // Priority 5: Remove page timing entirely (keep only assessment data)
@@ -1088,8 +1286,16 @@
         },
         attentionRatio: 1.0,
         idlePeriods: [],
+        idleSummary: {
+          count: 0,
+          totalDuration: 0
+        },
         optionalContentAccessed: [],
         helpSeekingEvents: [],
+        helpSeekingSummary: {
+          total: 0,
+          hints: 0
+        },
         completionRate: {
           overall: 0
         },
@@ -1115,33 +1321,106 @@
 
   /**
    * Update focus/blur summary statistics.
+   * Totals are maintained as events arrive; only the average is derived.
    */
   BehaviorTracker.prototype._updateFocusBlurSummary = function() {
-    var events = this.data.engagement.focusBlurEvents;
     var summary = this.data.engagement.focusBlurSummary;
 
-    var totalDuration = 0;
-    var longestBlur = 0;
-    var blurStart = null;
-
-    for (var i = 0; i < events.length; i++) {
-      if (events[i].type === 'blur') {
-        blurStart = events[i].ts;
-      } else if (events[i].type === 'focus' && blurStart !== null) {
-        var duration = events[i].ts - blurStart;
-        totalDuration += duration;
-        if (duration > longestBlur) longestBlur = duration;
-        blurStart = null;
-      }
-    }
-
-    summary.totalBlurDuration = totalDuration;
-    summary.longestBlur = longestBlur;
     summary.averageBlurDuration = summary.totalBlurs > 0
-      ? Math.round(totalDuration / summary.totalBlurs)
+      ? Math.round(summary.totalBlurDuration / summary.totalBlurs)
       : 0;
   };
 
+  /**
+   * Create the ring buffers backing the detailed event logs.
+   */
+  BehaviorTracker.prototype._createRings = function() {
+    return {
+      focus: new EventRing(CONFIG.MAX_FOCUS_BLUR_EVENTS),
+      help: new EventRing(CONFIG.MAX_HELP_EVENTS),
+      idle: new EventRing(CONFIG.MAX_IDLE_PERIODS)
+    };
+  };
+
+  /**
+   * Map a string to a small integer for typed-array storage.
+   */
+  BehaviorTracker.prototype._intern = function(str) {
+    var index = this._stringIndex[str];
+    if (index === undefined) {
+      index = this._strings.length;
+      this._strings.push(str);
+      this._stringIndex[str] = index;
+    }
+    return index;
+  };
+
+  /**
+   * Append an event to a ring, then compact the string table once it has
+   * grown past MAX_INTERNED_STRINGS (never in between, so indexes interned
+   * for this event stay valid until it is stored).
+   */
+  BehaviorTracker.prototype._pushEvent = function(ring, ts, kind, ref, value) {
+    ring.push(ts, kind, ref, value);
+    if (this._strings.length >= CONFIG.MAX_INTERNED_STRINGS) {
+      this._compactStrings();
+    }
+  };
+
+  /**
+   * Rebuild the string table from the entries still in the rings, so
+   * strings of overwritten events are released and indexes never
+   * outgrow the Uint16 ref columns.
+   */
+  BehaviorTracker.prototype._compactStrings = function() {
+    var old = this._strings;
+    var self = this;
+    this._strings = [''];
+    this._stringIndex = { '': 0 };
+
+    function remap(index) {
+      return self._intern(old[index]);
+    }
+
+    this._rings.focus.remap(null, remap);
+    this._rings.help.remap(remap, remap);
+    this._rings.idle.remap(null, remap);
+  };
+
+  /**
+   * Copy the ring buffers into the plain event arrays of the data set
+   * (most recent events only) for JSON export.
+   */
+  BehaviorTracker.prototype._materializeEvents = function() {
+    var strings = this._strings;
+    var engagement = this.data.engagement;
+
+    engagement.focusBlurEvents = [];
+    this._rings.focus.forEach(function(ts, kind, ref) {
+      engagement.focusBlurEvents.push({
+        type: kind === BLUR ? 'blur' : 'focus',
+        ts: ts,
+        page: strings[ref]
+      });
+    });
+
+    engagement.helpSeekingEvents = [];
+    this._rings.help.forEach(function(ts, kind, ref) {
+      var event = { type: strings[kind], ts: ts };
+      event[strings[kind] === 'hint' ? 'question' : 'target'] = strings[ref];
+      engagement.helpSeekingEvents.push(event);
+    });
+
+    engagement.idlePeriods = [];
+    this._rings.idle.forEach(function(ts, kind, ref, value) {
+      engagement.idlePeriods.push({
+        start: ts,
+        duration: value,
+        page: strings[ref]
+      });
+    });
+  };
+
   /**
    * Generate a short random session ID.
    */
@@ -1225,10 +1504,25 @@
   BehaviorTracker.prototype._removeEventListeners = function() {
     if (this._onScroll) {
       window.removeEventListener('scroll', this._onScroll);
+      window.removeEventListener('resize', this._onResize);
+    }
+    if (this._frameId !== null) {
+      cancelFrame(this._frameId);
+      this._frameId = null;
+      this._scrollPending = false;
+    }
+    if (this._resizeObserver) {
+      this._resizeObserver.disconnect();
+      this._resizeObserver = null;
+    }
+    if (this._onVisibilityChange) {
+      document.removeEventListener('visibilitychange', this._onVisibilityChange);
+      window.removeEventListener('focus', this._onFocus);
+      window.removeEventListener('blur', this._onBlur);
     }
-    if (this._interactionEvents && this._resetIdleTimer) {
+    if (this._interactionEvents && this._onInteraction) {
       for (var i = 0; i < this._interactionEvents.length; i++) {
-        document.removeEventListener(this._interactionEvents[i], this._resetIdleTimer);
+        document.removeEventListener(this._interactionEvents[i], this._onInteraction);
       }
     }
   };
@@ -1244,6 +1538,7 @@
     this._updateLinearRatio();
     this._updateAttentionRatio();
     this._updateFocusBlurSummary();
+    this._materializeEvents();
 
     return JSON.stringify(this.data, null, 2);
   };
@@ -1293,7 +1588,7 @@
       avgTimeToFirstClick: avgTimeToFirstClick + 'ms',
       avgDeliberationTime: avgDeliberation + 'ms',
       secondGuessInstances: secondGuessCount,
-      hintsUsed: d.engagement.helpSeekingEvents.filter(function(e) { return e.type === 'hint'; }).length,
+      hintsUsed: d.engagement.helpSeekingSummary.hints,
       optionalContentExplored: d.engagement.optionalContentAccessed.length,
       retryAttempts: d.assessment.retryCount,
       tabSwitches: d.engagement.focusBlurSummary.totalBlurs,
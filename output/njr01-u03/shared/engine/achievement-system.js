@@ -2,7 +2,8 @@
    SCORM Content Studio — Achievement / Badge System
    ============================================================================
    Unlockable achievements with notification popups and a badge gallery.
-   Persists earned badge IDs in cmi.suspend_data via JSON.
+   Persists earned badge IDs in the 'ach' namespace of the shared
+   SuspendStore (cmi.suspend_data).
 
    Usage:
      const achievements = new AchievementSystem();
@@ -13,7 +14,9 @@
      achievements.renderGallery(containerElement);
 
    Integrates with SoundEffects (window.SoundEffects) and
-   Confetti (window.Confetti) when available.
+   Confetti (window.Confetti) when available. Popup animations run on the
+   shared FrameScheduler (engine/frame-scheduler.js) when it is loaded, and
+   on plain requestAnimationFrame / setTimeout otherwise.
    ========================================================================== */
 
 'use strict';
@@ -23,6 +26,22 @@ class AchievementSystem {
     /** @type {Set<string>} IDs of earned achievements */
     this._earned = new Set();
 
+    /** @type {SuspendStore|null} */
+    this._store = window.SuspendStore ? window.SuspendStore.get() : null;
+    if (this._store) {
+      this._store.register('ach', {
+        priority: 60,
+        budget: 128,
+        // Badges earned before binding add to those the LMS had
+        merge: (stored, earned) => Array.isArray(stored)
+          ? Array.from(new Set(stored.concat(earned)))
+          : earned
+      });
+      // Constructed before any SCO bound the store: pick up the badges
+      // the LMS had once it is bound
+      this._store.onBind(() => this._loadFromSuspendData());
+    }
+
     /** @type {Object<string, Object>} Badge definitions */
     this.badges = {
       first_lesson: {
@@ -195,44 +214,25 @@ class AchievementSystem {
   }
 
   /* ------------------------------------------------------------------
-     Persistence — cmi.suspend_data
+     Persistence — shared SuspendStore (cmi.suspend_data)
      ------------------------------------------------------------------ */
 
   /** @private */
   _loadFromSuspendData() {
-    try {
-      if (typeof window.API !== 'undefined' && window.API.LMSGetValue) {
-        var raw = window.API.LMSGetValue('cmi.suspend_data');
-        if (raw) {
-          var data = JSON.parse(raw);
-          if (data && Array.isArray(data.achievements)) {
-            for (var i = 0; i < data.achievements.length; i++) {
-              this._earned.add(data.achievements[i]);
-            }
-          }
-        }
+    if (!this._store) return;
+    var earned = this._store.get('ach');
+    if (Array.isArray(earned)) {
+      for (var i = 0; i < earned.length; i++) {
+        this._earned.add(earned[i]);
       }
-    } catch (e) {
-      /* suspend_data may be empty or malformed — safe to ignore */
     }
   }
 
   /** @private */
   _saveToSuspendData() {
-    try {
-      if (typeof window.API !== 'undefined' && window.API.LMSGetValue) {
-        var raw = window.API.LMSGetValue('cmi.suspend_data');
-        var data = {};
-        if (raw) {
-          try { data = JSON.parse(raw); } catch (e) { data = {}; }
-        }
-        data.achievements = Array.from(this._earned);
-        window.API.LMSSetValue('cmi.suspend_data', JSON.stringify(data));
-        window.API.LMSCommit('');
-      }
-    } catch (e) {
-      /* LMS may not be available in preview mode — safe to ignore */
-    }
+    if (!this._store) return;
+    this._store.set('ach', Array.from(this._earned));
+    this._store.save();
   }
 
   /* ------------------------------------------------------------------
@@ -254,25 +254,43 @@ class AchievementSystem {
     document.body.appendChild(popup);
 
     /* Trigger entrance animation on next frame */
-    requestAnimationFrame(function () {
+    var self = this;
+    this._nextFrame(function () {
       popup.classList.add('show');
     });
 
     /* Auto-dismiss after 4 seconds */
-    setTimeout(function () {
+    this._later(4000, function () {
       popup.classList.remove('show');
-      setTimeout(function () {
+      self._later(400, function () {
         if (popup.parentNode) popup.parentNode.removeChild(popup);
-      }, 400);
-    }, 4000);
+      });
+    });
+  }
+
+  /** @private Run fn in the next frame, batched by the scheduler when available. */
+  _nextFrame(fn) {
+    if (window.FrameScheduler) {
+      FrameScheduler.shared.once(fn);
+    } else {
+      requestAnimationFrame(fn);
+    }
+  }
+
+  /** @private Run fn after ms, inside a scheduler frame when available. */
+  _later(ms, fn) {
+    if (window.FrameScheduler) {
+      FrameScheduler.shared.after(ms, fn);
+    } else {
+      setTimeout(fn, ms);
+    }
   }
 
   /** @private Play celebration sound if SoundEffects is available */
   _playSound() {
     if (window.SoundEffects) {
       try {
-        var sfx = new SoundEffects();
-        sfx.playSound('celebration');
+        SoundEffects.shared.playSound('celebration');
       } catch (e) { /* sound not critical */ }
     }
   }
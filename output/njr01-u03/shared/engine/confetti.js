@@ -2,7 +2,13 @@
    SCORM Content Studio — Confetti Particle System
    ============================================================================
    Canvas-based confetti burst for celebrations.
-   Self-contained — no external libraries or images needed.
+   No external libraries or images needed; animation runs on the shared
+   FrameScheduler (engine/frame-scheduler.js) when it is loaded, and on
+   plain requestAnimationFrame / setTimeout otherwise.
+
+   Particles live in a preallocated pool of typed arrays, so a burst
+   creates no garbage. When the scheduler reports overrunning frames the
+   system sheds particles instead of dropping frames.
 
    Usage:
      const confetti = new Confetti();
@@ -15,18 +21,54 @@
 
 'use strict';
 
+/** Pool size: a few overlapping bursts of the 100-particle maximum */
+const CONFETTI_POOL_SIZE = 300;
+
+/** Fewest particles kept alive when shedding load */
+const CONFETTI_MIN_PARTICLES = 20;
+
+/** Canvas resolution cap — higher densities cost fill rate for no visible gain */
+const CONFETTI_MAX_DPR = 2;
+
 class Confetti {
   constructor() {
     /** @type {HTMLCanvasElement|null} */
     this._canvas = null;
     /** @type {CanvasRenderingContext2D|null} */
     this._ctx = null;
-    /** @type {Array} */
-    this._particles = [];
+    /** @type {number} Canvas pixels per CSS pixel */
+    this._dpr = 1;
+    /** @type {number} Viewport size in CSS pixels */
+    this._width = 0;
+    this._height = 0;
+
+    /* Particle pool — one slot per index, live particles packed at [0, _count) */
+    var n = CONFETTI_POOL_SIZE;
+    this._x = new Float32Array(n);
+    this._y = new Float32Array(n);
+    this._vx = new Float32Array(n);
+    this._vy = new Float32Array(n);
+    this._w = new Float32Array(n);
+    this._h = new Float32Array(n);
+    this._rot = new Float32Array(n);
+    this._rotSpeed = new Float32Array(n);
+    this._opacity = new Float32Array(n);
+    this._fade = new Float32Array(n);
+    this._color = new Uint8Array(n);
+    /** @type {number} Live particles */
+    this._count = 0;
+    /** @type {number} Current particle ceiling, lowered when frames overrun */
+    this._limit = n;
+
+    /** @type {string[]|null} Theme palette, resolved once */
+    this._palette = null;
+    /** @type {{remove: function}|null} Frame loop while animating */
+    this._task = null;
     /** @type {boolean} */
     this._running = false;
-    /** @type {number|null} */
-    this._cleanupTimer = null;
+
+    this._animate = this._animate.bind(this);
+    this._shed = this._shed.bind(this);
   }
 
   /* ------------------------------------------------------------------
@@ -47,33 +89,29 @@ class Confetti {
     }
 
     this._ensureCanvas();
-    count = Math.min(count || 80, 100);
-    var cx = x != null ? x : this._canvas.width * 0.5;
-    var cy = y != null ? y : this._canvas.height * 0.3;
-
-    var colors = this._getColors();
-
-    for (var i = 0; i < count; i++) {
-      this._particles.push({
-        x: cx,
-        y: cy,
-        vx: (Math.random() - 0.5) * 14,
-        vy: (Math.random() - 0.5) * 14 - 5,
-        color: colors[Math.floor(Math.random() * colors.length)],
-        w: 6 + Math.random() * 6,
-        h: 3 + Math.random() * 4,
-        rotation: Math.random() * 360,
-        rotSpeed: (Math.random() - 0.5) * 12,
-        gravity: 0.18,
-        drag: 0.98,
-        opacity: 1,
-        fade: 0.006 + Math.random() * 0.008
-      });
+    count = Math.min(count || 80, 100, this._limit - this._count);
+    var cx = x != null ? x : this._width * 0.5;
+    var cy = y != null ? y : this._height * 0.3;
+    var colors = this._getColors().length;
+
+    for (var k = 0; k < count; k++) {
+      var i = this._count++;
+      this._x[i] = cx;
+      this._y[i] = cy;
+      this._vx[i] = (Math.random() - 0.5) * 14;
+      this._vy[i] = (Math.random() - 0.5) * 14 - 5;
+      this._color[i] = Math.floor(Math.random() * colors);
+      this._w[i] = 6 + Math.random() * 6;
+      this._h[i] = 3 + Math.random() * 4;
+      this._rot[i] = Math.random() * Math.PI * 2;
+      this._rotSpeed[i] = (Math.random() - 0.5) * 0.21;
+      this._opacity[i] = 1;
+      this._fade[i] = 0.006 + Math.random() * 0.008;
     }
 
-    if (!this._running) {
+    if (!this._running && this._count > 0) {
       this._running = true;
-      this._animate();
+      this._startLoop();
     }
   }
 
@@ -81,6 +119,41 @@ class Confetti {
      Internals
      ------------------------------------------------------------------ */
 
+  /**
+   * @private Call _animate every frame until it returns false: as a
+   * FrameScheduler task when available (sharing its budget and overrun
+   * shedding), otherwise on its own requestAnimationFrame loop.
+   */
+  _startLoop() {
+    if (window.FrameScheduler) {
+      this._task = FrameScheduler.shared.add(this._animate, {
+        priority: -10,
+        onOverrun: this._shed
+      });
+      return;
+    }
+
+    var self = this;
+    var last = 0;
+    var id = requestAnimationFrame(function frame(now) {
+      var keep = self._animate(now, last ? now - last : 16.67);
+      last = now;
+      if (keep !== false) id = requestAnimationFrame(frame);
+    });
+    this._task = {
+      remove: function () { cancelAnimationFrame(id); }
+    };
+  }
+
+  /** @private Run fn after ms, inside a scheduler frame when available. */
+  _later(ms, fn) {
+    if (window.FrameScheduler) {
+      FrameScheduler.shared.after(ms, fn);
+    } else {
+      setTimeout(fn, ms);
+    }
+  }
+
   /** @private Create or reuse a fullscreen overlay canvas. */
   _ensureCanvas() {
     if (this._canvas) return;
@@ -94,65 +167,119 @@ class Confetti {
     window.addEventListener('resize', this._resizeHandler);
   }
 
-  /** @private */
+  /** @private Size the backing store for the device pixel ratio. */
   _resize() {
     if (!this._canvas) return;
-    this._canvas.width = window.innerWidth;
-    this._canvas.height = window.innerHeight;
+    this._dpr = Math.min(window.devicePixelRatio || 1, CONFETTI_MAX_DPR);
+    this._width = window.innerWidth;
+    this._height = window.innerHeight;
+    this._canvas.width = Math.round(this._width * this._dpr);
+    this._canvas.height = Math.round(this._height * this._dpr);
   }
 
-  /** @private Resolve theme colors or use a vibrant fallback palette. */
+  /** @private Resolve theme colors (once) or use a vibrant fallback palette. */
   _getColors() {
+    if (this._palette) return this._palette;
+
     var root = getComputedStyle(document.documentElement);
     var primary = root.getPropertyValue('--color-primary').trim();
     var secondary = root.getPropertyValue('--color-secondary').trim();
     var accent = root.getPropertyValue('--color-accent').trim();
 
     if (primary && secondary && accent) {
-      return [primary, secondary, accent, '#F7DC6F', '#82E0AA', '#F8C471'];
+      this._palette = [primary, secondary, accent, '#F7DC6F', '#82E0AA', '#F8C471'];
+    } else {
+      this._palette = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#F7DC6F', '#BB8FCE'];
     }
-    return ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA07A', '#F7DC6F', '#BB8FCE'];
+    return this._palette;
   }
 
-  /** @private Animation loop. */
-  _animate() {
-    this._ctx.clearRect(0, 0, this._canvas.width, this._canvas.height);
+  /**
+   * @private Scheduler task: step and draw every live particle.
+   * @param {number} now
+   * @param {number} dt - ms since the previous frame
+   * @returns {boolean} false once all particles have faded
+   */
+  _animate(now, dt) {
+    var ctx = this._ctx;
+    var dpr = this._dpr;
+    var palette = this._palette;
 
-    for (var i = this._particles.length - 1; i >= 0; i--) {
-      var p = this._particles[i];
+    /* Physics was tuned per 60 fps frame; scale steps so slow devices
+       keep the same motion instead of slow-motion confetti */
+    var k = Math.min(dt / 16.67, 3);
+    var drag = Math.pow(0.98, k);
+    var gravity = 0.18 * k;
 
-      p.vy += p.gravity;
-      p.vx *= p.drag;
-      p.vy *= p.drag;
-      p.x += p.vx;
-      p.y += p.vy;
-      p.rotation += p.rotSpeed;
-      p.opacity -= p.fade;
+    ctx.setTransform(1, 0, 0, 1, 0, 0);
+    ctx.clearRect(0, 0, this._canvas.width, this._canvas.height);
 
-      if (p.opacity <= 0) {
-        this._particles.splice(i, 1);
-        continue;
+    var i = 0;
+    while (i < this._count) {
+      this._opacity[i] -= this._fade[i] * k;
+
+      if (this._opacity[i] <= 0) {
+        this._removeParticle(i);
+        continue; /* slot i now holds the last particle */
       }
 
-      this._ctx.save();
-      this._ctx.translate(p.x, p.y);
-      this._ctx.rotate((p.rotation * Math.PI) / 180);
-      this._ctx.globalAlpha = p.opacity;
-      this._ctx.fillStyle = p.color;
-      this._ctx.fillRect(-p.w / 2, -p.h / 2, p.w, p.h);
-      this._ctx.restore();
-    }
+      this._vy[i] = (this._vy[i] + gravity) * drag;
+      this._vx[i] *= drag;
+      this._x[i] += this._vx[i] * k;
+      this._y[i] += this._vy[i] * k;
+      this._rot[i] += this._rotSpeed[i] * k;
 
-    if (this._particles.length > 0) {
-      requestAnimationFrame(this._animate.bind(this));
-    } else {
-      this._cleanup();
+      /* Rotation, translation and DPR scaling in one transform —
+         no save()/restore() per particle */
+      var cos = Math.cos(this._rot[i]) * dpr;
+      var sin = Math.sin(this._rot[i]) * dpr;
+      ctx.setTransform(cos, sin, -sin, cos, this._x[i] * dpr, this._y[i] * dpr);
+      ctx.globalAlpha = this._opacity[i];
+      ctx.fillStyle = palette[this._color[i]];
+      ctx.fillRect(-this._w[i] / 2, -this._h[i] / 2, this._w[i], this._h[i]);
+      i++;
     }
+
+    if (this._count > 0) return true;
+
+    this._cleanup();
+    return false;
+  }
+
+  /** @private Swap the last live particle into slot i. */
+  _removeParticle(i) {
+    var last = --this._count;
+    if (i === last) return;
+    this._x[i] = this._x[last];
+    this._y[i] = this._y[last];
+    this._vx[i] = this._vx[last];
+    this._vy[i] = this._vy[last];
+    this._w[i] = this._w[last];
+    this._h[i] = this._h[last];
+    this._rot[i] = this._rot[last];
+    this._rotSpeed[i] = this._rotSpeed[last];
+    this._opacity[i] = this._opacity[last];
+    this._fade[i] = this._fade[last];
+    this._color[i] = this._color[last];
+  }
+
+  /**
+   * @private Scheduler overrun: drop particles in proportion to the
+   * overrun and lower the ceiling for further bursts.
+   * @param {number} ratio - Frame cost / budget (> 1)
+   */
+  _shed(ratio) {
+    var keep = Math.max(CONFETTI_MIN_PARTICLES, Math.floor(this._count / ratio));
+    if (keep < this._count) this._count = keep;
+    this._limit = Math.max(CONFETTI_MIN_PARTICLES, Math.min(this._limit, keep));
   }
 
   /** @private Remove canvas after animation completes. */
   _cleanup() {
     this._running = false;
+    this._task = null;
+    this._count = 0;
+    this._limit = CONFETTI_POOL_SIZE;
     if (this._canvas && this._canvas.parentNode) {
       window.removeEventListener('resize', this._resizeHandler);
       this._canvas.parentNode.removeChild(this._canvas);
@@ -171,9 +298,9 @@ class Confetti {
       'font-size:2rem;font-weight:700;color:var(--color-primary,#6C5CE7);' +
       'z-index:9999;pointer-events:none;text-align:center;';
     document.body.appendChild(el);
-    setTimeout(function () {
+    this._later(3000, function () {
       if (el.parentNode) el.parentNode.removeChild(el);
-    }, 3000);
+    });
   }
 }
 
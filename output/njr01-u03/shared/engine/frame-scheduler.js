@@ -0,0 +1,316 @@
+/* ==========================================================================
+   SCORM Content Studio — Frame Scheduler
+   ============================================================================
+   One requestAnimationFrame loop shared by every animated engine
+   (Confetti, GamificationEngine, AchievementSystem), so visual effects
+   never compete for the same frame.
+
+   - Per-frame time budget: continuous tasks run in priority order and stop
+     once the budget is spent; the rest wait for the next frame, where they
+     run first so low-priority tasks can't be starved.
+   - Graceful degradation: when a frame overruns (work over budget or a
+     dropped frame), tasks registered with onOverrun are asked to shed load
+     (e.g. Confetti drops particles).
+   - Delays (`after`) share a single timer and their callbacks run inside
+     the next frame, so DOM writes land together.
+   - The loop only runs while there is work queued.
+
+   Usage:
+     const scheduler = FrameScheduler.shared;
+     const task = scheduler.add(function (now, dt) { ...; return stillRunning; },
+                                { priority: 10, onOverrun: function (ratio) { ... } });
+     scheduler.once(function () { el.classList.add('show'); });
+     scheduler.after(3000, function () { el.remove(); });
+     scheduler.getStats(); // { fps, avgFrameMs, p95FrameMs, overruns, ... }
+   ========================================================================== */
+
+'use strict';
+
+class FrameScheduler {
+  /**
+   * @param {object} [options]
+   * @param {number} [options.budget=8] - Work budget per frame in ms
+   *   (half a 60 fps frame, leaving the rest for style, layout and paint)
+   * @param {number} [options.targetFps=60]
+   */
+  constructor(options) {
+    options = options || {};
+
+    /** @type {number} */
+    this.budget = options.budget || 8;
+    /** @type {number} Expected frame interval in ms */
+    this.frameMs = 1000 / (options.targetFps || 60);
+
+    /** @type {Array<{run: Function, priority: number, onOverrun: Function|null, active: boolean, deferred: boolean}>} */
+    this._tasks = [];
+    /** @type {Array<Function|{fn: Function|null}>} One-shot callbacks and due timers for the next frame */
+    this._once = [];
+    /** @type {Array<{at: number, fn: Function|null}>} Sorted by deadline */
+    this._timers = [];
+    /** @type {number|null} */
+    this._timerHandle = null;
+    /** @type {number} Deadline the pending timer was set for */
+    this._timerAt = 0;
+
+    /** @type {number|null} */
+    this._frameId = null;
+    /** @type {number} */
+    this._lastFrame = 0;
+
+    this._tick = this._tick.bind(this);
+    this._fireTimers = this._fireTimers.bind(this);
+
+    this.resetStats();
+  }
+
+  /** Scheduler shared by all engines on the page. */
+  static get shared() {
+    if (!FrameScheduler._shared) {
+      FrameScheduler._shared = new FrameScheduler();
+    }
+    return FrameScheduler._shared;
+  }
+
+  /* ------------------------------------------------------------------
+     Public API
+     ------------------------------------------------------------------ */
+
+  /**
+   * Register a continuous task. It runs once per frame until it returns
+   * false or is removed.
+   * @param {function(number, number): boolean} run - Called with
+   *   (frame timestamp, ms since last frame)
+   * @param {object} [options]
+   * @param {number} [options.priority=0] - Higher runs first
+   * @param {function(number)} [options.onOverrun] - Called with the
+   *   overrun ratio (frame cost / budget) when a frame overruns
+   * @returns {{remove: function}}
+   */
+  add(run, options) {
+    options = options || {};
+    var task = {
+      run: run,
+      priority: options.priority || 0,
+      onOverrun: options.onOverrun || null,
+      active: true,
+      deferred: false
+    };
+
+    /* Keep tasks sorted by priority (stable for equal priorities) */
+    var i = this._tasks.length;
+    while (i > 0 && this._tasks[i - 1].priority < task.priority) i--;
+    this._tasks.splice(i, 0, task);
+
+    this._requestFrame();
+
+    var self = this;
+    return {
+      remove: function () { self._removeTask(task); }
+    };
+  }
+
+  /**
+   * Run a callback in the next frame.
+   * @param {function(number)} fn
+   */
+  once(fn) {
+    this._once.push(fn);
+    this._requestFrame();
+  }
+
+  /**
+   * Run a callback in the first frame after a delay.
+   * @param {number} ms
+   * @param {function(number)} fn
+   * @returns {{cancel: function}}
+   */
+  after(ms, fn) {
+    var timer = { at: performance.now() + ms, fn: fn };
+
+    var i = this._timers.length;
+    while (i > 0 && this._timers[i - 1].at > timer.at) i--;
+    this._timers.splice(i, 0, timer);
+    this._armTimer();
+
+    var self = this;
+    return {
+      cancel: function () {
+        var index = self._timers.indexOf(timer);
+        if (index !== -1) self._timers.splice(index, 1);
+        timer.fn = null;
+      }
+    };
+  }
+
+  /**
+   * Frame-time statistics since the last reset.
+   * @returns {{frames: number, fps: number, avgFrameMs: number,
+   *   p95FrameMs: number, maxFrameMs: number, avgWorkMs: number,
+   *   maxWorkMs: number, overruns: number, droppedFrames: number,
+   *   deferredTasks: number}}
+   */
+  getStats() {
+    var s = this._stats;
+    var n = Math.min(s.intervals, FrameScheduler.SAMPLES);
+    var sorted = Array.prototype.slice.call(this._samples, 0, n).sort(function (a, b) { return a - b; });
+    var avgFrame = s.intervals ? s.intervalTotal / s.intervals : 0;
+
+    return {
+      frames: s.frames,
+      fps: avgFrame ? Math.round(1000 / avgFrame) : 0,
+      avgFrameMs: FrameScheduler._round(avgFrame),
+      p95FrameMs: n ? FrameScheduler._round(sorted[Math.min(n - 1, Math.floor(n * 0.95))]) : 0,
+      maxFrameMs: FrameScheduler._round(s.maxFrame),
+      avgWorkMs: s.frames ? FrameScheduler._round(s.workTotal / s.frames) : 0,
+      maxWorkMs: FrameScheduler._round(s.maxWork),
+      overruns: s.overruns,
+      droppedFrames: s.droppedFrames,
+      deferredTasks: s.deferredTasks
+    };
+  }
+
+  resetStats() {
+    this._stats = {
+      frames: 0,
+      intervals: 0,
+      intervalTotal: 0,
+      maxFrame: 0,
+      workTotal: 0,
+      maxWork: 0,
+      overruns: 0,
+      droppedFrames: 0,
+      deferredTasks: 0
+    };
+    /** @type {Float32Array} Ring of recent frame intervals */
+    this._samples = new Float32Array(FrameScheduler.SAMPLES);
+  }
+
+  /* ------------------------------------------------------------------
+     Internals
+     ------------------------------------------------------------------ */
+
+  /** @private */
+  static _round(ms) {
+    return Math.round(ms * 100) / 100;
+  }
+
+  /** @private */
+  _requestFrame() {
+    if (this._frameId === null) {
+      this._frameId = requestAnimationFrame(this._tick);
+    }
+  }
+
+  /** @private */
+  _removeTask(task) {
+    task.active = false;
+    var index = this._tasks.indexOf(task);
+    if (index !== -1) this._tasks.splice(index, 1);
+  }
+
+  /** @private One shared timer, always set for the earliest deadline. */
+  _armTimer() {
+    if (!this._timers.length) return;
+    var at = this._timers[0].at;
+    if (this._timerHandle !== null) {
+      if (this._timerAt <= at) return;
+      clearTimeout(this._timerHandle);
+    }
+    this._timerAt = at;
+    this._timerHandle = setTimeout(this._fireTimers, Math.max(0, at - performance.now()));
+  }
+
+  /** @private Move due timers into the next frame. */
+  _fireTimers() {
+    this._timerHandle = null;
+    var now = performance.now();
+    while (this._timers.length && this._timers[0].at <= now) {
+      var timer = this._timers.shift();
+      if (timer.fn) this._once.push(timer);
+    }
+    if (this._once.length) this._requestFrame();
+    this._armTimer();
+  }
+
+  /** @private */
+  _tick(now) {
+    this._frameId = null;
+    var start = performance.now();
+    var dt = this._lastFrame ? now - this._lastFrame : this.frameMs;
+    var i;
+
+    /* One-shots always run: they are short DOM writes that can't wait */
+    var once = this._once;
+    this._once = [];
+    for (i = 0; i < once.length; i++) {
+      /* Timers cancelled after they fired have fn cleared */
+      var fn = typeof once[i] === 'function' ? once[i] : once[i].fn;
+      if (!fn) continue;
+      try { fn(now); } catch (e) { console.error('FrameScheduler:', e); }
+    }
+
+    /* Continuous tasks run until the budget is spent. Tasks the last frame
+       had no budget for go first (still in priority order), so a busy
+       high-priority task can't starve the ones below it */
+    var deferred = [];
+    var rest = [];
+    for (i = 0; i < this._tasks.length; i++) {
+      (this._tasks[i].deferred ? deferred : rest).push(this._tasks[i]);
+    }
+    var tasks = deferred.concat(rest);
+    for (i = 0; i < tasks.length; i++) {
+      var task = tasks[i];
+      if (!task.active) continue;
+      if (i > 0 && performance.now() - start > this.budget) {
+        this._stats.deferredTasks += tasks.length - i;
+        for (; i < tasks.length; i++) tasks[i].deferred = true;
+        break;
+      }
+      task.deferred = false;
+      var keep;
+      try { keep = task.run(now, dt); } catch (e) { console.error('FrameScheduler:', e); keep = false; }
+      if (keep === false) this._removeTask(task);
+    }
+
+    var work = performance.now() - start;
+    this._record(dt, work);
+
+    /* Shed load when this frame's work or the last interval overran */
+    var ratio = Math.max(work / this.budget, this._lastFrame ? dt / (this.frameMs * 1.5) : 0);
+    if (ratio > 1) {
+      this._stats.overruns++;
+      for (i = 0; i < this._tasks.length; i++) {
+        if (this._tasks[i].onOverrun) this._tasks[i].onOverrun(ratio);
+      }
+    }
+
+    if (this._tasks.length || this._once.length) {
+      this._lastFrame = now;
+      this._requestFrame();
+    } else {
+      /* Idle: the next burst must not count the gap as a slow frame */
+      this._lastFrame = 0;
+    }
+  }
+
+  /** @private */
+  _record(dt, work) {
+    var s = this._stats;
+    if (this._lastFrame) {
+      this._samples[s.intervals % FrameScheduler.SAMPLES] = dt;
+      s.intervals++;
+      s.intervalTotal += dt;
+      if (dt > s.maxFrame) s.maxFrame = dt;
+      s.droppedFrames += Math.max(0, Math.round(dt / this.frameMs) - 1);
+    }
+    s.frames++;
+    s.workTotal += work;
+    if (work > s.maxWork) s.maxWork = work;
+  }
+}
+
+/** Frame intervals kept for percentile stats */
+FrameScheduler.SAMPLES = 240;
+
+/* Export for SCORM iframe compatibility */
+window.FrameScheduler = FrameScheduler;
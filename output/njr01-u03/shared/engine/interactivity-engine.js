@@ -53,10 +53,15 @@
    *              Smart Engine subsystems from a single config object.
    */
   class InteractivityEngine {
-    constructor() {
+    /**
+     * @param {Object} [options]
+     * @param {Object} [options.states] - StateManager options, e.g.
+     *   { delegate: true, batch: true } for slides with many objects
+     */
+    constructor(options = {}) {
       // Only create subsystems that are available (files may not all be loaded)
       this.variables  = typeof VariableStore  === 'function' ? new VariableStore()  : null;
-      this.states     = typeof StateManager   === 'function' ? new StateManager()   : null;
+      this.states     = typeof StateManager   === 'function' ? new StateManager(options.states) : null;
       this.audio      = typeof AudioPlayer    === 'function' ? new AudioPlayer()    : null;
       this.branching  = typeof BranchingEngine === 'function' && this.variables
                         ? new BranchingEngine(this.variables) : null;
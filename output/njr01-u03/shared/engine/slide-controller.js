@@ -11,6 +11,26 @@
  *     onComplete: function() { ... }
  *   });
  *
+ * Lazy mode (opt-in, for long SCOs and low-end devices):
+ *   new SlideController({ lazy: true, onSlideHydrate: function(index, slide) { ... } });
+ *
+ *   Only the current slide and its neighbours (hydrateRadius) hold live DOM.
+ *   Slides may be authored inert, so their images and animations don't
+ *   load until needed:
+ *     <div class="slide" data-slide="4"><template>...</template></div>
+ *   Once such a slide is further than teardownDistance away its nodes are
+ *   dropped and re-created from the <template> on the next visit. Slides
+ *   authored as live markup have nothing to rebuild from, so they are
+ *   parked in a detached fragment instead and keep their state. Scripts
+ *   that look up elements inside a slide should do it from onSlideHydrate
+ *   rather than at page load.
+ *
+ * Next-SCO prefetch (opt-in):
+ *   new SlideController({ lazy: true, prefetch: true });
+ *
+ *   Near the end of the SCO (prefetchFrom slides before the last), the
+ *   files listed for the next SCO in imsmanifest.xml order are prefetched.
+ *
  * HTML structure expected:
  *   <div class="sco-container">
  *     <header class="nav-bar">...</header>
@@ -30,6 +50,30 @@
 (function() {
   'use strict';
 
+  var DEFAULTS = {
+    // Keep inactive slides as inert markup until they are near
+    lazy: false,
+
+    // Slides on each side of the current one kept hydrated
+    hydrateRadius: 1,
+
+    // Slides further away than this are torn down (lazy mode)
+    teardownDistance: 3,
+
+    // Prefetch the next SCO's files near the end of this one
+    prefetch: false,
+
+    // Start prefetching the next SCO this many slides before the last
+    prefetchFrom: 1,
+
+    // Manifest location relative to the SCO page (false disables prefetch)
+    manifestUrl: '../imsmanifest.xml'
+  };
+
+  function option(options, key) {
+    return options[key] !== undefined ? options[key] : DEFAULTS[key];
+  }
+
   function SlideController(options) {
     options = options || {};
 
@@ -42,27 +86,62 @@
     this.progressFill = document.querySelector('.progress-fill');
     this.onSlideChange = options.onSlideChange || null;
     this.onComplete = options.onComplete || null;
+    this.onSlideHydrate = options.onSlideHydrate || null;
     this.animating = false;
 
+    this.lazy = option(options, 'lazy');
+    this.hydrateRadius = option(options, 'hydrateRadius');
+    this.teardownDistance = Math.max(option(options, 'teardownDistance'), this.hydrateRadius + 1);
+    this.prefetch = option(options, 'prefetch');
+    this.prefetchFrom = option(options, 'prefetchFrom');
+    this.manifestUrl = option(options, 'manifestUrl');
+
+    // Index of the slide currently displayed (-1 = none yet)
+    this._visibleIndex = -1;
+    // Per-slide hydration state, parked content and authored templates (lazy mode)
+    this._hydrated = [];
+    this._parked = [];
+    this._templates = [];
+    // Per-slide cached "content taller than 70% of the slide" decision
+    // and the pending re-measure frame (lazy mode)
+    this._alignTop = [];
+    this._alignFrame = null;
+    this._prefetched = false;
+
     // Initialize
     if (this.totalSlides > 0) {
+      this._hideAll();
+      if (this.lazy) {
+        this._initLazy();
+      }
       this._showSlide(this.currentIndex, false);
       this._bindEvents();
       this._updateUI();
     }
   }
 
+  SlideController.prototype._hideAll = function() {
+    for (var i = 0; i < this.slides.length; i++) {
+      this.slides[i].classList.remove('active', 'animate-in');
+      this.slides[i].style.display = 'none';
+    }
+  };
+
   SlideController.prototype._showSlide = function(index, animate) {
     var self = this;
 
-    // Hide all slides
-    for (var i = 0; i < this.slides.length; i++) {
-      if (i !== index) {
-        this.slides[i].classList.remove('active', 'animate-in');
-        this.slides[i].style.display = 'none';
-      }
+    if (this.lazy) {
+      this._hydrateAround(index);
     }
 
+    // Hide the previously shown slide (all others are already hidden)
+    var previous = this._visibleIndex;
+    if (previous !== -1 && previous !== index) {
+      this.slides[previous].classList.remove('active', 'animate-in');
+      this.slides[previous].style.display = 'none';
+    }
+    this._visibleIndex = index;
+
     // Show target slide
     var targetSlide = this.slides[index];
     targetSlide.style.display = 'flex';
@@ -82,15 +161,218 @@
     // Auto-detect if content needs top alignment
     var inner = targetSlide.querySelector('.slide-inner');
     if (inner) {
-      // If content is taller than ~70% of viewport, align top
-      if (inner.scrollHeight > targetSlide.clientHeight * 0.7) {
-        inner.classList.add('align-top');
+      if (!this.lazy) {
+        this._measureAlignTop(index);
+      } else if (this._alignTop[index] !== undefined) {
+        inner.classList.toggle('align-top', this._alignTop[index]);
       } else {
-        inner.classList.remove('align-top');
+        // Hydration just rebuilt the slide: measure at the start of the
+        // next frame rather than right after those writes, and cache the
+        // result so revisits don't measure again
+        this._scheduleAlignTop();
       }
     }
+
+    if (this.prefetch && this.manifestUrl && index >= this.totalSlides - 1 - this.prefetchFrom) {
+      this._prefetchNextSco();
+    }
+  };
+
+  /**
+   * Top-align the slide's content when it is taller than ~70% of the
+   * slide. Reads scrollHeight, so it forces a synchronous layout.
+   */
+  SlideController.prototype._measureAlignTop = function(index) {
+    var slide = this.slides[index];
+    var inner = slide.querySelector('.slide-inner');
+    if (!inner) return;
+
+    var alignTop = inner.scrollHeight > slide.clientHeight * 0.7;
+    if (this.lazy) {
+      this._alignTop[index] = alignTop;
+    }
+    inner.classList.toggle('align-top', alignTop);
+  };
+
+  /**
+   * Measure the visible slide in the next frame (lazy mode). Requests
+   * made before that frame share it.
+   */
+  SlideController.prototype._scheduleAlignTop = function() {
+    if (this._alignFrame !== null) return;
+    var self = this;
+
+    this._alignFrame = requestAnimationFrame(function() {
+      self._alignFrame = null;
+      if (self._visibleIndex !== -1) {
+        self._measureAlignTop(self._visibleIndex);
+      }
+    });
+  };
+
+  // ============================================
+  // Lazy Hydration
+  // ============================================
+
+  /**
+   * Record which slides start out hydrated.
+   */
+  SlideController.prototype._initLazy = function() {
+    // Authored-inert slides start dehydrated; the first _showSlide() parks
+    // the live ones that are too far away
+    for (var i = 0; i < this.slides.length; i++) {
+      this._templates[i] = this._slideTemplate(this.slides[i]);
+      this._hydrated[i] = !this._templates[i];
+    }
+  };
+
+  /** The authored inert <template> of a slide, if any. */
+  SlideController.prototype._slideTemplate = function(slide) {
+    var first = slide.firstElementChild;
+    return first && first.tagName === 'TEMPLATE' && !first.nextElementSibling ? first : null;
   };
 
+  /**
+   * Hydrate slides within hydrateRadius of index and tear down slides
+   * further away than teardownDistance.
+   */
+  SlideController.prototype._hydrateAround = function(index) {
+    for (var i = 0; i < this.slides.length; i++) {
+      var distance = Math.abs(i - index);
+      if (distance <= this.hydrateRadius) {
+        this._hydrate(i);
+      } else if (distance > this.teardownDistance) {
+        this._teardown(i);
+      }
+    }
+  };
+
+  SlideController.prototype._hydrate = function(i) {
+    if (this._hydrated[i]) return;
+    var slide = this.slides[i];
+
+    if (this._parked[i]) {
+      // Previously torn down: put the same nodes (and their state) back
+      slide.appendChild(this._parked[i]);
+      this._parked[i] = null;
+    } else if (this._templates[i]) {
+      // Authored-inert slide: build it from its template
+      slide.replaceChild(document.importNode(this._templates[i].content, true), this._templates[i]);
+    }
+
+    this._hydrated[i] = true;
+    if (this.onSlideHydrate) {
+      this.onSlideHydrate(i, slide);
+    }
+  };
+
+  SlideController.prototype._teardown = function(i) {
+    if (!this._hydrated[i]) return;
+    var slide = this.slides[i];
+
+    if (this._templates[i]) {
+      // Drop the nodes; the next visit re-creates them from the template
+      slide.textContent = '';
+      slide.appendChild(this._templates[i]);
+    } else {
+      var fragment = document.createDocumentFragment();
+      while (slide.firstChild) {
+        fragment.appendChild(slide.firstChild);
+      }
+      this._parked[i] = fragment;
+    }
+
+    this._hydrated[i] = false;
+    delete this._alignTop[i];
+  };
+
+  // ============================================
+  // Next-SCO Prefetch
+  // ============================================
+
+  /**
+   * Prefetch the files of the SCO that follows this one in the manifest's
+   * organization order, skipping anything this page already loaded.
+   */
+  SlideController.prototype._prefetchNextSco = function() {
+    if (this._prefetched) return;
+    this._prefetched = true;
+
+    if (typeof fetch !== 'function' || typeof DOMParser !== 'function') return;
+    if (navigator.connection && navigator.connection.saveData) return;
+
+    var manifestUrl = new URL(this.manifestUrl, window.location.href);
+
+    fetch(manifestUrl.href).then(function(response) {
+      return response.ok ? response.text() : null;
+    }).then(function(text) {
+      if (!text) return;
+
+      var doc = new DOMParser().parseFromString(text, 'application/xml');
+      var files = nextScoFiles(doc, manifestUrl);
+      var loaded = {};
+
+      if (window.performance && performance.getEntriesByType) {
+        performance.getEntriesByType('resource').forEach(function(entry) {
+          loaded[entry.name] = true;
+        });
+      }
+      var links = document.querySelectorAll('script[src], link[href]');
+      for (var i = 0; i < links.length; i++) {
+        loaded[links[i].src || links[i].href] = true;
+      }
+
+      files.forEach(function(href) {
+        if (loaded[href]) return;
+        var link = document.createElement('link');
+        link.rel = 'prefetch';
+        link.href = href;
+        document.head.appendChild(link);
+      });
+    }).catch(function() {
+      /* No manifest (e.g. opened from disk) — prefetch is only a hint */
+    });
+  };
+
+  /**
+   * Absolute URLs of the next SCO's own <file> entries. Dependencies
+   * (shared_resources) are not followed: this page already loaded the
+   * shared files it needs, and the rest are not used by the next SCO.
+   */
+  function nextScoFiles(doc, manifestUrl) {
+    var resources = {};
+    var nodes = doc.getElementsByTagName('resource');
+    var current = null;
+
+    for (var i = 0; i < nodes.length; i++) {
+      var id = nodes[i].getAttribute('identifier');
+      resources[id] = nodes[i];
+      var href = nodes[i].getAttribute('href');
+      if (href && new URL(href, manifestUrl).pathname === window.location.pathname) {
+        current = id;
+      }
+    }
+    if (!current) return [];
+
+    // Organization order decides what comes next
+    var items = doc.getElementsByTagName('item');
+    var next = null;
+    for (var j = 0; j < items.length - 1; j++) {
+      if (items[j].getAttribute('identifierref') === current) {
+        next = resources[items[j + 1].getAttribute('identifierref')];
+        break;
+      }
+    }
+    if (!next) return [];
+
+    var files = [];
+    var fileNodes = next.getElementsByTagName('file');
+    for (var f = 0; f < fileNodes.length; f++) {
+      files.push(new URL(fileNodes[f].getAttribute('href'), manifestUrl).href);
+    }
+    return files;
+  }
+
   SlideController.prototype._updateUI = function() {
     // Update page indicator
     if (this.pageIndicator) {
@@ -172,6 +454,15 @@
       this.nextBtn.addEventListener('click', function() { self.next(); });
     }
 
+    // Content height changes with the viewport: drop the cached
+    // alignment and re-measure the visible slide
+    if (this.lazy) {
+      window.addEventListener('resize', function() {
+        self._alignTop = [];
+        self._scheduleAlignTop();
+      });
+    }
+
     // Keyboard navigation
     document.addEventListener('keydown', function(e) {
       if (e.key === 'ArrowRight' || e.key === 'ArrowDown') {
@@ -2,16 +2,24 @@
    SCORM Content Studio — Sound Effects Engine
    ============================================================================
    Web Audio API synthesized UI sounds — ZERO audio files needed.
-   All sounds are generated from mathematical waveforms in real-time.
+   All sounds are generated from mathematical waveforms.
 
    Usage:
-     const sounds = new SoundEffects();
+     const sounds = SoundEffects.shared;   // or new SoundEffects()
      sounds.playSound('click');    // Short sine blip
      sounds.playSound('success');  // Ascending two-tone chime
      sounds.playSound('error');    // Descending low buzz
      sounds.playSound('celebration'); // Chord arpeggio
-     sounds.playSound('whoosh');   // Noise sweep
+     sounds.playSound('whoosh');   // Filtered sawtooth sweep
      sounds.playSound('pop');      // Short resonant click
+     sounds.getStats();            // { plays, avgMs, p95Ms, overBudget, ... }
+
+   Each sound is rendered once into an AudioBuffer with an
+   OfflineAudioContext (when the browser is idle, or at the first user
+   gesture at the latest). Playback then only starts a buffer source on
+   one of a capped pool of voices; when every voice is busy the oldest
+   one is cut off. Until the buffers are ready, sounds are synthesized
+   live as before.
 
    The AudioContext is lazily initialized on first user gesture
    to comply with browser autoplay policies.
@@ -19,14 +27,148 @@
 
 'use strict';
 
+/** Simultaneous buffer voices; rapid clicks beyond this cut the oldest */
+const SOUND_MAX_VOICES = 6;
+
+/** Render rate used before a live AudioContext exists */
+const SOUND_SAMPLE_RATE = 44100;
+
+/** Per-play scheduling latency target in ms */
+const SOUND_LATENCY_BUDGET_MS = 10;
+
+/** Plays kept for percentile stats */
+const SOUND_LATENCY_SAMPLES = 120;
+
+/**
+ * Sound definitions. Each renders into any BaseAudioContext: `out` is
+ * the node to connect to and `now` the start time. Volumes are relative;
+ * the master volume is applied at playback.
+ */
+const SOUND_DEFS = {
+  /** Short sine blip — UI tap feedback */
+  click: {
+    duration: 0.06,
+    render: function (ctx, out, now) {
+      SoundEffects._tone(ctx, out, now, 800, 0.06, 'sine', 0.15);
+    }
+  },
+
+  /** Ascending two-tone chime — correct / success */
+  success: {
+    duration: 0.55,
+    render: function (ctx, out, now) {
+      SoundEffects._arpeggio(ctx, out, now, [523.25, 659.25], 0.15, 0.4, 0.25);
+    }
+  },
+
+  /** Descending low buzz — incorrect / error */
+  error: {
+    duration: 0.3,
+    render: function (ctx, out, now) {
+      var osc = ctx.createOscillator();
+      var gain = ctx.createGain();
+
+      osc.type = 'sawtooth';
+      osc.frequency.setValueAtTime(200, now);
+      osc.frequency.linearRampToValueAtTime(150, now + 0.3);
+
+      gain.gain.setValueAtTime(0.12, now);
+      gain.gain.exponentialRampToValueAtTime(0.001, now + 0.3);
+
+      osc.connect(gain);
+      gain.connect(out);
+      osc.start(now);
+      osc.stop(now + 0.3);
+    }
+  },
+
+  /** Ascending arpeggio chord — celebration / achievement */
+  celebration: {
+    duration: 0.96,
+    render: function (ctx, out, now) {
+      SoundEffects._arpeggio(ctx, out, now, [523.25, 659.25, 783.99, 1046.50], 0.12, 0.6, 0.2);
+    }
+  },
+
+  /** Frequency sweep — slide transition / navigation */
+  whoosh: {
+    duration: 0.2,
+    render: function (ctx, out, now) {
+      var osc = ctx.createOscillator();
+      var gain = ctx.createGain();
+      var filter = ctx.createBiquadFilter();
+
+      osc.type = 'sawtooth';
+      osc.frequency.setValueAtTime(100, now);
+      osc.frequency.exponentialRampToValueAtTime(2000, now + 0.15);
+
+      filter.type = 'bandpass';
+      filter.frequency.setValueAtTime(1000, now);
+      filter.Q.setValueAtTime(0.5, now);
+
+      gain.gain.setValueAtTime(0.08, now);
+      gain.gain.exponentialRampToValueAtTime(0.001, now + 0.2);
+
+      osc.connect(filter);
+      filter.connect(gain);
+      gain.connect(out);
+      osc.start(now);
+      osc.stop(now + 0.2);
+    }
+  },
+
+  /** Short resonant click — button pop */
+  pop: {
+    duration: 0.1,
+    render: function (ctx, out, now) {
+      var osc = ctx.createOscillator();
+      var gain = ctx.createGain();
+
+      osc.type = 'sine';
+      osc.frequency.setValueAtTime(600, now);
+      osc.frequency.exponentialRampToValueAtTime(200, now + 0.1);
+
+      gain.gain.setValueAtTime(0.15, now);
+      gain.gain.exponentialRampToValueAtTime(0.001, now + 0.1);
+
+      osc.connect(gain);
+      gain.connect(out);
+      osc.start(now);
+      osc.stop(now + 0.1);
+    }
+  }
+};
+
 class SoundEffects {
   constructor() {
     /** @type {AudioContext|null} */
     this._ctx = null;
+    /** @type {GainNode|null} Master volume, shared by every voice */
+    this._master = null;
     /** @type {boolean} */
     this._muted = false;
     /** @type {number} 0-1 */
     this._volume = 0.5;
+
+    /** @type {Object<string, AudioBuffer>} Rendered sounds by name */
+    this._buffers = {};
+    /** @type {Promise|null} Pending or finished render of all sounds */
+    this._rendering = null;
+    /** @type {Array<{gain: GainNode, source: AudioBufferSourceNode|null, startedAt: number}>} */
+    this._voices = [];
+
+    this.resetStats();
+
+    this._onGesture = this._onGesture.bind(this);
+    this._warmUp();
+  }
+
+  /** Instance shared by all engines on the page (one AudioContext, one cache). */
+  static get shared() {
+    if (!SoundEffects._shared) {
+      SoundEffects._shared = new SoundEffects();
+    }
+    return SoundEffects._shared;
   }
 
   /* ------------------------------------------------------------------
@@ -39,13 +181,43 @@ class SoundEffects {
    */
   _init() {
     if (!this._ctx) {
-      this._ctx = new (window.AudioContext || window.webkitAudioContext)();
+      this._ctx = new (window.AudioContext || window.webkitAudioContext)({ latencyHint: 'interactive' });
+      this._master = this._ctx.createGain();
+      this._master.gain.value = this._volume;
+      this._master.connect(this._ctx.destination);
     }
     if (this._ctx.state === 'suspended') {
       this._ctx.resume();
     }
   }
 
+  /**
+   * Render every sound into the buffer cache. Safe to call repeatedly;
+   * runs automatically when idle or at the first user gesture.
+   * @returns {Promise}
+   */
+  prepare() {
+    if (this._rendering) return this._rendering;
+
+    var Offline = window.OfflineAudioContext || window.webkitOfflineAudioContext;
+    if (!Offline) {
+      this._rendering = Promise.resolve();
+      return this._rendering;
+    }
+
+    var self = this;
+    var rate = this._ctx ? this._ctx.sampleRate : SOUND_SAMPLE_RATE;
+    this._rendering = Promise.all(Object.keys(SOUND_DEFS).map(function (name) {
+      return self._render(Offline, SOUND_DEFS[name], rate).then(function (buffer) {
+        self._buffers[name] = buffer;
+      });
+    })).catch(function (e) {
+      /* Live synthesis keeps working without the cache */
+      console.warn('SoundEffects: pre-rendering failed', e);
+    });
+    return this._rendering;
+  }
+
   /* ------------------------------------------------------------------
      Public API
      ------------------------------------------------------------------ */
@@ -53,12 +225,26 @@ class SoundEffects {
   /**
    * Play a named sound effect.
    * @param {'click'|'success'|'error'|'celebration'|'whoosh'|'pop'} name
+   * @returns {number} Scheduling latency in ms, or -1 if nothing played
    */
   playSound(name) {
-    if (this._muted) return;
-    if (typeof this[name] === 'function') {
-      this[name]();
+    if (this._muted || !SOUND_DEFS.hasOwnProperty(name)) return -1;
+    var start = performance.now();
+
+    this._init();
+    var buffer = this._buffers[name];
+    if (buffer) {
+      this._playBuffer(buffer);
+      this._stats.cached++;
+    } else {
+      SOUND_DEFS[name].render(this._ctx, this._master, this._ctx.currentTime);
+      this._stats.live++;
+      this.prepare();
     }
+
+    var latency = performance.now() - start;
+    this._record(latency);
+    return latency;
   }
 
   /**
@@ -67,6 +253,9 @@ class SoundEffects {
    */
   setVolume(level) {
     this._volume = Math.max(0, Math.min(1, level));
+    if (this._master) {
+      this._master.gain.setValueAtTime(this._volume, this._ctx.currentTime);
+    }
   }
 
   /**
@@ -81,161 +270,191 @@ class SoundEffects {
   /** @returns {boolean} */
   get muted() { return this._muted; }
 
+  /**
+   * Per-play scheduling latency (time spent in playSound) since the
+   * last reset, plus the AudioContext's own output latency.
+   * @returns {{plays: number, cached: number, live: number, stolen: number,
+   *   avgMs: number, p95Ms: number, maxMs: number, overBudget: number,
+   *   budgetMs: number, baseLatencyMs: number, outputLatencyMs: number}}
+   */
+  getStats() {
+    var s = this._stats;
+    var n = Math.min(s.plays, SOUND_LATENCY_SAMPLES);
+    var sorted = Array.prototype.slice.call(this._samples, 0, n).sort(function (a, b) { return a - b; });
+    var ctx = this._ctx;
+
+    return {
+      plays: s.plays,
+      cached: s.cached,
+      live: s.live,
+      stolen: s.stolen,
+      avgMs: s.plays ? SoundEffects._round(s.total / s.plays) : 0,
+      p95Ms: n ? SoundEffects._round(sorted[Math.min(n - 1, Math.floor(n * 0.95))]) : 0,
+      maxMs: SoundEffects._round(s.max),
+      overBudget: s.overBudget,
+      budgetMs: SOUND_LATENCY_BUDGET_MS,
+      baseLatencyMs: ctx && ctx.baseLatency ? SoundEffects._round(ctx.baseLatency * 1000) : 0,
+      outputLatencyMs: ctx && ctx.outputLatency ? SoundEffects._round(ctx.outputLatency * 1000) : 0
+    };
+  }
+
+  resetStats() {
+    this._stats = { plays: 0, cached: 0, live: 0, stolen: 0, total: 0, max: 0, overBudget: 0 };
+    /** @type {Float32Array} Ring of recent play latencies */
+    this._samples = new Float32Array(SOUND_LATENCY_SAMPLES);
+  }
+
   /* ------------------------------------------------------------------
-     Internal: helper to create an oscillator-gain pair with fade-out
+     Named shortcuts (content scripts call sounds.click() etc.)
+     ------------------------------------------------------------------ */
+
+  click() { return this.playSound('click'); }
+  success() { return this.playSound('success'); }
+  error() { return this.playSound('error'); }
+  celebration() { return this.playSound('celebration'); }
+  whoosh() { return this.playSound('whoosh'); }
+  pop() { return this.playSound('pop'); }
+
+  /* ------------------------------------------------------------------
+     Internals
      ------------------------------------------------------------------ */
 
   /** @private */
-  _tone(frequency, duration, type, relativeVolume) {
-    this._init();
-    var now = this._ctx.currentTime;
-    var vol = relativeVolume * this._volume;
+  static _round(ms) {
+    return Math.round(ms * 100) / 100;
+  }
 
-    var osc = this._ctx.createOscillator();
-    var gain = this._ctx.createGain();
+  /** @private Oscillator-gain pair with fade-out */
+  static _tone(ctx, out, now, frequency, duration, type, volume) {
+    var osc = ctx.createOscillator();
+    var gain = ctx.createGain();
 
     osc.type = type;
     osc.frequency.setValueAtTime(frequency, now);
 
-    gain.gain.setValueAtTime(vol, now);
+    gain.gain.setValueAtTime(volume, now);
     gain.gain.exponentialRampToValueAtTime(0.001, now + duration);
 
     osc.connect(gain);
-    gain.connect(this._ctx.destination);
+    gain.connect(out);
 
     osc.start(now);
     osc.stop(now + duration);
   }
 
-  /* ------------------------------------------------------------------
-     Sound Definitions — subtle, soft, minimal
-     ------------------------------------------------------------------ */
-
-  /** Short sine blip — UI tap feedback */
-  click() {
-    this._tone(800, 0.06, 'sine', 0.15);
-  }
-
-  /** Ascending two-tone chime — correct / success */
-  success() {
-    this._init();
-    var now = this._ctx.currentTime;
-    var vol = 0.25 * this._volume;
-
-    [523.25, 659.25].forEach(function (freq, i) {
-      var osc = this._ctx.createOscillator();
-      var gain = this._ctx.createGain();
+  /** @private Staggered sine notes with a soft attack */
+  static _arpeggio(ctx, out, now, frequencies, step, length, volume) {
+    frequencies.forEach(function (freq, i) {
+      var osc = ctx.createOscillator();
+      var gain = ctx.createGain();
 
       osc.type = 'sine';
       osc.frequency.setValueAtTime(freq, now);
 
-      var start = i * 0.15;
+      var start = i * step;
       gain.gain.setValueAtTime(0, now + start);
-      gain.gain.linearRampToValueAtTime(vol, now + start + 0.02);
-      gain.gain.exponentialRampToValueAtTime(0.001, now + start + 0.4);
+      gain.gain.linearRampToValueAtTime(volume, now + start + 0.02);
+      gain.gain.exponentialRampToValueAtTime(0.001, now + start + length);
 
       osc.connect(gain);
-      gain.connect(this._ctx.destination);
+      gain.connect(out);
       osc.start(now + start);
-      osc.stop(now + start + 0.4);
-    }.bind(this));
+      osc.stop(now + start + length);
+    });
   }
 
-  /** Descending low buzz — incorrect / error */
-  error() {
-    this._init();
-    var now = this._ctx.currentTime;
-    var vol = 0.12 * this._volume;
-
-    var osc = this._ctx.createOscillator();
-    var gain = this._ctx.createGain();
-
-    osc.type = 'sawtooth';
-    osc.frequency.setValueAtTime(200, now);
-    osc.frequency.linearRampToValueAtTime(150, now + 0.3);
-
-    gain.gain.setValueAtTime(vol, now);
-    gain.gain.exponentialRampToValueAtTime(0.001, now + 0.3);
-
-    osc.connect(gain);
-    gain.connect(this._ctx.destination);
-    osc.start(now);
-    osc.stop(now + 0.3);
+  /** @private Render one definition offline. */
+  _render(Offline, def, rate) {
+    var ctx = new Offline(1, Math.ceil(def.duration * rate), rate);
+    def.render(ctx, ctx.destination, 0);
+
+    return new Promise(function (resolve, reject) {
+      ctx.oncomplete = function (e) { resolve(e.renderedBuffer); };
+      var result = ctx.startRendering();
+      /* Promise-based in current browsers, event-based in old WebKit */
+      if (result && typeof result.then === 'function') result.then(resolve, reject);
+    });
   }
 
-  /** Ascending arpeggio chord — celebration / achievement */
-  celebration() {
-    this._init();
-    var now = this._ctx.currentTime;
-    var vol = 0.2 * this._volume;
-
-    [523.25, 659.25, 783.99, 1046.50].forEach(function (freq, i) {
-      var osc = this._ctx.createOscillator();
-      var gain = this._ctx.createGain();
-
-      osc.type = 'sine';
-      osc.frequency.setValueAtTime(freq, now);
+  /**
+   * @private Render at the first idle moment, or at the first gesture
+   * (which also creates the AudioContext, so the first click is not
+   * paying for it).
+   */
+  _warmUp() {
+    if (typeof document === 'undefined') return;
 
-      var start = i * 0.12;
-      gain.gain.setValueAtTime(0, now + start);
-      gain.gain.linearRampToValueAtTime(vol, now + start + 0.02);
-      gain.gain.exponentialRampToValueAtTime(0.001, now + start + 0.6);
+    var self = this;
+    ['pointerdown', 'keydown', 'touchstart'].forEach(function (type) {
+      document.addEventListener(type, self._onGesture, { capture: true, passive: true });
+    });
 
-      osc.connect(gain);
-      gain.connect(this._ctx.destination);
-      osc.start(now + start);
-      osc.stop(now + start + 0.6);
-    }.bind(this));
+    if (typeof window.requestIdleCallback === 'function') {
+      window.requestIdleCallback(function () { self.prepare(); }, { timeout: 5000 });
+    }
   }
 
-  /** Frequency sweep — slide transition / navigation */
-  whoosh() {
-    this._init();
-    var now = this._ctx.currentTime;
-    var vol = 0.08 * this._volume;
-
-    var osc = this._ctx.createOscillator();
-    var gain = this._ctx.createGain();
-    var filter = this._ctx.createBiquadFilter();
-
-    osc.type = 'sawtooth';
-    osc.frequency.setValueAtTime(100, now);
-    osc.frequency.exponentialRampToValueAtTime(2000, now + 0.15);
-
-    filter.type = 'bandpass';
-    filter.frequency.setValueAtTime(1000, now);
-    filter.Q.setValueAtTime(0.5, now);
-
-    gain.gain.setValueAtTime(vol, now);
-    gain.gain.exponentialRampToValueAtTime(0.001, now + 0.2);
-
-    osc.connect(filter);
-    filter.connect(gain);
-    gain.connect(this._ctx.destination);
-    osc.start(now);
-    osc.stop(now + 0.2);
+  /** @private */
+  _onGesture() {
+    var self = this;
+    ['pointerdown', 'keydown', 'touchstart'].forEach(function (type) {
+      document.removeEventListener(type, self._onGesture, { capture: true });
+    });
+    try {
+      this._init();
+    } catch (e) { /* no Web Audio; playSound will report it */ }
+    this.prepare();
   }
 
-  /** Short resonant click — button pop */
-  pop() {
-    this._init();
-    var now = this._ctx.currentTime;
-    var vol = 0.15 * this._volume;
+  /** @private Start a cached buffer on a pooled voice. */
+  _playBuffer(buffer) {
+    var voice = this._voice();
+    var source = this._ctx.createBufferSource();
+    source.buffer = buffer;
+    source.connect(voice.gain);
+    source.onended = function () {
+      if (voice.source === source) voice.source = null;
+      source.disconnect();
+    };
+    voice.source = source;
+    voice.startedAt = this._ctx.currentTime;
+    source.start();
+  }
 
-    var osc = this._ctx.createOscillator();
-    var gain = this._ctx.createGain();
+  /** @private Free voice, a new one below the cap, or the oldest one. */
+  _voice() {
+    var oldest = null;
+    for (var i = 0; i < this._voices.length; i++) {
+      var v = this._voices[i];
+      if (!v.source) return v;
+      if (!oldest || v.startedAt < oldest.startedAt) oldest = v;
+    }
 
-    osc.type = 'sine';
-    osc.frequency.setValueAtTime(600, now);
-    osc.frequency.exponentialRampToValueAtTime(200, now + 0.1);
+    if (this._voices.length < SOUND_MAX_VOICES) {
+      var gain = this._ctx.createGain();
+      gain.connect(this._master);
+      var voice = { gain: gain, source: null, startedAt: 0 };
+      this._voices.push(voice);
+      return voice;
+    }
 
-    gain.gain.setValueAtTime(vol, now);
-    gain.gain.exponentialRampToValueAtTime(0.001, now + 0.1);
+    var stolen = oldest.source;
+    oldest.source = null;
+    stolen.onended = null;
+    try { stolen.stop(); } catch (e) { /* already ended */ }
+    stolen.disconnect();
+    this._stats.stolen++;
+    return oldest;
+  }
 
-    osc.connect(gain);
-    gain.connect(this._ctx.destination);
-    osc.start(now);
-    osc.stop(now + 0.1);
+  /** @private */
+  _record(latency) {
+    var s = this._stats;
+    this._samples[s.plays % SOUND_LATENCY_SAMPLES] = latency;
+    s.plays++;
+    s.total += latency;
+    if (latency > s.max) s.max = latency;
+    if (latency > SOUND_LATENCY_BUDGET_MS) s.overBudget++;
   }
 }
 
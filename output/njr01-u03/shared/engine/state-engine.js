@@ -29,6 +29,15 @@
  *   [data-state="selected"] { border-color: var(--color-primary); }
  *   [data-state="disabled"] { opacity: 0.4; pointer-events: none; }
  *
+ * Large slides (hundreds of hotspots or drag items):
+ *   const states = new StateManager({ delegate: true, batch: true });
+ *   - delegate: one listener set per slide container (options.container,
+ *     default '.slide') instead of up to eight listeners per object;
+ *     event targets are resolved to objects through the id index.
+ *   - batch: state changes are queued and written in one animation frame,
+ *     as a single class diff per element (button-set updates included).
+ *   states.getStats(); // { listeners, interactions, mutations, ... }
+ *
  * @version 1.0.0
  */
 
@@ -41,7 +50,13 @@
    *              button sets, CSS class application, and SCORM serialization.
    */
   class StateManager {
-    constructor() {
+    /**
+     * @param {Object} [options]
+     * @param {boolean} [options.delegate=false] - One listener set per container
+     * @param {string} [options.container='.slide'] - Container selector for delegation
+     * @param {boolean} [options.batch=false] - Apply DOM writes once per animation frame
+     */
+    constructor(options = {}) {
       /**
        * Registered objects.
        * Map<objectId, {
@@ -51,7 +66,13 @@
        *   states: Object,
        *   autoStates: boolean,
        *   visited: boolean,
-       *   buttonSet: string|null
+       *   buttonSet: string|null,
+       *   hover: boolean,             // auto-state flags
+       *   down: boolean,
+       *   appliedState: string|null,  // state last written to the DOM
+       *   appliedContent: string|undefined,
+       *   managedClasses: string[],   // every class a state can set
+       *   container: HTMLElement|null // delegation container
        * }>
        */
       this._objects = new Map();
@@ -73,6 +94,27 @@
        * Map<objectId, Array<{ element, event, handler }>>
        */
       this._boundHandlers = new Map();
+
+      this._delegate = !!options.delegate;
+      this._containerSelector = options.container || '.slide';
+      this._batch = !!options.batch;
+
+      /**
+       * Delegated listener sets, one per container.
+       * Map<container, { handlers: Array<{ event, handler }>, objects: number }>
+       */
+      this._containers = new Map();
+
+      /**
+       * Objects whose DOM is behind their state (batch mode).
+       * Set<objectId>
+       */
+      this._dirty = new Set();
+      this._frameQueued = false;
+      this._lastEvent = null;
+      this._flushDirty = this._flushDirty.bind(this);
+
+      this.resetStats();
     }
 
     // -------------------------------------------------------------------------
@@ -119,7 +161,13 @@
         states: allStates,
         autoStates: options.autoStates !== false,
         visited: false,
-        buttonSet: options.buttonSet || null
+        buttonSet: options.buttonSet || null,
+        hover: false,
+        down: false,
+        appliedState: null,
+        appliedContent: undefined,
+        managedClasses: this._collectClasses(allStates),
+        container: null
       };
 
       this._objects.set(objectId, obj);
@@ -135,7 +183,11 @@
 
       // Bind auto-state event handlers (hover, down, visited)
       if (obj.autoStates) {
-        this._bindAutoStates(objectId);
+        if (this._delegate) {
+          this._attachContainer(objectId);
+        } else {
+          this._bindAutoStates(objectId);
+        }
       }
 
       // Make element keyboard-accessible if it's interactive
@@ -145,9 +197,8 @@
       }
 
       // Apply initial state
-      const initial = options.initialState || 'normal';
-      this._applyState(objectId, initial);
-      obj.currentState = initial;
+      obj.currentState = options.initialState || 'normal';
+      this._invalidate(objectId);
     }
 
     /**
@@ -205,8 +256,10 @@
       obj.previousState = obj.currentState;
       obj.currentState = stateName;
 
-      // Apply the visual state
-      this._applyState(objectId, stateName);
+      // Apply the visual state (a new state clears hover/down, as before)
+      obj.hover = false;
+      obj.down = false;
+      this._invalidate(objectId);
 
       // Emit state change event for trigger engine
       this._emit('stateChange', {
@@ -276,6 +329,53 @@
       return obj ? obj.currentState === 'hidden' : false;
     }
 
+    /**
+     * Write queued state changes to the DOM now instead of next frame.
+     */
+    flush() {
+      this._flushDirty();
+    }
+
+    // -------------------------------------------------------------------------
+    // Stats
+    // -------------------------------------------------------------------------
+
+    /**
+     * DOM work since the last reset. An interaction runs from one click
+     * (or keyboard activation) to the next and includes the frame that
+     * applies its state changes.
+     * @returns {{ listeners: number, interactions: number, mutations: number,
+     *   mutationsPerInteraction: number, lastInteraction: number,
+     *   maxInteraction: number, frames: number }}
+     */
+    getStats() {
+      const s = this._stats;
+      return {
+        listeners: s.listeners,
+        interactions: s.interactions,
+        mutations: s.mutations,
+        mutationsPerInteraction: s.interactions
+          ? Math.round(s.interactionMutations / s.interactions * 10) / 10 : 0,
+        lastInteraction: s.current,
+        maxInteraction: s.max,
+        frames: s.frames
+      };
+    }
+
+    /** Reset counters (attached listeners are still counted). */
+    resetStats() {
+      const listeners = this._stats ? this._stats.listeners : 0;
+      this._stats = {
+        listeners,
+        interactions: 0,
+        mutations: 0,
+        interactionMutations: 0,
+        current: 0,
+        max: 0,
+        frames: 0
+      };
+    }
+
     // -------------------------------------------------------------------------
     // Listeners
     // -------------------------------------------------------------------------
@@ -351,6 +451,8 @@
      */
     unregister(objectId) {
       this._removeAutoStates(objectId);
+      this._detachContainer(objectId);
+      this._dirty.delete(objectId);
       this._objects.delete(objectId);
 
       // Remove from button sets
@@ -368,10 +470,15 @@
       for (const [objectId] of this._objects) {
         this._removeAutoStates(objectId);
       }
+      for (const [container, entry] of this._containers) {
+        this._unbindContainer(container, entry);
+      }
       this._objects.clear();
       this._buttonSets.clear();
       this._listeners = [];
       this._boundHandlers.clear();
+      this._containers.clear();
+      this._dirty.clear();
     }
 
     // -------------------------------------------------------------------------
@@ -379,60 +486,105 @@
     // -------------------------------------------------------------------------
 
     /**
-     * Apply a state's visual changes to the DOM element.
-     * Uses data-state attribute for CSS targeting and adds/removes classes.
+     * Mark an object's DOM as out of date. Applied at once, or in the
+     * next animation frame in batch mode (several changes to the same
+     * object then cost a single write pass).
+     * @private
+     */
+    _invalidate(objectId) {
+      if (!this._batch) {
+        this._applyState(objectId);
+        return;
+      }
+      this._dirty.add(objectId);
+      if (this._frameQueued) return;
+      this._frameQueued = true;
+      if (window.FrameScheduler) {
+        FrameScheduler.shared.once(this._flushDirty);
+      } else {
+        requestAnimationFrame(this._flushDirty);
+      }
+    }
+
+    /** @private */
+    _flushDirty() {
+      this._frameQueued = false;
+      if (!this._dirty.size) return;
+      const dirty = Array.from(this._dirty);
+      this._dirty.clear();
+      dirty.forEach(objectId => this._applyState(objectId));
+      this._stats.frames++;
+    }
+
+    /**
+     * Bring an object's element in line with its current state.
+     * Uses data-state attribute for CSS targeting and adds/removes classes;
+     * only classes whose presence changes are touched.
      * @private
      */
-    _applyState(objectId, stateName) {
+    _applyState(objectId) {
       const obj = this._objects.get(objectId);
       if (!obj) return;
 
       const el = obj.element;
+      const stateName = obj.currentState;
       const stateConfig = obj.states[stateName] || {};
-
-      // 1. Remove ALL state classes from every defined state
-      for (const [, sCfg] of Object.entries(obj.states)) {
-        if (sCfg.classes && sCfg.classes.length > 0) {
-          sCfg.classes.forEach(cls => el.classList.remove(cls));
+      const from = obj.appliedState;
+
+      // 1. Class diff: current state's classes plus active auto-states
+      const wanted = new Set(stateConfig.classes || []);
+      if (obj.hover) this._autoClasses(obj, 'hover').forEach(cls => wanted.add(cls));
+      if (obj.down) this._autoClasses(obj, 'down').forEach(cls => wanted.add(cls));
+
+      for (const cls of obj.managedClasses) {
+        const want = wanted.has(cls);
+        if (el.classList.contains(cls) !== want) {
+          el.classList.toggle(cls, want);
+          this._mutated();
         }
       }
 
-      // 2. Apply new state classes
-      if (stateConfig.classes && stateConfig.classes.length > 0) {
-        stateConfig.classes.forEach(cls => el.classList.add(cls));
-      }
+      // Hover/down changes only touch classes
+      if (from === stateName) return;
+      obj.appliedState = stateName;
 
-      // 3. Apply inline styles if specified (use sparingly — prefer CSS classes)
+      // 2. Apply inline styles if specified (use sparingly — prefer CSS classes)
       if (stateConfig.styles) {
         Object.assign(el.style, stateConfig.styles);
+        this._mutated();
       }
 
-      // 4. Replace content if specified
-      if (stateConfig.content !== undefined) {
+      // 3. Replace content if specified (and not already shown)
+      if (stateConfig.content !== undefined && stateConfig.content !== obj.appliedContent) {
         el.innerHTML = stateConfig.content;
+        obj.appliedContent = stateConfig.content;
+        this._mutated();
       }
 
-      // 5. Set the data-state attribute (the primary CSS hook)
+      // 4. Set the data-state attribute (the primary CSS hook)
       el.setAttribute('data-state', stateName);
+      this._mutated();
 
-      // 6. Handle special built-in state behaviors
+      // 5. Handle special built-in state behaviors
       switch (stateName) {
         case 'hidden':
           el.style.display = 'none';
           el.style.visibility = 'hidden';
           el.setAttribute('aria-hidden', 'true');
           el.setAttribute('tabindex', '-1');
+          this._mutated(4);
           break;
 
         case 'disabled':
           el.style.pointerEvents = 'none';
           el.setAttribute('aria-disabled', 'true');
+          this._mutated(2);
           // Don't hide — disabled elements are visible but non-interactive
           break;
 
         default:
           // Restore from hidden
-          if (obj.previousState === 'hidden') {
+          if (from === 'hidden') {
             el.style.display = '';
             el.style.visibility = '';
             el.removeAttribute('aria-hidden');
@@ -442,20 +594,98 @@
             } else {
               el.removeAttribute('tabindex');
             }
+            this._mutated(4);
           }
           // Restore from disabled
-          if (obj.previousState === 'disabled') {
+          if (from === 'disabled') {
             el.style.pointerEvents = '';
             el.removeAttribute('aria-disabled');
+            this._mutated(2);
           }
           break;
       }
     }
 
+    /**
+     * Every class any state of this object can set.
+     * @private
+     */
+    _collectClasses(states) {
+      const classes = new Set();
+      for (const [name, sCfg] of Object.entries(states)) {
+        const list = sCfg.classes || (name === 'hover' || name === 'down' ? [`state--${name}`] : []);
+        list.forEach(cls => classes.add(cls));
+      }
+      return Array.from(classes);
+    }
+
+    /** @private Classes of an auto-state (hover/down), with the default fallback. */
+    _autoClasses(obj, name) {
+      return obj.states[name].classes || [`state--${name}`];
+    }
+
+    /** @private */
+    _mutated(count = 1) {
+      this._stats.mutations += count;
+      this._stats.current += count;
+      if (this._stats.interactions) this._stats.interactionMutations += count;
+      if (this._stats.current > this._stats.max) this._stats.max = this._stats.current;
+    }
+
+    /**
+     * Start a new interaction window for the mutation counter. Nested
+     * objects see the same event; it counts once.
+     * @private
+     */
+    _beginInteraction(e) {
+      if (e && e === this._lastEvent) return;
+      this._lastEvent = e || null;
+      this._stats.interactions++;
+      this._stats.current = 0;
+    }
+
     // -------------------------------------------------------------------------
     // Internal: Auto-states (hover, down, visited)
     // -------------------------------------------------------------------------
 
+    /** @private Hover/focus entered (on) or left (off). Leaving also ends down. */
+    _hover(objectId, on) {
+      const obj = this._objects.get(objectId);
+      if (!obj || !obj.states.hover) return;
+      if (on) {
+        if (obj.currentState === 'disabled' || obj.currentState === 'hidden' || obj.hover) return;
+        obj.hover = true;
+      } else {
+        if (!obj.hover && !obj.down) return;
+        obj.hover = false;
+        obj.down = false;
+      }
+      this._invalidate(objectId);
+    }
+
+    /** @private Mouse button pressed (on) or released (off). */
+    _press(objectId, on) {
+      const obj = this._objects.get(objectId);
+      if (!obj || !obj.states.down || obj.down === on) return;
+      if (on && (obj.currentState === 'disabled' || obj.currentState === 'hidden')) return;
+      obj.down = on;
+      this._invalidate(objectId);
+    }
+
+    /** @private First click sets the permanent visited state. */
+    _visit(objectId) {
+      const obj = this._objects.get(objectId);
+      if (!obj) return;
+      if (obj.currentState === 'disabled' || obj.currentState === 'hidden') return;
+      if (!obj.visited) {
+        obj.visited = true;
+        // If a visited state is defined, apply it
+        if (obj.states.visited) {
+          this.setState(objectId, 'visited');
+        }
+      }
+    }
+
     /**
      * Bind automatic state handlers: hover, down (mousedown), visited (click).
      * These fire without explicit triggers, matching Storyline behavior.
@@ -468,23 +698,10 @@
 
       // --- Hover state (auto on mouseenter, revert on mouseleave) ---
       if (obj.states.hover) {
-        const onEnter = () => {
-          if (obj.currentState === 'disabled' || obj.currentState === 'hidden') return;
-          el.classList.add(...(obj.states.hover.classes || ['state--hover']));
-        };
-        const onLeave = () => {
-          el.classList.remove(...(obj.states.hover.classes || ['state--hover']));
-          // Also remove down state on leave
-          if (obj.states.down) {
-            el.classList.remove(...(obj.states.down.classes || ['state--down']));
-          }
-        };
+        const onEnter = () => this._hover(objectId, true);
+        const onLeave = () => this._hover(objectId, false);
 
-        el.addEventListener('mouseenter', onEnter);
-        el.addEventListener('mouseleave', onLeave);
         // Focus events for keyboard users
-        el.addEventListener('focus', onEnter);
-        el.addEventListener('blur', onLeave);
         handlers.push(
           { element: el, event: 'mouseenter', handler: onEnter },
           { element: el, event: 'mouseleave', handler: onLeave },
@@ -495,47 +712,29 @@
 
       // --- Down state (auto on mousedown, revert on mouseup) ---
       if (obj.states.down) {
-        const onDown = () => {
-          if (obj.currentState === 'disabled' || obj.currentState === 'hidden') return;
-          el.classList.add(...(obj.states.down.classes || ['state--down']));
-        };
-        const onUp = () => {
-          el.classList.remove(...(obj.states.down.classes || ['state--down']));
-        };
-
-        el.addEventListener('mousedown', onDown);
-        el.addEventListener('mouseup', onUp);
         handlers.push(
-          { element: el, event: 'mousedown', handler: onDown },
-          { element: el, event: 'mouseup', handler: onUp }
+          { element: el, event: 'mousedown', handler: () => this._press(objectId, true) },
+          { element: el, event: 'mouseup', handler: () => this._press(objectId, false) }
         );
       }
 
       // --- Visited state (permanent on first click) ---
-      const onClick = () => {
-        if (obj.currentState === 'disabled' || obj.currentState === 'hidden') return;
-        if (!obj.visited) {
-          obj.visited = true;
-          // If a visited state is defined, apply it
-          if (obj.states.visited) {
-            this.setState(objectId, 'visited');
-          }
-        }
-      };
-      el.addEventListener('click', onClick);
-      handlers.push({ element: el, event: 'click', handler: onClick });
+      handlers.push({ element: el, event: 'click', handler: (e) => {
+        this._beginInteraction(e);
+        this._visit(objectId);
+      } });
 
       // Also handle keyboard activation (Enter/Space for role="button")
-      const onKeyDown = (e) => {
+      handlers.push({ element: el, event: 'keydown', handler: (e) => {
         if (e.key === 'Enter' || e.key === ' ') {
           e.preventDefault();
-          onClick();
+          this._visit(objectId);
           el.click(); // Propagate to other click handlers
         }
-      };
-      el.addEventListener('keydown', onKeyDown);
-      handlers.push({ element: el, event: 'keydown', handler: onKeyDown });
+      } });
 
+      handlers.forEach(({ event, handler }) => el.addEventListener(event, handler));
+      this._stats.listeners += handlers.length;
       this._boundHandlers.set(objectId, handlers);
     }
 
@@ -549,10 +748,118 @@
         handlers.forEach(({ element, event, handler }) => {
           element.removeEventListener(event, handler);
         });
+        this._stats.listeners -= handlers.length;
         this._boundHandlers.delete(objectId);
       }
     }
 
+    // -------------------------------------------------------------------------
+    // Internal: Delegation
+    // -------------------------------------------------------------------------
+
+    /**
+     * Route an object's auto-states through its container's listener set,
+     * binding that set on the container's first object.
+     * @private
+     */
+    _attachContainer(objectId) {
+      const obj = this._objects.get(objectId);
+      const container = obj.element.closest(this._containerSelector) || document.body;
+      obj.container = container;
+
+      let entry = this._containers.get(container);
+      if (!entry) {
+        entry = { handlers: this._bindContainer(container), objects: 0 };
+        this._containers.set(container, entry);
+      }
+      entry.objects++;
+    }
+
+    /** @private */
+    _detachContainer(objectId) {
+      const obj = this._objects.get(objectId);
+      if (!obj || !obj.container) return;
+      const container = obj.container;
+      const entry = this._containers.get(container);
+      obj.container = null;
+      if (entry && --entry.objects === 0) {
+        this._unbindContainer(container, entry);
+        this._containers.delete(container);
+      }
+    }
+
+    /**
+     * Registered objects (with auto-states in this container) from the
+     * event target up, nearest first. The id index is this._objects.
+     * @private
+     */
+    _resolve(target, container) {
+      const ids = [];
+      for (let node = target; node && node !== container; node = node.parentElement) {
+        if (!node.id) continue;
+        const obj = this._objects.get(node.id);
+        if (obj && obj.element === node && obj.container === container) ids.push(node.id);
+      }
+      return ids;
+    }
+
+    /**
+     * One listener per event type on the container. mouseenter/leave and
+     * focus/blur don't bubble, so their bubbling counterparts are used.
+     * @private
+     */
+    _bindContainer(container) {
+      // Pointer crossed into/out of an object (ignore moves between its children)
+      const crossing = (e, on) => {
+        this._resolve(e.target, container).forEach(objectId => {
+          const el = this._objects.get(objectId).element;
+          if (!e.relatedTarget || !el.contains(e.relatedTarget)) this._hover(objectId, on);
+        });
+      };
+
+      const handlers = [
+        { event: 'mouseover', handler: (e) => crossing(e, true) },
+        { event: 'mouseout', handler: (e) => crossing(e, false) },
+        { event: 'focusin', handler: (e) => {
+          this._resolve(e.target, container).slice(0, 1).forEach(id => this._hover(id, true));
+        } },
+        { event: 'focusout', handler: (e) => {
+          this._resolve(e.target, container).slice(0, 1).forEach(id => this._hover(id, false));
+        } },
+        { event: 'mousedown', handler: (e) => {
+          this._resolve(e.target, container).forEach(id => this._press(id, true));
+        } },
+        { event: 'mouseup', handler: (e) => {
+          this._resolve(e.target, container).forEach(id => this._press(id, false));
+        } },
+        { event: 'click', handler: (e) => {
+          const ids = this._resolve(e.target, container);
+          if (!ids.length) return;
+          this._beginInteraction(e);
+          ids.forEach(id => this._visit(id));
+        } },
+        // Keyboard activation (Enter/Space for role="button") on the focused object
+        { event: 'keydown', handler: (e) => {
+          if (e.key !== 'Enter' && e.key !== ' ') return;
+          const objectId = this._resolve(e.target, container)[0];
+          if (!objectId) return;
+          e.preventDefault();
+          this._visit(objectId);
+          this._objects.get(objectId).element.click(); // Propagate to other click handlers
+        } }
+      ];
+
+      handlers.forEach(({ event, handler }) => container.addEventListener(event, handler));
+      this._stats.listeners += handlers.length;
+      return handlers;
+    }
+
+    /** @private */
+    _unbindContainer(container, entry) {
+      entry.handlers.forEach(({ event, handler }) => container.removeEventListener(event, handler));
+      this._stats.listeners -= entry.handlers.length;
+    }
+
     // -------------------------------------------------------------------------
     // Internal: Button sets
     // -------------------------------------------------------------------------
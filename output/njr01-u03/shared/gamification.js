@@ -42,6 +42,13 @@
     MODULE_COMPLETE: 50
   };
 
+  // SuspendStore namespace for gamification state (small, high priority)
+  var STORE = {
+    NAMESPACE: 'g',
+    PRIORITY: 80,
+    BUDGET: 64
+  };
+
   var FEEDBACK = {
     correct: [
       "Great work! You're building mastery.",
@@ -82,6 +89,30 @@
     ]
   };
 
+  // =========================================================
+  // FRAME SCHEDULING
+  // =========================================================
+
+  // Animations share the page's FrameScheduler (engine/frame-scheduler.js)
+  // when it is loaded, so they stay within its per-frame budget; without
+  // it they fall back to plain requestAnimationFrame / setTimeout.
+
+  function nextFrame(fn) {
+    if (global.FrameScheduler) {
+      global.FrameScheduler.shared.once(fn);
+    } else {
+      requestAnimationFrame(fn);
+    }
+  }
+
+  function later(ms, fn) {
+    if (global.FrameScheduler) {
+      return global.FrameScheduler.shared.after(ms, fn);
+    }
+    var id = setTimeout(fn, ms);
+    return { cancel: function() { clearTimeout(id); } };
+  }
+
   // =========================================================
   // GAMIFICATION ENGINE CLASS
   // =========================================================
@@ -92,6 +123,10 @@
    */
   function GamificationEngine(scormApi) {
     this.scorm = scormApi;
+    this.store = scormApi && global.SuspendStore ? global.SuspendStore.get(scormApi) : null;
+    if (this.store) {
+      this.store.register(STORE.NAMESPACE, { priority: STORE.PRIORITY, budget: STORE.BUDGET });
+    }
     this.state = {
       totalPoints: 0,
       currentStreak: 0,
@@ -271,7 +306,7 @@
 
     // Clear any existing celebration
     if (this.celebrationTimeout) {
-      clearTimeout(this.celebrationTimeout);
+      this.celebrationTimeout.cancel();
     }
 
     var intensity = type === 'module' ? 'large' : (type === 'lesson' ? 'medium' : 'small');
@@ -286,20 +321,20 @@
     container.appendChild(celebration);
 
     // Trigger animation
-    requestAnimationFrame(function() {
+    nextFrame(function() {
       celebration.classList.add('gamification-celebration--active');
     });
 
     // Auto-remove after animation
     var self = this;
-    this.celebrationTimeout = setTimeout(function() {
+    this.celebrationTimeout = later(type === 'module' ? 4000 : 2500, function() {
       celebration.classList.remove('gamification-celebration--active');
-      setTimeout(function() {
+      later(500, function() {
         if (celebration.parentNode) {
           celebration.parentNode.removeChild(celebration);
         }
-      }, 500);
-    }, type === 'module' ? 4000 : 2500);
+      });
+    });
   };
 
   // =========================================================
@@ -426,11 +461,11 @@
     pointsEl.appendChild(floater);
 
     // Remove after animation
-    setTimeout(function() {
+    later(1500, function() {
       if (floater.parentNode) {
         floater.parentNode.removeChild(floater);
       }
-    }, 1500);
+    });
   };
 
   GamificationEngine.prototype._showFeedbackUI = function(message, type) {
@@ -447,19 +482,19 @@
     content.appendChild(feedback);
 
     // Trigger entrance
-    requestAnimationFrame(function() {
+    nextFrame(function() {
       feedback.classList.add('gamification-feedback--visible');
     });
 
     // Auto-remove
-    setTimeout(function() {
+    later(3000, function() {
       feedback.classList.remove('gamification-feedback--visible');
-      setTimeout(function() {
+      later(400, function() {
         if (feedback.parentNode) {
           feedback.parentNode.removeChild(feedback);
         }
-      }, 400);
-    }, 3000);
+      });
+    });
   };
 
   GamificationEngine.prototype._getCelebrationContainer = function() {
@@ -621,30 +656,12 @@
   // =========================================================
 
   GamificationEngine.prototype._saveState = function() {
-    if (!this.scorm) return;
+    if (!this.store) return;
 
-    // We store gamification state as a compact JSON under a known key
-    // This is designed to coexist with BehaviorTracker in suspend_data
+    // Stored as a compact object under the 'g' namespace of the shared
+    // SuspendStore, alongside BehaviorTracker and AchievementSystem data
     try {
-      var existing = '';
-      if (typeof this.scorm.getBookmark === 'function') {
-        existing = this.scorm.getBookmark() || '';
-      } else if (typeof this.scorm.getValue === 'function') {
-        existing = this.scorm.getValue('cmi.suspend_data') || '';
-      }
-
-      // Parse existing data to preserve BehaviorTracker data
-      var allData = {};
-      if (existing && existing.length > 0) {
-        try {
-          allData = JSON.parse(existing);
-        } catch (e) {
-          allData = {};
-        }
-      }
-
-      // Add gamification state under 'g' key
-      allData.g = {
+      this.store.set(STORE.NAMESPACE, {
         tp: this.state.totalPoints,
         cs: this.state.currentStreak,
         ls: this.state.longestStreak,
@@ -653,48 +670,27 @@
         mc: this.state.modulesCompleted,
         ca: this.state.correctAnswers,
         ta: this.state.totalAnswers
-      };
-
-      var jsonString = JSON.stringify(allData);
-
-      if (typeof this.scorm.setBookmark === 'function') {
-        this.scorm.setBookmark(jsonString);
-      } else if (typeof this.scorm.setValue === 'function') {
-        this.scorm.setValue('cmi.suspend_data', jsonString);
-      }
-
-      if (typeof this.scorm.commit === 'function') {
-        this.scorm.commit();
-      }
+      });
+      this.store.save();
     } catch (e) {
       console.warn('GamificationEngine: Failed to save state', e);
     }
   };
 
   GamificationEngine.prototype._restoreState = function() {
-    if (!this.scorm) return;
+    if (!this.store) return;
 
     try {
-      var stored = '';
-      if (typeof this.scorm.getBookmark === 'function') {
-        stored = this.scorm.getBookmark();
-      } else if (typeof this.scorm.getValue === 'function') {
-        stored = this.scorm.getValue('cmi.suspend_data');
-      }
-
-      if (stored && stored.length > 0) {
-        var allData = JSON.parse(stored);
-        if (allData && allData.g) {
-          var g = allData.g;
-          this.state.totalPoints = g.tp || 0;
-          this.state.currentStreak = g.cs || 0;
-          this.state.longestStreak = g.ls || 0;
-          this.state.sectionsCompleted = g.sc || 0;
-          this.state.lessonsCompleted = g.lc || 0;
-          this.state.modulesCompleted = g.mc || 0;
-          this.state.correctAnswers = g.ca || 0;
-          this.state.totalAnswers = g.ta || 0;
-        }
+      var g = this.store.get(STORE.NAMESPACE);
+      if (g) {
+        this.state.totalPoints = g.tp || 0;
+        this.state.currentStreak = g.cs || 0;
+        this.state.longestStreak = g.ls || 0;
+        this.state.sectionsCompleted = g.sc || 0;
+        this.state.lessonsCompleted = g.lc || 0;
+        this.state.modulesCompleted = g.mc || 0;
+        this.state.correctAnswers = g.ca || 0;
+        this.state.totalAnswers = g.ta || 0;
       }
     } catch (e) {
       console.warn('GamificationEngine: Failed to restore state', e);
@@ -2,19 +2,73 @@
  * SCORM API Wrapper
  * Provides unified interface for SCORM 1.2 and SCORM 2004
  * Auto-detects API version and handles all communication with LMS
+ *
+ * Buffered mode (opt-in):
+ *   var scorm = new SCORMWrapper({ buffered: true });
+ *
+ *   - Values read from the LMS are cached; repeat reads never hit the LMS
+ *   - setValue() only marks the element dirty; unchanged writes are skipped
+ *   - commit() is coalesced into a single flush after a short debounce
+ *     (or the next idle period), instead of one LMS round trip per call
+ *   - Pending data is always flushed on pagehide, visibilitychange
+ *     (hidden) and terminate()
+ *   - getStats() reports LMS calls made versus calls avoided
  */
 
 (function(global) {
   'use strict';
 
+  // ============================================
+  // Configuration
+  // ============================================
+
+  var DEFAULTS = {
+    // Cache reads, skip unchanged writes and coalesce commits
+    buffered: false,
+
+    // Quiet period after the last commit() before flushing (ms)
+    commitDelay: 1000,
+
+    // Longest a requested commit may wait for an idle period (ms)
+    idleTimeout: 2000
+  };
+
   /**
    * SCORMWrapper - Universal SCORM API handler
+   * @param {object} [options] - { buffered, commitDelay, idleTimeout }
    */
-  function SCORMWrapper() {
+  function SCORMWrapper(options) {
+    options = options || {};
+
     this.api = null;
     this.version = null;
     this.initialized = false;
     this.terminated = false;
+
+    this.buffered = options.buffered !== undefined ? !!options.buffered : DEFAULTS.buffered;
+    this.commitDelay = options.commitDelay !== undefined ? options.commitDelay : DEFAULTS.commitDelay;
+    this.idleTimeout = options.idleTimeout !== undefined ? options.idleTimeout : DEFAULTS.idleTimeout;
+
+    // Write-behind cache: element -> last known value (string)
+    this._cache = {};
+    // Elements changed since the last flush, in write order
+    this._dirty = {};
+    this._commitRequested = false;
+    // A value reached the LMS after its last commit (unbuffered writes)
+    this._uncommitted = false;
+    this._commitTimer = null;
+    this._idleHandle = null;
+    this._flushListenersBound = false;
+
+    this.stats = {
+      lmsGets: 0,
+      lmsSets: 0,
+      lmsCommits: 0,
+      getsAvoided: 0,
+      setsAvoided: 0,
+      commitsAvoided: 0,
+      flushes: 0
+    };
   }
 
   /**
@@ -86,6 +140,10 @@
 
     this.initialized = (result === 'true' || result === true);
 
+    if (this.initialized && this.buffered) {
+      this._bindFlushListeners();
+    }
+
     if (this.initialized) {
       // Set initial status if not already set
       var status = this.getLessonStatus();
@@ -111,6 +169,17 @@
       return true;
     }
 
+    // Write the shared suspend_data store before the session ends
+    if (this._suspendStore) {
+      this._suspendStore.flush();
+    }
+
+    // Nothing buffered may be lost once the session ends
+    if (this.buffered) {
+      this.flush();
+      this._unbindFlushListeners();
+    }
+
     var result;
     if (this.version === '2004') {
       result = api.Terminate('');
@@ -131,15 +200,26 @@
       return '';
     }
 
-    if (this.version === '2004') {
-      return api.GetValue(element);
-    } else {
-      return api.LMSGetValue(element);
+    if (this.buffered && this._isCacheable(element) &&
+        this._cache.hasOwnProperty(element)) {
+      this.stats.getsAvoided++;
+      return this._cache[element];
+    }
+
+    var value = this._lmsGetValue(element);
+
+    if (this.buffered && this._isCacheable(element) &&
+        String(this.getLastError()) === '0') {
+      this._cache[element] = value;
     }
+
+    return value;
   };
 
   /**
    * Set a value in LMS
+   * In buffered mode the write is deferred until the next flush and
+   * skipped entirely when the value is unchanged.
    */
   SCORMWrapper.prototype.setValue = function(element, value) {
     var api = this.getAPI();
@@ -147,25 +227,180 @@
       return true;
     }
 
-    var result;
-    if (this.version === '2004') {
-      result = api.SetValue(element, value);
-    } else {
-      result = api.LMSSetValue(element, value);
+    if (!this.buffered) {
+      return this._lmsSetValue(element, value);
+    }
+
+    var str = String(value);
+    if (this._cache.hasOwnProperty(element) && this._cache[element] === str) {
+      this.stats.setsAvoided++;
+      return true;
+    }
+
+    // A second write to a pending element replaces the first one
+    if (this._dirty.hasOwnProperty(element)) {
+      this.stats.setsAvoided++;
     }
 
-    return result === 'true' || result === true;
+    this._cache[element] = str;
+    this._dirty[element] = true;
+    return true;
   };
 
   /**
    * Commit data to LMS
+   * In buffered mode this only schedules a coalesced flush.
    */
   SCORMWrapper.prototype.commit = function() {
+    // The session is over; the LMS API must not be called again
+    if (this.terminated) {
+      return true;
+    }
+
     var api = this.getAPI();
     if (!api) {
       return true;
     }
 
+    if (!this.buffered) {
+      return this._lmsCommit();
+    }
+
+    if (this._commitRequested) {
+      this.stats.commitsAvoided++;
+    }
+    this._commitRequested = true;
+    this._scheduleFlush();
+    return true;
+  };
+
+  /**
+   * Write all dirty elements and commit once.
+   * Safe to call at any time; a no-op when nothing is pending or the
+   * session has been terminated. Failed writes stay pending.
+   * @returns {boolean} true if every write and the commit succeeded
+   */
+  SCORMWrapper.prototype.flush = function() {
+    this._cancelScheduledFlush();
+
+    if (this.terminated) {
+      return true;
+    }
+
+    var api = this.getAPI();
+    if (!api || !this.buffered) {
+      return true;
+    }
+
+    var ok = true;
+    var wrote = false;
+
+    // Swap the dirty set first so writes made during the flush are kept
+    var dirty = this._dirty;
+    this._dirty = {};
+
+    for (var element in dirty) {
+      if (!dirty.hasOwnProperty(element)) continue;
+      if (!this._lmsSetValue(element, this._cache[element])) {
+        // Keep it pending so the next flush retries; otherwise the cache
+        // would treat the value as already written
+        this._dirty[element] = true;
+        ok = false;
+      }
+      wrote = true;
+    }
+
+    if (wrote) {
+      if (!this._lmsCommit()) {
+        ok = false;
+      }
+      this.stats.flushes++;
+    } else if (this._commitRequested) {
+      // Nothing changed since the last flush - the round trip is pointless
+      this.stats.commitsAvoided++;
+    }
+
+    this._commitRequested = false;
+    return ok;
+  };
+
+  /**
+   * Whether values set through this wrapper have not been committed yet:
+   * buffered writes or commit requests waiting for a flush, or direct
+   * writes the LMS received after its last commit.
+   * @returns {boolean}
+   */
+  SCORMWrapper.prototype.hasPendingWrites = function() {
+    if (this.terminated) {
+      return false;
+    }
+    for (var element in this._dirty) {
+      if (this._dirty.hasOwnProperty(element)) return true;
+    }
+    return this._commitRequested || this._uncommitted;
+  };
+
+  /**
+   * Report LMS traffic: calls made versus calls avoided by buffering.
+   * @returns {object}
+   */
+  SCORMWrapper.prototype.getStats = function() {
+    var s = this.stats;
+    var made = s.lmsGets + s.lmsSets + s.lmsCommits;
+    var avoided = s.getsAvoided + s.setsAvoided + s.commitsAvoided;
+
+    return {
+      buffered: this.buffered,
+      lmsGets: s.lmsGets,
+      lmsSets: s.lmsSets,
+      lmsCommits: s.lmsCommits,
+      getsAvoided: s.getsAvoided,
+      setsAvoided: s.setsAvoided,
+      commitsAvoided: s.commitsAvoided,
+      flushes: s.flushes,
+      callsMade: made,
+      callsAvoided: avoided,
+      pending: Object.keys(this._dirty).length
+    };
+  };
+
+  // ============================================
+  // Raw LMS Calls (counted)
+  // ============================================
+
+  SCORMWrapper.prototype._lmsGetValue = function(element) {
+    var api = this.getAPI();
+    this.stats.lmsGets++;
+
+    if (this.version === '2004') {
+      return api.GetValue(element);
+    } else {
+      return api.LMSGetValue(element);
+    }
+  };
+
+  SCORMWrapper.prototype._lmsSetValue = function(element, value) {
+    var api = this.getAPI();
+    this.stats.lmsSets++;
+
+    var result;
+    if (this.version === '2004') {
+      result = api.SetValue(element, value);
+    } else {
+      result = api.LMSSetValue(element, value);
+    }
+
+    if (result === 'true' || result === true) {
+      this._uncommitted = true;
+      return true;
+    }
+    return false;
+  };
+
+  SCORMWrapper.prototype._lmsCommit = function() {
+    var api = this.getAPI();
+    this.stats.lmsCommits++;
+
     var result;
     if (this.version === '2004') {
       result = api.Commit('');
@@ -173,7 +408,90 @@
       result = api.LMSCommit('');
     }
 
-    return result === 'true' || result === true;
+    if (result === 'true' || result === true) {
+      this._uncommitted = false;
+      return true;
+    }
+    return false;
+  };
+
+  // ============================================
+  // Buffered Mode Internals
+  // ============================================
+
+  /**
+   * Counters such as cmi.interactions._count change as a side effect of
+   * other writes, so they must always be read from the LMS.
+   */
+  SCORMWrapper.prototype._isCacheable = function(element) {
+    return !/\._count$/.test(element);
+  };
+
+  /**
+   * Debounce commit requests, then wait for an idle period (bounded by
+   * idleTimeout) so the synchronous LMS round trip doesn't block input.
+   */
+  SCORMWrapper.prototype._scheduleFlush = function() {
+    var self = this;
+
+    if (this._commitTimer) {
+      clearTimeout(this._commitTimer);
+    }
+
+    this._commitTimer = setTimeout(function() {
+      self._commitTimer = null;
+
+      if (typeof window.requestIdleCallback === 'function') {
+        if (self._idleHandle === null) {
+          self._idleHandle = window.requestIdleCallback(function() {
+            self._idleHandle = null;
+            self.flush();
+          }, { timeout: self.idleTimeout });
+        }
+      } else {
+        self.flush();
+      }
+    }, this.commitDelay);
+  };
+
+  SCORMWrapper.prototype._cancelScheduledFlush = function() {
+    if (this._commitTimer) {
+      clearTimeout(this._commitTimer);
+      this._commitTimer = null;
+    }
+    if (this._idleHandle !== null && typeof window.cancelIdleCallback === 'function') {
+      window.cancelIdleCallback(this._idleHandle);
+    }
+    this._idleHandle = null;
+  };
+
+  /**
+   * Flush whenever the page may be going away. pagehide also fires for
+   * bfcache navigations where beforeunload does not.
+   */
+  SCORMWrapper.prototype._bindFlushListeners = function() {
+    if (this._flushListenersBound) return;
+    var self = this;
+
+    this._onPageHide = function() {
+      self.flush();
+    };
+    this._onVisibilityChange = function() {
+      if (document.visibilityState === 'hidden') {
+        self.flush();
+      }
+    };
+
+    window.addEventListener('pagehide', this._onPageHide);
+    document.addEventListener('visibilitychange', this._onVisibilityChange);
+    this._flushListenersBound = true;
+  };
+
+  SCORMWrapper.prototype._unbindFlushListeners = function() {
+    if (!this._flushListenersBound) return;
+    window.removeEventListener('pagehide', this._onPageHide);
+    document.removeEventListener('visibilitychange', this._onVisibilityChange);
+    this._flushListenersBound = false;
   };
 
   /**
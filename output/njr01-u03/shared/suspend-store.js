@@ -0,0 +1,766 @@
+/**
+ * SuspendStore - Shared, namespaced cmi.suspend_data storage
+ *
+ * cmi.suspend_data is a single string per SCO (4096 chars in SCORM 1.2).
+ * Instead of every engine reading, parsing and rewriting the whole value,
+ * each engine registers a namespace and the store serializes everything
+ * once per flush.
+ *
+ * Features:
+ * - One namespace per engine, each with a priority and a byte budget
+ * - Compact binary codec (zigzag varints, length-prefixed UTF-8 strings)
+ *   wrapped in URL-safe base64 with no padding ("~" prefix)
+ * - Sections over budget are shrunk via the engine's reduce() hook;
+ *   when the total still exceeds the limit, lowest-priority sections
+ *   are left out first
+ * - Unchanged sections are not re-encoded
+ * - Several save() calls in the same tick are merged into one flush
+ * - Reads legacy JSON suspend_data and plain slide-index bookmarks
+ * - A store created before the SCORM wrapper exists adopts it later,
+ *   merging what was set early with what the LMS had (onBind() notifies)
+ *
+ * Usage:
+ *   var store = SuspendStore.get(scormWrapper);
+ *   store.register('nav', { priority: 100, budget: 8 });
+ *   var index = store.get('nav');
+ *   store.set('nav', 3);
+ *   store.save();          // coalesced flush
+ *   store.flush();         // write now (e.g. on unload)
+ */
+
+(function(global) {
+  'use strict';
+
+  // =========================================================
+  // CONFIGURATION
+  // =========================================================
+
+  var CONFIG = {
+    // Maximum size for cmi.suspend_data (SCORM 1.2 = 4096)
+    MAX_SUSPEND_DATA: 4096,
+
+    // Prefix marking data written by this store
+    PREFIX: '~',
+
+    // Binary frame version
+    FORMAT_VERSION: 1,
+
+    // Default budget for namespaces that don't declare one (bytes)
+    DEFAULT_BUDGET: 512,
+
+    // How many times reduce() may be asked to shrink a section
+    MAX_REDUCE_PASSES: 6
+  };
+
+  // Legacy JSON keys -> namespaces they migrate into
+  var LEGACY_KEYS = {
+    g: 'g',
+    achievements: 'ach'
+  };
+
+  // Value tags for the binary codec
+  var TAG = {
+    NULL: 0,
+    FALSE: 1,
+    TRUE: 2,
+    INT: 3,
+    FLOAT: 4,
+    STRING: 5,
+    ARRAY: 6,
+    OBJECT: 7
+  };
+
+  // =========================================================
+  // CODEC
+  // =========================================================
+
+  /**
+   * Append an unsigned varint (7 bits per byte, little-endian).
+   * Uses division instead of bit operators so values above 2^31
+   * (e.g. timestamps in seconds * 1000) survive.
+   */
+  function writeVarint(out, n) {
+    while (n >= 0x80) {
+      out.push((n % 0x80) | 0x80);
+      n = Math.floor(n / 0x80);
+    }
+    out.push(n);
+  }
+
+  function readVarint(reader) {
+    var result = 0;
+    var scale = 1;
+    var b;
+    do {
+      if (reader.pos >= reader.bytes.length) {
+        throw new Error('SuspendStore: truncated varint');
+      }
+      b = reader.bytes[reader.pos++];
+      result += (b & 0x7f) * scale;
+      scale *= 0x80;
+    } while (b & 0x80);
+    return result;
+  }
+
+  function writeString(out, str) {
+    var utf8 = unescape(encodeURIComponent(str));
+    writeVarint(out, utf8.length);
+    for (var i = 0; i < utf8.length; i++) {
+      out.push(utf8.charCodeAt(i));
+    }
+  }
+
+  function readString(reader) {
+    var len = readVarint(reader);
+    var end = reader.pos + len;
+    if (end > reader.bytes.length) {
+      throw new Error('SuspendStore: truncated string');
+    }
+    var chars = '';
+    for (var i = reader.pos; i < end; i++) {
+      chars += String.fromCharCode(reader.bytes[i]);
+    }
+    reader.pos = end;
+    return decodeURIComponent(escape(chars));
+  }
+
+  function isSafeInt(n) {
+    return Math.floor(n) === n && Math.abs(n) <= 9007199254740991;
+  }
+
+  /**
+   * Encode a JSON-compatible value into an array of bytes.
+   */
+  function encodeValue(out, value) {
+    if (value === null || value === undefined) {
+      out.push(TAG.NULL);
+    } else if (value === false) {
+      out.push(TAG.FALSE);
+    } else if (value === true) {
+      out.push(TAG.TRUE);
+    } else if (typeof value === 'number') {
+      if (isSafeInt(value)) {
+        out.push(TAG.INT);
+        // Zigzag: 0, -1, 1, -2 ... -> 0, 1, 2, 3 ...
+        writeVarint(out, value < 0 ? -value * 2 - 1 : value * 2);
+      } else {
+        out.push(TAG.FLOAT);
+        writeString(out, String(value));
+      }
+    } else if (typeof value === 'string') {
+      out.push(TAG.STRING);
+      writeString(out, value);
+    } else if (Array.isArray(value)) {
+      out.push(TAG.ARRAY);
+      writeVarint(out, value.length);
+      for (var i = 0; i < value.length; i++) {
+        encodeValue(out, value[i]);
+      }
+    } else if (typeof value === 'object') {
+      var keys = [];
+      for (var key in value) {
+        if (value.hasOwnProperty(key) && value[key] !== undefined) {
+          keys.push(key);
+        }
+      }
+      out.push(TAG.OBJECT);
+      writeVarint(out, keys.length);
+      for (var k = 0; k < keys.length; k++) {
+        writeString(out, keys[k]);
+        encodeValue(out, value[keys[k]]);
+      }
+    } else {
+      out.push(TAG.NULL);
+    }
+    return out;
+  }
+
+  function decodeValue(reader) {
+    var tag = reader.bytes[reader.pos++];
+    var n, i, result;
+
+    switch (tag) {
+      case TAG.NULL:
+        return null;
+      case TAG.FALSE:
+        return false;
+      case TAG.TRUE:
+        return true;
+      case TAG.INT:
+        n = readVarint(reader);
+        return n % 2 === 0 ? n / 2 : -(n + 1) / 2;
+      case TAG.FLOAT:
+        return parseFloat(readString(reader));
+      case TAG.STRING:
+        return readString(reader);
+      case TAG.ARRAY:
+        n = readVarint(reader);
+        result = [];
+        for (i = 0; i < n; i++) {
+          result.push(decodeValue(reader));
+        }
+        return result;
+      case TAG.OBJECT:
+        n = readVarint(reader);
+        result = {};
+        for (i = 0; i < n; i++) {
+          var key = readString(reader);
+          result[key] = decodeValue(reader);
+        }
+        return result;
+      default:
+        throw new Error('SuspendStore: unknown tag ' + tag);
+    }
+  }
+
+  /**
+   * Bytes -> URL-safe base64 without padding.
+   * "+", "/" and "=" are rewritten because some LMSs escape or strip them.
+   */
+  function toBase64(bytes) {
+    var binary = '';
+    for (var i = 0; i < bytes.length; i++) {
+      binary += String.fromCharCode(bytes[i]);
+    }
+    return btoa(binary)
+      .replace(/\+/g, '-')
+      .replace(/\//g, '_')
+      .replace(/=+$/, '');
+  }
+
+  function fromBase64(str) {
+    var b64 = str.replace(/-/g, '+').replace(/_/g, '/');
+    while (b64.length % 4) {
+      b64 += '=';
+    }
+    var binary = atob(b64);
+    var bytes = [];
+    for (var i = 0; i < binary.length; i++) {
+      bytes.push(binary.charCodeAt(i));
+    }
+    return bytes;
+  }
+
+  /** Characters needed to hold a given number of bytes in base64. */
+  function base64Length(byteCount) {
+    return Math.ceil(byteCount * 4 / 3);
+  }
+
+  /**
+   * Encode a map of namespace -> payload bytes into the stored string.
+   * Frame: [version][sectionCount] then per section [ns][len][payload].
+   */
+  function encodeFrame(sections) {
+    var out = [];
+    writeVarint(out, CONFIG.FORMAT_VERSION);
+    writeVarint(out, sections.length);
+    for (var i = 0; i < sections.length; i++) {
+      writeString(out, sections[i].ns);
+      writeVarint(out, sections[i].bytes.length);
+      for (var j = 0; j < sections[i].bytes.length; j++) {
+        out.push(sections[i].bytes[j]);
+      }
+    }
+    return CONFIG.PREFIX + toBase64(out);
+  }
+
+  /**
+   * Decode a stored string into a map of namespace -> value.
+   */
+  function decodeFrame(str) {
+    var reader = { bytes: fromBase64(str.substr(CONFIG.PREFIX.length)), pos: 0 };
+    var version = readVarint(reader);
+    if (version !== CONFIG.FORMAT_VERSION) {
+      throw new Error('SuspendStore: unsupported format ' + version);
+    }
+
+    var values = {};
+    var count = readVarint(reader);
+    for (var i = 0; i < count; i++) {
+      var ns = readString(reader);
+      var len = readVarint(reader);
+      var end = reader.pos + len;
+      values[ns] = decodeValue(reader);
+      reader.pos = end;
+    }
+    return values;
+  }
+
+  /**
+   * Interpret suspend_data written before this store existed:
+   * a JSON object shared by BehaviorTracker ("v" schema at the root),
+   * GamificationEngine ("g") and AchievementSystem ("achievements"),
+   * or a plain slide index from SCO bookmarks.
+   */
+  function decodeLegacy(str) {
+    var values = {};
+
+    if (/^\d+$/.test(str)) {
+      values.nav = parseInt(str, 10);
+      return values;
+    }
+
+    var parsed = JSON.parse(str);
+    if (!parsed || typeof parsed !== 'object') return values;
+
+    var rest = {};
+    var hasRest = false;
+    for (var key in parsed) {
+      if (!parsed.hasOwnProperty(key)) continue;
+      if (LEGACY_KEYS.hasOwnProperty(key)) {
+        values[LEGACY_KEYS[key]] = parsed[key];
+      } else {
+        rest[key] = parsed[key];
+        hasRest = true;
+      }
+    }
+    if (hasRest && rest.v !== undefined) {
+      values.bt = rest;
+    }
+    return values;
+  }
+
+  // =========================================================
+  // SUSPEND STORE CLASS
+  // =========================================================
+
+  /**
+   * @constructor
+   * @param {object} scormApi - Reference to the SCORM API wrapper
+   * @param {object} [options] - { maxLength }
+   */
+  function SuspendStore(scormApi, options) {
+    options = options || {};
+
+    this.scorm = scormApi || null;
+    this.maxLength = options.maxLength || CONFIG.MAX_SUSPEND_DATA;
+    this.namespaces = {};
+    this.values = {};
+    this.loaded = false;
+    this.lastWritten = null;
+    this.lastDropped = [];
+    this._saveTimer = null;
+    this._bindListeners = [];
+
+    // namespace -> { value, bytes } for sections that haven't changed
+    this._encoded = {};
+
+    this._bindFlushListeners();
+  }
+
+  /**
+   * Return the store shared by everything using the same SCORM wrapper.
+   * Called without a wrapper, returns the default store: the one bound to
+   * the first wrapper seen, or an unbound one that the first wrapper
+   * passed in later adopts. Engines without a wrapper reference therefore
+   * share the SCO's suspend_data instead of opening a second session.
+   * @param {object} [scormApi]
+   * @returns {SuspendStore}
+   */
+  SuspendStore.get = function(scormApi) {
+    var store = SuspendStore._default;
+
+    if (!scormApi) {
+      if (!store) {
+        store = SuspendStore._default = new SuspendStore(null);
+      }
+      return store;
+    }
+
+    if (scormApi._suspendStore) {
+      return scormApi._suspendStore;
+    }
+
+    if (store && !store.scorm) {
+      store._bind(scormApi);
+    } else {
+      store = new SuspendStore(scormApi);
+      if (!SuspendStore._default) {
+        SuspendStore._default = store;
+      }
+    }
+    scormApi._suspendStore = store;
+    return store;
+  };
+
+  SuspendStore._default = null;
+
+  // =========================================================
+  // NAMESPACES
+  // =========================================================
+
+  /**
+   * Register a namespace.
+   * @param {string} ns - Short namespace key (stored verbatim in every save)
+   * @param {object} options
+   *   - priority {number} Higher survives longer when space runs out
+   *   - budget {number} Maximum encoded payload size in bytes
+   *   - reduce {function(value, size, budget)} Returns a smaller value
+   *   - merge {function(stored, value)} Combines the LMS value with one
+   *     set before the store was bound (default: the value set wins)
+   */
+  SuspendStore.prototype.register = function(ns, options) {
+    options = options || {};
+    this.namespaces[ns] = {
+      priority: options.priority || 0,
+      budget: options.budget || CONFIG.DEFAULT_BUDGET,
+      reduce: typeof options.reduce === 'function' ? options.reduce : null,
+      merge: typeof options.merge === 'function' ? options.merge : null
+    };
+    return this;
+  };
+
+  /**
+   * Call fn(store) once this store is attached to a SCORM wrapper.
+   * Engines that read before then saw an empty store and use this to
+   * pick up what the LMS had. Stores that are already bound never call it.
+   * @param {function(SuspendStore)} fn
+   */
+  SuspendStore.prototype.onBind = function(fn) {
+    if (!this.scorm) {
+      this._bindListeners.push(fn);
+    }
+    return this;
+  };
+
+  /**
+   * Get the value stored under a namespace.
+   * @param {string} ns
+   * @returns {*} The value, or null if nothing was stored
+   */
+  SuspendStore.prototype.get = function(ns) {
+    this.load();
+    return this.values.hasOwnProperty(ns) ? this.values[ns] : null;
+  };
+
+  /**
+   * Replace the value stored under a namespace (in memory).
+   * Call save() or flush() to persist.
+   * @param {string} ns
+   * @param {*} value - Any JSON-compatible value
+   */
+  SuspendStore.prototype.set = function(ns, value) {
+    this.load();
+    this.values[ns] = value;
+    delete this._encoded[ns];
+  };
+
+  // =========================================================
+  // PERSISTENCE
+  // =========================================================
+
+  /**
+   * Read cmi.suspend_data once and split it into namespaces.
+   */
+  SuspendStore.prototype.load = function() {
+    if (this.loaded) return;
+    this.loaded = true;
+
+    if (!this.scorm) return;
+
+    var stored = '';
+    try {
+      if (typeof this.scorm.getBookmark === 'function') {
+        stored = this.scorm.getBookmark() || '';
+      } else if (typeof this.scorm.getValue === 'function') {
+        stored = this.scorm.getValue('cmi.suspend_data') || '';
+      }
+    } catch (e) {
+      console.warn('SuspendStore: Failed to read suspend_data', e);
+      return;
+    }
+
+    if (!stored || typeof stored !== 'string') return;
+
+    try {
+      if (stored.charAt(0) === CONFIG.PREFIX) {
+        this.values = decodeFrame(stored);
+      } else {
+        this.values = decodeLegacy(stored);
+      }
+      this.lastWritten = stored;
+    } catch (e) {
+      console.warn('SuspendStore: Failed to decode suspend_data', e);
+      this.values = {};
+    }
+  };
+
+  /**
+   * Attach a store created without a wrapper to the SCORM wrapper that
+   * arrived later. Namespaces set in the meantime keep their value, or
+   * are combined with the stored one by their merge() hook; the rest
+   * come from the LMS. Early values are then saved and onBind()
+   * listeners run.
+   * @private
+   */
+  SuspendStore.prototype._bind = function(scormApi) {
+    var pending = this.values;
+    var hasPending = false;
+    this.scorm = scormApi;
+    this.values = {};
+    this.loaded = false;
+    this.lastWritten = null;
+    this._encoded = {};
+    this.load();
+
+    for (var ns in pending) {
+      if (!pending.hasOwnProperty(ns)) continue;
+      var merge = this._optionsFor(ns).merge;
+      if (merge && this.values.hasOwnProperty(ns) && this.values[ns] !== null) {
+        this.values[ns] = merge(this.values[ns], pending[ns]);
+      } else {
+        this.values[ns] = pending[ns];
+      }
+      hasPending = true;
+    }
+    if (hasPending) {
+      this.save();
+    }
+
+    var listeners = this._bindListeners;
+    this._bindListeners = [];
+    for (var i = 0; i < listeners.length; i++) {
+      try {
+        listeners[i](this);
+      } catch (e) {
+        console.warn('SuspendStore: onBind listener failed', e);
+      }
+    }
+  };
+
+  /**
+   * Request a save. Calls made in the same tick share one flush.
+   */
+  SuspendStore.prototype.save = function() {
+    if (this._saveTimer) return true;
+
+    var self = this;
+    this._saveTimer = setTimeout(function() {
+      self._saveTimer = null;
+      self._write(false);
+    }, 0);
+    return true;
+  };
+
+  /**
+   * Serialize all namespaces, write cmi.suspend_data if it changed and
+   * commit. The commit is unconditional so other values set just before
+   * (session time, status) go out with it; callers need no commit of
+   * their own.
+   * @returns {boolean} true if the data was written
+   */
+  SuspendStore.prototype.flush = function() {
+    return this._write(true);
+  };
+
+  /**
+   * Write cmi.suspend_data if it changed, then commit when it did, when
+   * always is set, or when the wrapper still holds uncommitted writes
+   * (interactions, score). Background saves pass false so an unchanged
+   * store with nothing else pending costs no LMS round trip.
+   * @private
+   */
+  SuspendStore.prototype._write = function(always) {
+    if (this._saveTimer) {
+      clearTimeout(this._saveTimer);
+      this._saveTimer = null;
+    }
+
+    this.load();
+    if (!this.scorm) return false;
+
+    var data = this.serialize();
+    var changed = data !== this.lastWritten;
+    if (!changed && !always && !this._scormPending()) return true;
+
+    try {
+      if (changed) {
+        if (typeof this.scorm.setBookmark === 'function') {
+          this.scorm.setBookmark(data);
+        } else if (typeof this.scorm.setValue === 'function') {
+          this.scorm.setValue('cmi.suspend_data', data);
+        }
+      }
+
+      if (typeof this.scorm.commit === 'function') {
+        this.scorm.commit();
+      }
+
+      this.lastWritten = data;
+      return true;
+    } catch (e) {
+      console.warn('SuspendStore: Failed to save to SCORM', e);
+      return false;
+    }
+  };
+
+  /**
+   * Encode every namespace into a single suspend_data string that fits
+   * within maxLength.
+   * @returns {string}
+   */
+  SuspendStore.prototype.serialize = function() {
+    var sections = [];
+    var ns;
+
+    for (ns in this.values) {
+      if (!this.values.hasOwnProperty(ns)) continue;
+      if (this.values[ns] === null || this.values[ns] === undefined) continue;
+      sections.push({
+        ns: ns,
+        bytes: this._encodeSection(ns),
+        priority: this._optionsFor(ns).priority
+      });
+    }
+
+    // Highest priority first; stable for equal priorities
+    sections.sort(function(a, b) { return b.priority - a.priority; });
+
+    // Frame overhead: prefix, version, count varints
+    var used = 4;
+    var limit = Math.floor((this.maxLength - CONFIG.PREFIX.length) * 3 / 4);
+    var kept = [];
+    this.lastDropped = [];
+
+    for (var i = 0; i < sections.length; i++) {
+      var cost = sections[i].ns.length + 4 + sections[i].bytes.length;
+      if (used + cost <= limit) {
+        kept.push(sections[i]);
+        used += cost;
+      } else {
+        this.lastDropped.push(sections[i].ns);
+      }
+    }
+
+    if (this.lastDropped.length > 0) {
+      console.warn('SuspendStore: Out of space, dropped ' + this.lastDropped.join(', '));
+    }
+
+    var data = encodeFrame(kept);
+
+    // Guard against the estimate being off by a few characters
+    while (data.length > this.maxLength && kept.length > 0) {
+      this.lastDropped.push(kept.pop().ns);
+      data = encodeFrame(kept);
+    }
+
+    return data;
+  };
+
+  /**
+   * Report the encoded size of each namespace (bytes) and the total
+   * suspend_data length (characters).
+   * @returns {object}
+   */
+  SuspendStore.prototype.getUsage = function() {
+    this.load();
+    var usage = { namespaces: {}, length: this.serialize().length, limit: this.maxLength };
+    for (var ns in this.values) {
+      if (!this.values.hasOwnProperty(ns)) continue;
+      usage.namespaces[ns] = {
+        bytes: this._encodeSection(ns).length,
+        budget: this._optionsFor(ns).budget,
+        chars: base64Length(this._encodeSection(ns).length)
+      };
+    }
+    usage.dropped = this.lastDropped.slice();
+    return usage;
+  };
+
+  // =========================================================
+  // INTERNALS
+  // =========================================================
+
+  SuspendStore.prototype._scormPending = function() {
+    return typeof this.scorm.hasPendingWrites === 'function' &&
+      this.scorm.hasPendingWrites();
+  };
+
+  SuspendStore.prototype._optionsFor = function(ns) {
+    return this.namespaces[ns] || {
+      priority: 0,
+      budget: CONFIG.DEFAULT_BUDGET,
+      reduce: null
+    };
+  };
+
+  /**
+   * Encode one namespace, shrinking it to its budget when the engine
+   * provides a reduce() hook. Results are cached until set() is called.
+   */
+  SuspendStore.prototype._encodeSection = function(ns) {
+    var cached = this._encoded[ns];
+    if (cached && cached.value === this.values[ns]) {
+      return cached.bytes;
+    }
+
+    var options = this._optionsFor(ns);
+    var value = this.values[ns];
+    var bytes = encodeValue([], value);
+
+    // reduce hooks may trim in place; work on a copy so the live value
+    // keeps its full data for the next encode
+    if (bytes.length > options.budget && options.reduce) {
+      value = JSON.parse(JSON.stringify(value));
+    }
+
+    var passes = 0;
+    while (bytes.length > options.budget && options.reduce &&
+           passes < CONFIG.MAX_REDUCE_PASSES) {
+      value = options.reduce(value, bytes.length, options.budget);
+      bytes = encodeValue([], value);
+      passes++;
+    }
+
+    this._encoded[ns] = { value: this.values[ns], bytes: bytes };
+    return bytes;
+  };
+
+  /**
+   * Flush pending data whenever the page may be going away, then make
+   * sure a buffered SCORMWrapper pushes it to the LMS too.
+   */
+  SuspendStore.prototype._bindFlushListeners = function() {
+    if (typeof window === 'undefined' || !window.addEventListener) return;
+    var self = this;
+
+    this._onPageHide = function() {
+      self._write(false);
+      if (self.scorm && typeof self.scorm.flush === 'function') {
+        self.scorm.flush();
+      }
+    };
+
+    window.addEventListener('pagehide', this._onPageHide);
+    document.addEventListener('visibilitychange', function() {
+      if (document.visibilityState === 'hidden') {
+        self._onPageHide();
+      }
+    });
+  };
+
+  // Codec is exposed for offline tools and tests
+  SuspendStore.codec = {
+    encode: function(value) { return toBase64(encodeValue([], value)); },
+    size: function(value) { return encodeValue([], value).length; },
+    decode: function(str) { return decodeValue({ bytes: fromBase64(str), pos: 0 }); },
+    encodeFrame: function(values) {
+      var sections = [];
+      for (var ns in values) {
+        if (values.hasOwnProperty(ns)) {
+          sections.push({ ns: ns, bytes: encodeValue([], values[ns]) });
+        }
+      }
+      return encodeFrame(sections);
+    },
+    decodeFrame: decodeFrame,
+    decodeLegacy: decodeLegacy
+  };
+
+  // =========================================================
+  // EXPORT
+  // =========================================================
+
+  global.SuspendStore = SuspendStore;
+
+})(typeof window !== 'undefined' ? window : this);
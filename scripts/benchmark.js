@@ -0,0 +1,1111 @@
+#!/usr/bin/env node
+/**
+ * SCO Benchmark — headless performance harness for a generated course
+ * ====================================================================
+ * Loads every sco_* /index.html of a course offline (scripts/benchmark/
+ * dom.js), with a stand-in LMS as window.API (scripts/benchmark/lms.js),
+ * replays scripted learner sessions (scripts/benchmark/sessions.js) and
+ * reports, per SCO and session:
+ *
+ *   - LMS traffic   — LMSGetValue/SetValue/Commit counts, bytes written,
+ *                     simulated time blocked on the LMS, suspend_data size
+ *   - Main thread   — time to interactive, total time, time per engine
+ *                     (SCORMWrapper, SuspendStore, BehaviorTracker, ...)
+ *                     and per hot method (SlideController.next, ...)
+ *   - DOM           — mutations and forced layout reads
+ *   - StateManager  — listeners and mutations per click (states-* sessions)
+ *
+ * Results are compared with a saved baseline. Counts (LMS calls, bytes,
+ * mutations, layout reads, errors) are deterministic: any increase is a
+ * regression and the process exits with status 1. Timings are scaled by a
+ * CPU calibration run stored with the baseline, and timings more than
+ * --tolerance (default 50%, and over 1 ms) slower are reported. Scheduler
+ * jitter on a shared machine moves ms-scale timings by that much between
+ * identical runs, so they only fail the run with --fail-on-timing; slow
+ * sessions are then run again (with a fresh calibration) and the faster
+ * of both passes is kept.
+ *
+ * The generated content.js files don't create a BehaviorTracker or
+ * GamificationEngine, so by default the harness attaches both the way a
+ * SCO would (page views on navigation, quiz answers on option/check
+ * clicks). Pass --no-integration to measure the pages exactly as shipped.
+ *
+ * Usage:
+ *   node scripts/benchmark.js output/njr01-u03
+ *       [--session linear] [--sco sco_05] [--runs 3]
+ *       [--latency commit=120,set=2] [--no-integration]
+ *       [--baseline scripts/benchmark/baseline.json] [--update-baseline]
+ *       [--tolerance 0.5] [--fail-on-timing]
+ *       [--json results.json] [--verbose]
+ *
+ * Timings are real main-thread time on this machine (best of --runs,
+ * after a warm-up run);
+ * everything else is deterministic (virtual clock, seeded Math.random).
+ */
+
+'use strict';
+
+var fs = require('fs');
+var path = require('path');
+var vm = require('vm');
+var url = require('url');
+
+var dom = require('./benchmark/dom');
+var MockLMS = require('./benchmark/lms').MockLMS;
+var SESSIONS = require('./benchmark/sessions');
+
+// =========================================================
+// CONFIGURATION
+// =========================================================
+
+var CONFIG = {
+  // Globals whose prototype methods are timed as separate engines
+  ENGINES: ['SCORMWrapper', 'SuspendStore', 'BehaviorTracker', 'GamificationEngine',
+    'SlideController', 'FrameScheduler', 'Confetti', 'AchievementSystem', 'SoundEffects',
+    'StateManager', 'QuizEngine', 'InteractivityEngine'],
+
+  // Methods always listed in the report
+  HOT_METHODS: ['SlideController.next', 'BehaviorTracker.save', 'SuspendStore.flush',
+    'SCORMWrapper.commit'],
+
+  // The page is interactive after this much virtual time without a task
+  TTI_QUIET_MS: 50,
+  TTI_MAX_MS: 5000,
+
+  // Virtual time between a learner's clicks
+  CLICK_GAP_MS: 400,
+
+  // Scroll events per animation frame while scrolling
+  SCROLL_EVENTS_PER_FRAME: 3,
+
+  // States given to each object of a { states } step's button set
+  STATE_DEFS: {
+    hover: { classes: ['state--hover'] },
+    down: { classes: ['state--down'] },
+    selected: { classes: ['state--selected', 'is-on'] },
+    visited: { classes: ['state--visited'] },
+    disabled: { classes: ['state--disabled'] }
+  },
+
+  // Timing regressions: slower by more than this fraction AND this many ms
+  // (ms-scale timings under Node jitter by a third between runs)
+  TIME_TOLERANCE: 0.5,
+  TIME_FLOOR_MS: 1,
+
+  // Extra passes over sessions with slow timings before they count
+  TIME_RECHECKS: 1,
+
+  DEFAULT_RUNS: 5,
+  DEFAULT_BASELINE: path.join(__dirname, 'benchmark', 'baseline.json')
+};
+
+// =========================================================
+// PROFILER
+// =========================================================
+
+function hrnow() {
+  return Number(process.hrtime.bigint()) / 1e6;
+}
+
+/**
+ * Exclusive (self) main-thread time per engine. Each task the page runs is
+ * a top-level 'page' frame; instrumented engine methods nest inside it.
+ */
+function Profiler() {
+  this.stack = [];
+  this.engines = {};
+  this.methods = {};
+  this.busy = 0;
+  this.tasks = 0;
+}
+
+Profiler.prototype.measure = function(engine, method, fn, self, args) {
+  var frame = { child: 0 };
+  this.stack.push(frame);
+  var start = hrnow();
+  try {
+    return fn.apply(self, args);
+  } finally {
+    var elapsed = hrnow() - start;
+    this.stack.pop();
+
+    var parent = this.stack[this.stack.length - 1];
+    if (parent) {
+      parent.child += elapsed;
+    } else {
+      this.busy += elapsed;
+      this.tasks++;
+    }
+
+    this.engines[engine] = (this.engines[engine] || 0) + elapsed - frame.child;
+
+    if (method) {
+      var key = engine + '.' + method;
+      var m = this.methods[key] || (this.methods[key] = { calls: 0, total: 0, max: 0 });
+      m.calls++;
+      m.total += elapsed;
+      if (elapsed > m.max) m.max = elapsed;
+    }
+  }
+};
+
+/** Run a top-level task; exceptions are reported, not thrown. */
+Profiler.prototype.task = function(fn, onError) {
+  try {
+    this.measure('page', null, fn, null, []);
+  } catch (e) {
+    if (onError) onError(e);
+    else throw e;
+  }
+};
+
+// =========================================================
+// PAGE
+// =========================================================
+
+/**
+ * One launch of a SCO page.
+ * @param {string} scoDir
+ * @param {MockLMS} lms
+ * @param {object} options - { integration, verbose, seed }
+ */
+function Page(scoDir, lms, options) {
+  var self = this;
+  this.scoDir = scoDir;
+  this.lms = lms;
+  this.options = options;
+  this.profiler = new Profiler();
+  this.scorm = null;
+  this.tracker = null;
+  this.gamification = null;
+  this.closed = false;
+  this.states = null;
+  this.stateStats = null;
+  this._instrumented = {};
+  this._quiz = null;
+
+  this.loop = new dom.EventLoop({
+    runTask: function(label, fn) { self._task(fn); }
+  });
+
+  var indexPath = path.join(scoDir, 'index.html');
+  var p = dom.createWindow({
+    html: fs.readFileSync(indexPath, 'utf8'),
+    url: url.pathToFileURL(indexPath).href,
+    loop: this.loop,
+    seed: options.seed,
+    console: this._console(),
+    onError: function(e) { self._error(e); }
+  });
+
+  this.window = p.window;
+  this.document = p.document;
+  this.context = p.context;
+  this.stats = p.stats;
+  this.window.API = lms.api;
+}
+
+Page.prototype._console = function() {
+  var name = path.basename(this.scoDir);
+  var verbose = this.options.verbose;
+  function quiet() {}
+  function print(kind) {
+    return verbose ? function() {
+      console.log('    [' + name + ' ' + kind + ']', Array.prototype.join.call(arguments, ' '));
+    } : quiet;
+  }
+  return { log: print('log'), info: quiet, debug: quiet, warn: print('warn'), error: print('error'),
+    group: quiet, groupEnd: quiet, table: quiet };
+};
+
+Page.prototype._error = function(e) {
+  var message = e && e.stack ? e.stack.split('\n').slice(0, 2).join(' | ') : String(e);
+  if (this.stats.errors.indexOf(message) === -1) this.stats.errors.push(message);
+  if (this.options.verbose) console.log('    [' + path.basename(this.scoDir) + ' exception] ' + message);
+};
+
+Page.prototype._task = function(fn) {
+  var self = this;
+  if (this.closed) return;
+  this.profiler.task(fn, function(e) { self._error(e); });
+};
+
+/**
+ * Run the page's scripts, fire DOMContentLoaded/load and wait for the
+ * page to go quiet. Returns time to interactive (main-thread ms).
+ */
+Page.prototype.load = function() {
+  var self = this;
+  var scripts = this.document.querySelectorAll('script');
+
+  scripts.forEach(function(script) {
+    var src = script.getAttribute('src');
+    var code;
+    var filename;
+    if (src) {
+      if (/^[a-z]+:\/\//i.test(src)) return;
+      filename = path.resolve(self.scoDir, src);
+      try {
+        code = fs.readFileSync(filename, 'utf8');
+      } catch (e) {
+        self._error(new Error('Missing script ' + src));
+        return;
+      }
+    } else {
+      code = script.textContent;
+      filename = path.join(self.scoDir, 'index.html#inline');
+    }
+    self._task(function() {
+      vm.runInContext(code, self.context, { filename: filename });
+    });
+    self._instrument();
+  });
+
+  this._task(function() {
+    self.document.readyState = 'interactive';
+    self.document.dispatchEvent(new dom.Event('DOMContentLoaded', { bubbles: true }));
+    self.document.readyState = 'complete';
+    self.window.dispatchEvent(new dom.Event('load'));
+  });
+
+  if (this.options.integration) {
+    this._task(function() { self._integrate(); });
+  }
+
+  /* Interactive once a quiet window passes with no task */
+  var waited = 0;
+  while (waited < CONFIG.TTI_MAX_MS) {
+    var tasks = this.profiler.tasks;
+    this.loop.advance(CONFIG.TTI_QUIET_MS);
+    waited += CONFIG.TTI_QUIET_MS;
+    if (this.profiler.tasks === tasks) break;
+  }
+  return this.profiler.busy;
+};
+
+/** Time the prototype methods of engine classes as they appear. */
+Page.prototype._instrument = function() {
+  var self = this;
+  var win = this.window;
+
+  CONFIG.ENGINES.forEach(function(name) {
+    var Ctor = win[name];
+    if (typeof Ctor !== 'function' || self._instrumented[name]) return;
+    self._instrumented[name] = true;
+
+    var proto = Ctor.prototype;
+    Object.getOwnPropertyNames(proto).forEach(function(key) {
+      if (key === 'constructor') return;
+      var desc = Object.getOwnPropertyDescriptor(proto, key);
+      if (!desc || typeof desc.value !== 'function') return;
+      var original = desc.value;
+      proto[key] = function() {
+        if (name === 'SCORMWrapper' && key === 'initialize' && !self.scorm) self.scorm = this;
+        return self.profiler.measure(name, key, original, this, arguments);
+      };
+    });
+  });
+};
+
+/** Attach BehaviorTracker and GamificationEngine the way a SCO would. */
+Page.prototype._integrate = function() {
+  var win = this.window;
+  if (!this.scorm) return;
+
+  if (typeof win.BehaviorTracker === 'function') {
+    this.tracker = new win.BehaviorTracker(this.scorm);
+    this.tracker.startSession();
+    this.tracker.trackPageView(this._pageId());
+  }
+  if (typeof win.GamificationEngine === 'function') {
+    this.gamification = new win.GamificationEngine(this.scorm);
+    this.gamification.init();
+  }
+
+  var self = this;
+  win.addEventListener('beforeunload', function() {
+    if (self.tracker) self.tracker.endSession();
+  });
+};
+
+Page.prototype._pageId = function() {
+  var active = this._activeSlide();
+  return path.basename(this.scoDir) + '-s' + (active ? active.getAttribute('data-slide') : '0');
+};
+
+Page.prototype._activeSlide = function() {
+  var slides = this.document.querySelectorAll('.slide');
+  for (var i = 0; i < slides.length; i++) {
+    if (slides[i].classList.contains('active')) return slides[i];
+  }
+  return slides[0] || null;
+};
+
+Page.prototype.slideCount = function() {
+  return this.document.querySelectorAll('.slide').length;
+};
+
+Page.prototype.slideIndex = function() {
+  var active = this._activeSlide();
+  return active ? this.document.querySelectorAll('.slide').indexOf(active) : 0;
+};
+
+// ---------------------------------------------------------
+// Learner actions
+// ---------------------------------------------------------
+
+Page.prototype.wait = function(ms) {
+  this.loop.advance(ms);
+};
+
+Page.prototype.click = function(el, after) {
+  var self = this;
+  this._task(function() {
+    el.dispatchEvent(new dom.Event('pointerdown', { bubbles: true }));
+    el.click();
+    if (after) after();
+  });
+  this.wait(CONFIG.CLICK_GAP_MS);
+};
+
+Page.prototype.navigate = function(direction) {
+  var self = this;
+  var button = this.document.getElementById(direction > 0 ? 'nextBtn' : 'prevBtn') ||
+    this.document.querySelector(direction > 0 ? '.btn-next' : '.btn-prev');
+  if (!button || button.disabled) return false;
+
+  var before = this.slideIndex();
+  this.click(button, function() {
+    if (self.slideIndex() === before) return;
+    if (self.tracker) self.tracker.trackPageView(self._pageId());
+    if (self.gamification && direction > 0) self.gamification.completeSection();
+  });
+  return this.slideIndex() !== before;
+};
+
+Page.prototype.scroll = function(events) {
+  var win = this.window;
+  var doc = this.document;
+  var max = dom.CONFIG.DOCUMENT_HEIGHT - dom.CONFIG.VIEWPORT_HEIGHT;
+
+  for (var i = 1; i <= events; i++) {
+    var y = Math.round(max * i / events);
+    this._task(function() {
+      win.scrollTo(0, y);
+      doc.dispatchEvent(new dom.Event('scroll', { bubbles: true }));
+    });
+    if (i % CONFIG.SCROLL_EVENTS_PER_FRAME === 0) this.wait(dom.CONFIG.FRAME_MS);
+  }
+  this._task(function() { win.scrollTo(0, 0); });
+};
+
+/**
+ * Use the controls of the active slide.
+ * @param {string} mode - 'first' or 'retry'
+ */
+Page.prototype.interact = function(mode) {
+  var self = this;
+  var slide = this._activeSlide();
+  if (!slide) return;
+
+  var controls = slide.querySelectorAll('[onclick], select, [draggable="true"]').filter(function(el) {
+    return !el.closest('nav, .sco-nav');
+  });
+  var zones = slide.querySelectorAll('[ondrop]');
+  var done = [];
+
+  controls.forEach(function(el, i) {
+    if (done.indexOf(el) !== -1) return;
+
+    if (el.localName === 'select') {
+      self._choose(el);
+    } else if (el.getAttribute('draggable') === 'true') {
+      self._drag(el, zones[i % Math.max(zones.length, 1)]);
+    } else if (isOption(el)) {
+      var group = controls.filter(function(o) { return isOption(o) && o.parentNode === el.parentNode; });
+      var check = controls.slice(i).filter(isCheck)[0];
+      group.forEach(function(option, index) {
+        done.push(option);
+        if (mode === 'retry' || index === group.length - 1) {
+          self._answer(option, index, check);
+        }
+      });
+      if (check) done.push(check);
+    } else {
+      self.click(el);
+    }
+  });
+};
+
+function isOption(el) {
+  return el.classList.contains('quiz-option') || el.getAttribute('role') === 'radio';
+}
+
+function isCheck(el) {
+  return /check|submit/i.test(el.getAttribute('onclick') || '') || /^check/i.test(el.id);
+}
+
+Page.prototype._answer = function(option, index, check) {
+  var self = this;
+  var questionId = this._pageId() + '-q';
+
+  this.click(option, function() {
+    if (!self.tracker) return;
+    if (!self._quiz || self._quiz !== questionId) {
+      self.tracker.startQuizQuestion(questionId, { correctOption: -1, type: 'choice' });
+      self._quiz = questionId;
+    }
+    self.tracker.trackOptionSelect(index);
+  });
+
+  if (check && !check.disabled && check.style.display !== 'none') {
+    this.click(check, function() {
+      var correct = !!option.parentNode.querySelector('.correct');
+      if (self.tracker) {
+        self.tracker.submitQuizAnswer(correct ? -1 : index);
+        self._quiz = null;
+      }
+      if (self.gamification) self.gamification.recordAnswer(correct);
+    });
+  }
+};
+
+Page.prototype._choose = function(select) {
+  var options = select.options;
+  if (!options.length) return;
+  this.click(select, function() {
+    select.selectedIndex = options.length > 1 ? 1 : 0;
+    select.dispatchEvent(new dom.Event('change', { bubbles: true }));
+  });
+};
+
+Page.prototype._drag = function(item, zone) {
+  if (!zone) return;
+  var transfer = new dom.DataTransfer();
+  this._task(function() {
+    item.dispatchEvent(new dom.Event('dragstart', { bubbles: true, dataTransfer: transfer }));
+  });
+  this._task(function() {
+    zone.dispatchEvent(new dom.Event('dragover', { bubbles: true, cancelable: true, dataTransfer: transfer }));
+  });
+  this._task(function() {
+    zone.dispatchEvent(new dom.Event('drop', { bubbles: true, cancelable: true, dataTransfer: transfer }));
+    item.dispatchEvent(new dom.Event('dragend', { bubbles: true, dataTransfer: transfer }));
+  });
+  this.wait(CONFIG.CLICK_GAP_MS);
+};
+
+/**
+ * Load the StateManager (the generated pages don't use it) and add a
+ * button set of `objects` options to the active slide, then hover, press,
+ * click and select `clicks` of them. The manager's listener and mutation
+ * counts are kept in stateStats.
+ * @param {object} spec - { objects, clicks, delegate, batch }
+ */
+Page.prototype.driveStates = function(spec) {
+  var self = this;
+  var win = this.window;
+  var doc = this.document;
+  var slide = this._activeSlide();
+  if (!slide) return;
+
+  this._task(function() {
+    if (typeof win.StateManager !== 'function') {
+      var file = path.join(self.scoDir, '..', 'shared', 'engine', 'state-engine.js');
+      vm.runInContext(fs.readFileSync(file, 'utf8'), self.context, { filename: file });
+      self._instrument();
+    }
+
+    var group = doc.createElement('div');
+    group.className = 'state-options';
+    for (var i = 0; i < spec.objects; i++) {
+      var option = doc.createElement('div');
+      option.id = 'bench-option-' + i;
+      option.className = 'state-option';
+      option.innerHTML = '<span>Option ' + (i + 1) + '</span>';
+      group.appendChild(option);
+    }
+    slide.appendChild(group);
+
+    self.states = new win.StateManager({ delegate: !!spec.delegate, batch: !!spec.batch });
+    for (var j = 0; j < spec.objects; j++) {
+      self.states.register('bench-option-' + j, CONFIG.STATE_DEFS, { buttonSet: 'bench' });
+    }
+  });
+  this.wait(dom.CONFIG.FRAME_MS);
+  this._task(function() { self.states.resetStats(); });
+
+  for (var k = 0; k < spec.clicks; k++) {
+    this._pressOption(doc.getElementById('bench-option-' + (k * 7 % spec.objects)));
+  }
+  this._task(function() { self.stateStats = self.states.getStats(); });
+};
+
+Page.prototype._pressOption = function(el) {
+  var self = this;
+  this._task(function() {
+    el.dispatchEvent(new dom.Event('mouseover', { bubbles: true }));
+    el.dispatchEvent(new dom.Event('mouseenter'));
+    el.dispatchEvent(new dom.Event('mousedown', { bubbles: true }));
+    el.dispatchEvent(new dom.Event('mouseup', { bubbles: true }));
+    el.click();
+    self.states.setState(el.id, 'selected');
+  });
+  this.wait(CONFIG.CLICK_GAP_MS);
+};
+
+Page.prototype.setVisible = function(visible) {
+  var doc = this.document;
+  var win = this.window;
+  this._task(function() {
+    doc.visibilityState = visible ? 'visible' : 'hidden';
+    doc.hidden = !visible;
+    doc.dispatchEvent(new dom.Event('visibilitychange', { bubbles: true }));
+    win.dispatchEvent(new dom.Event(visible ? 'focus' : 'blur'));
+  });
+};
+
+Page.prototype.unload = function() {
+  var win = this.window;
+  this.setVisible(false);
+  this._task(function() {
+    win.dispatchEvent(new dom.Event('pagehide'));
+    win.dispatchEvent(new dom.Event('beforeunload', { cancelable: true }));
+    win.dispatchEvent(new dom.Event('unload'));
+  });
+  this.closed = true;
+};
+
+// =========================================================
+// SESSIONS
+// =========================================================
+
+/**
+ * Replay one session against one SCO.
+ * @returns {object} Metrics for this run
+ */
+function runSession(scoDir, session, options) {
+  var lms = new MockLMS({ latency: options.latency });
+  var launches = [];
+  var page = null;
+
+  function launch() {
+    page = new Page(scoDir, lms, options);
+    var tti = page.load();
+    launches.push({ page: page, tti: tti });
+  }
+
+  function finish() {
+    launches[launches.length - 1].lms = lms.summary();
+  }
+
+  launch();
+
+  session.steps.forEach(function(step) {
+    if (step.relaunch) {
+      if (!page.closed) page.unload();
+      finish();
+      lms.reload();
+      launch();
+    } else if (page.closed) {
+      return;
+    } else if (step.walk) {
+      var w = step.walk;
+      var last = page.slideCount() - 1;
+      var target = Math.round(last * (w.to === undefined ? 1 : w.to));
+      var guard = page.slideCount() * 2;
+      for (;;) {
+        if (w.scroll) page.scroll(w.scroll);
+        if (w.interact) page.interact(w.interact);
+        page.wait(w.dwell || 0);
+        if (page.slideIndex() >= target || guard-- <= 0) break;
+        if (!page.navigate(1)) break;
+      }
+    } else if (step.back) {
+      for (var b = 0; b < step.back; b++) {
+        page.navigate(-1);
+        page.wait(1500);
+      }
+    } else if (step.idle) {
+      page.wait(step.idle);
+    } else if (step.away) {
+      page.setVisible(false);
+      page.wait(step.away);
+      page.setVisible(true);
+    } else if (step.states) {
+      page.driveStates(step.states);
+    } else if (step.unload) {
+      page.unload();
+    }
+  });
+
+  if (!page.closed) page.unload();
+  finish();
+
+  return collect(launches);
+}
+
+/** Fold the launches of a session into one metrics record. */
+function collect(launches) {
+  var result = {
+    lms: { calls: 0, gets: 0, sets: 0, commits: 0, setBytes: 0, blockedMs: 0, rejected: 0,
+      suspendData: 0, maxSuspendData: 0, interactions: 0 },
+    dom: { mutations: 0, layoutReads: 0, styleReads: 0 },
+    timing: { ttiMs: launches[0].tti, mainThreadMs: 0, engines: {}, methods: {} },
+    errors: []
+  };
+  if (launches.length > 1) result.timing.resumeTtiMs = launches[launches.length - 1].tti;
+
+  launches.forEach(function(l) {
+    ['calls', 'gets', 'sets', 'commits', 'setBytes', 'blockedMs', 'rejected'].forEach(function(k) {
+      result.lms[k] += l.lms[k];
+    });
+    result.lms.suspendData = l.lms.suspendData;
+    result.lms.interactions = l.lms.interactions;
+    result.lms.maxSuspendData = Math.max(result.lms.maxSuspendData, l.lms.maxSuspendData);
+
+    var stats = l.page.stats;
+    result.dom.mutations += stats.mutations;
+    result.dom.layoutReads += stats.layoutReads;
+    result.dom.styleReads += stats.styleReads;
+    if (l.page.stateStats) {
+      var st = l.page.stateStats;
+      result.states = { listeners: st.listeners, interactions: st.interactions, mutations: st.mutations,
+        mutationsPerInteraction: st.mutationsPerInteraction, maxInteraction: st.maxInteraction };
+    }
+    stats.errors.forEach(function(e) {
+      if (result.errors.indexOf(e) === -1) result.errors.push(e);
+    });
+
+    var prof = l.page.profiler;
+    result.timing.mainThreadMs += prof.busy;
+    Object.keys(prof.engines).forEach(function(k) {
+      result.timing.engines[k] = (result.timing.engines[k] || 0) + prof.engines[k];
+    });
+    Object.keys(prof.methods).forEach(function(k) {
+      var m = result.timing.methods[k] || (result.timing.methods[k] = { calls: 0, totalMs: 0, maxMs: 0 });
+      m.calls += prof.methods[k].calls;
+      m.totalMs += prof.methods[k].total;
+      m.maxMs = Math.max(m.maxMs, prof.methods[k].max);
+    });
+  });
+
+  Object.keys(result.timing.methods).forEach(function(k) {
+    var m = result.timing.methods[k];
+    m.avgMs = m.totalMs / m.calls;
+  });
+  return result;
+}
+
+/**
+ * Fastest of each timing across runs (the least disturbed by GC and
+ * other processes); counts come from the first run.
+ */
+function combineRuns(runs) {
+  var result = JSON.parse(JSON.stringify(runs[0]));
+
+  function fastest(values) {
+    values = values.filter(function(v) { return typeof v === 'number'; });
+    return values.length ? Math.min.apply(null, values) : 0;
+  }
+
+  ['ttiMs', 'resumeTtiMs', 'mainThreadMs'].forEach(function(k) {
+    if (result.timing[k] !== undefined) {
+      result.timing[k] = fastest(runs.map(function(r) { return r.timing[k]; }));
+    }
+  });
+  Object.keys(result.timing.engines).forEach(function(k) {
+    result.timing.engines[k] = fastest(runs.map(function(r) { return r.timing.engines[k]; }));
+  });
+  Object.keys(result.timing.methods).forEach(function(k) {
+    ['avgMs', 'maxMs', 'totalMs'].forEach(function(f) {
+      result.timing.methods[k][f] = fastest(runs.map(function(r) {
+        return r.timing.methods[k] && r.timing.methods[k][f];
+      }));
+    });
+  });
+
+  result.deterministic = runs.every(function(r) {
+    return JSON.stringify([r.lms, r.dom]) === JSON.stringify([runs[0].lms, runs[0].dom]);
+  });
+  return result;
+}
+
+// =========================================================
+// BASELINE
+// =========================================================
+
+/**
+ * Time a fixed CPU workload (string building, JSON, object churn — what
+ * the engines mostly do) so timings from different machines or machine
+ * loads can be compared. Best of several passes, in ms.
+ */
+function calibrate() {
+  var best = Infinity;
+  for (var pass = 0; pass < 7; pass++) {
+    var start = hrnow();
+    var data = [];
+    for (var i = 0; i < 2000; i++) {
+      data.push({ id: 'p' + i, t: i * 17 % 1000, tags: ['a' + (i % 7), 'b' + (i % 13)] });
+    }
+    var text = JSON.stringify(data);
+    var parsed = JSON.parse(text);
+    var sum = 0;
+    for (var j = 0; j < parsed.length; j++) sum += parsed[j].t + parsed[j].tags.join('').length;
+    if (sum < 0) throw new Error('unreachable');
+    best = Math.min(best, hrnow() - start);
+  }
+  return best;
+}
+
+/** Comparable numbers of a result, keyed by dotted path. */
+function flatten(result) {
+  var out = {};
+  Object.keys(result.lms).forEach(function(k) { out['lms.' + k] = result.lms[k]; });
+  Object.keys(result.dom).forEach(function(k) { out['dom.' + k] = result.dom[k]; });
+  if (result.states) {
+    Object.keys(result.states).forEach(function(k) { out['states.' + k] = result.states[k]; });
+  }
+  out.errors = result.errors.length;
+  ['ttiMs', 'resumeTtiMs', 'mainThreadMs'].forEach(function(k) {
+    if (result.timing[k] !== undefined) out['timing.' + k] = result.timing[k];
+  });
+  Object.keys(result.timing.engines).forEach(function(k) {
+    out['timing.engines.' + k] = result.timing.engines[k];
+  });
+  CONFIG.HOT_METHODS.forEach(function(k) {
+    var m = result.timing.methods[k];
+    if (m) {
+      out['timing.methods.' + k + '.avgMs'] = m.avgMs;
+      out['timing.methods.' + k + '.calls'] = m.calls;
+    }
+  });
+  return out;
+}
+
+function isTiming(key) {
+  return /Ms$/.test(key) && key.indexOf('timing.') === 0 || /^timing\.engines\./.test(key);
+}
+
+/**
+ * @param {object} results
+ * @param {object} baseline - Saved baseline file (flattened results)
+ * @param {object} options - { tolerance, calibrationMs }
+ * @returns {{regressions: Array, slower: Array, improvements: Array,
+ *   missing: Array, scale: number}}
+ */
+function compare(results, baseline, options) {
+  var scale = baseline.calibrationMs && options.calibrationMs
+    ? options.calibrationMs / baseline.calibrationMs : 1;
+  var tolerance = options.tolerance;
+  var report = { regressions: [], slower: [], improvements: [], missing: [], scale: scale };
+
+  Object.keys(results).forEach(function(id) {
+    var base = baseline.results && baseline.results[id];
+    if (!base) {
+      report.missing.push(id);
+      return;
+    }
+    var now = flatten(results[id]);
+    var before = base;
+
+    Object.keys(now).forEach(function(key) {
+      if (before[key] === undefined) return;
+      var a = before[key];
+      var b = now[key];
+      var entry = { id: id, key: key, before: a, after: b };
+
+      if (isTiming(key)) {
+        /* Express the current timing in baseline-machine milliseconds */
+        b = entry.after = b / scale;
+        if (b > a * (1 + tolerance) && b - a > CONFIG.TIME_FLOOR_MS) report.slower.push(entry);
+        else if (a > b * (1 + tolerance) && a - b > CONFIG.TIME_FLOOR_MS) report.improvements.push(entry);
+      } else if (key !== 'lms.interactions') {
+        if (b > a) report.regressions.push(entry);
+        else if (b < a) report.improvements.push(entry);
+      }
+    });
+  });
+  return report;
+}
+
+// =========================================================
+// REPORT
+// =========================================================
+
+function pad(str, width, right) {
+  str = String(str);
+  while (str.length < width) str = right ? str + ' ' : ' ' + str;
+  return str;
+}
+
+function ms(n) {
+  return n === undefined ? '-' : n.toFixed(n < 10 ? 2 : 1);
+}
+
+function printReport(results, options) {
+  var ids = Object.keys(results);
+  var w = Math.max.apply(null, ids.map(function(id) { return id.length; }).concat([10]));
+
+  console.log('\nLMS traffic and DOM work' + (options.integration ? ' (tracker + gamification attached)' : ''));
+  console.log(pad('sco / session', w, true) + pad('calls', 7) + pad('get', 6) + pad('set', 6) +
+    pad('commit', 8) + pad('LMS ms', 9) + pad('susp.', 7) + pad('max', 6) + pad('mutations', 11) +
+    pad('layout', 8) + pad('errors', 8));
+  ids.forEach(function(id) {
+    var r = results[id];
+    console.log(pad(id, w, true) + pad(r.lms.calls, 7) + pad(r.lms.gets, 6) + pad(r.lms.sets, 6) +
+      pad(r.lms.commits, 8) + pad(r.lms.blockedMs, 9) + pad(r.lms.suspendData, 7) +
+      pad(r.lms.maxSuspendData, 6) + pad(r.dom.mutations, 11) + pad(r.dom.layoutReads, 8) +
+      pad(r.errors.length, 8) + (r.lms.rejected ? '  ' + r.lms.rejected + ' suspend_data rejected' : ''));
+  });
+
+  var stateIds = ids.filter(function(id) { return results[id].states; });
+  if (stateIds.length) {
+    console.log('\nStateManager (per-object listeners vs delegated, batched writes)');
+    console.log(pad('sco / session', w, true) + pad('listeners', 11) + pad('clicks', 8) +
+      pad('mutations', 11) + pad('per click', 11) + pad('max', 6));
+    stateIds.forEach(function(id) {
+      var st = results[id].states;
+      console.log(pad(id, w, true) + pad(st.listeners, 11) + pad(st.interactions, 8) +
+        pad(st.mutations, 11) + pad(st.mutationsPerInteraction, 11) + pad(st.maxInteraction, 6));
+    });
+  }
+
+  var engines = [];
+  ids.forEach(function(id) {
+    Object.keys(results[id].timing.engines).forEach(function(k) {
+      if (engines.indexOf(k) === -1) engines.push(k);
+    });
+  });
+  engines.sort(function(a, b) { return a === 'page' ? -1 : b === 'page' ? 1 : a < b ? -1 : 1; });
+
+  console.log('\nMain-thread time, ms (best of ' + options.runs + ' runs; engine columns are self time)');
+  var labels = engines.map(function(e) { return e.replace(/(Engine|Controller|Wrapper|System)$/, ''); });
+  var widths = labels.map(function(l) { return Math.max(l.length + 2, 8); });
+  console.log(pad('sco / session', w, true) + pad('TTI', 8) + pad('resume', 8) + pad('total', 8) +
+    labels.map(function(l, i) { return pad(l, widths[i]); }).join(''));
+  ids.forEach(function(id) {
+    var t = results[id].timing;
+    console.log(pad(id, w, true) + pad(ms(t.ttiMs), 8) + pad(ms(t.resumeTtiMs), 8) + pad(ms(t.mainThreadMs), 8) +
+      engines.map(function(e, i) {
+        return pad(t.engines[e] === undefined ? '-' : ms(t.engines[e]), widths[i]);
+      }).join(''));
+  });
+
+  console.log('\nHot methods, ms (calls / avg / max)');
+  console.log(pad('sco / session', w, true) + CONFIG.HOT_METHODS.map(function(m) { return pad(m, 26); }).join(''));
+  ids.forEach(function(id) {
+    var methods = results[id].timing.methods;
+    console.log(pad(id, w, true) + CONFIG.HOT_METHODS.map(function(k) {
+      var m = methods[k];
+      return pad(m ? m.calls + ' / ' + ms(m.avgMs) + ' / ' + ms(m.maxMs) : '-', 26);
+    }).join(''));
+  });
+
+  ids.forEach(function(id) {
+    var r = results[id];
+    if (!r.deterministic) console.log('\nWarning: ' + id + ' counts differ between runs');
+    if (r.errors.length) {
+      console.log('\nErrors in ' + id + ':');
+      r.errors.forEach(function(e) { console.log('  ' + e); });
+    }
+  });
+}
+
+function printComparison(report, baselinePath) {
+  console.log('\nCompared with ' + path.relative(process.cwd(), baselinePath) +
+    ' (timings scaled by CPU calibration x' + report.scale.toFixed(2) + ')');
+  if (report.missing.length) {
+    console.log('  Not in baseline: ' + report.missing.join(', '));
+  }
+
+  function line(e) {
+    var a = typeof e.before === 'number' && isTiming(e.key) ? ms(e.before) : e.before;
+    var b = typeof e.after === 'number' && isTiming(e.key) ? ms(e.after) : e.after;
+    return '  ' + e.id + '  ' + e.key + ': ' + a + ' -> ' + b;
+  }
+
+  if (report.improvements.length) {
+    console.log('  Improvements (' + report.improvements.length + '):');
+    report.improvements.forEach(function(e) { console.log(line(e)); });
+  }
+  if (report.slower.length) {
+    console.log('  Slower (' + report.slower.length + '):');
+    report.slower.forEach(function(e) { console.log(line(e)); });
+  }
+  if (report.regressions.length) {
+    console.log('  REGRESSIONS (' + report.regressions.length + '):');
+    report.regressions.forEach(function(e) { console.log(line(e)); });
+  } else {
+    console.log('  No count regressions.');
+  }
+}
+
+// =========================================================
+// MAIN
+// =========================================================
+
+function parseArgs(argv) {
+  var args = { course: null, sessions: null, sco: null, runs: CONFIG.DEFAULT_RUNS, latency: {},
+    integration: true, tolerance: CONFIG.TIME_TOLERANCE, failOnTiming: false,
+    baseline: CONFIG.DEFAULT_BASELINE, updateBaseline: false, json: null, verbose: false };
+
+  for (var i = 0; i < argv.length; i++) {
+    var a = argv[i];
+    if (a === '--session') args.sessions = (args.sessions || []).concat(argv[++i].split(','));
+    else if (a === '--sco') args.sco = argv[++i];
+    else if (a === '--runs') args.runs = Math.max(1, parseInt(argv[++i], 10) || 1);
+    else if (a === '--latency') {
+      argv[++i].split(',').forEach(function(pair) {
+        var kv = pair.split('=');
+        args.latency[kv[0]] = parseFloat(kv[1]) || 0;
+      });
+    }
+    else if (a === '--no-integration') args.integration = false;
+    else if (a === '--tolerance') args.tolerance = parseFloat(argv[++i]) || 0;
+    else if (a === '--fail-on-timing') args.failOnTiming = true;
+    else if (a === '--baseline') args.baseline = path.resolve(argv[++i]);
+    else if (a === '--update-baseline') args.updateBaseline = true;
+    else if (a === '--json') args.json = path.resolve(argv[++i]);
+    else if (a === '--verbose') args.verbose = true;
+    else if (a === '--help' || a === '-h') args.help = true;
+    else if (!args.course) args.course = path.resolve(a);
+    else throw new Error('Unexpected argument: ' + a);
+  }
+  return args;
+}
+
+/**
+ * Benchmark every SCO of a course with the selected sessions.
+ * @returns {object} results keyed by "<sco>/<session>"
+ */
+function benchmark(args) {
+  var scos = fs.readdirSync(args.course).filter(function(name) {
+    return /^sco_/.test(name) && fs.existsSync(path.join(args.course, name, 'index.html')) &&
+      (!args.sco || name.indexOf(args.sco) !== -1);
+  }).sort();
+  var sessions = args.sessions || Object.keys(SESSIONS);
+  var results = {};
+
+  sessions.forEach(function(name) {
+    if (!SESSIONS[name]) throw new Error('Unknown session: ' + name);
+  });
+
+  scos.forEach(function(sco) {
+    sessions.forEach(function(name) {
+      results[sco + '/' + name] = combineRuns(measure(args, sco, name));
+    });
+  });
+  return results;
+}
+
+/** --runs runs of one session on one SCO, after a discarded warm-up run. */
+function measure(args, sco, name) {
+  var runs = [];
+  for (var r = 0; r <= args.runs; r++) {
+    var run = runSession(path.join(args.course, sco), SESSIONS[name], {
+      latency: args.latency,
+      integration: args.integration,
+      verbose: args.verbose && r === 0,
+      seed: 1
+    });
+    if (r > 0) runs.push(run);
+  }
+  return runs;
+}
+
+/**
+ * Run the given "<sco>/<session>" results again and keep the fastest
+ * timings of all passes.
+ */
+function recheck(results, ids, args) {
+  ids.forEach(function(id) {
+    var parts = id.split('/');
+    results[id] = combineRuns([results[id]].concat(measure(args, parts[0], parts[1])));
+  });
+}
+
+function main() {
+  var args = parseArgs(process.argv.slice(2));
+  if (args.help || !args.course) {
+    console.log('Usage: node scripts/benchmark.js <course-dir> [--session name] [--sco name] [--runs n]\n' +
+      '         [--latency get=1,set=2,commit=80] [--no-integration]\n' +
+      '         [--baseline file] [--update-baseline] [--tolerance 0.5] [--fail-on-timing]\n' +
+      '         [--json file] [--verbose]\n' +
+      'Sessions: ' + Object.keys(SESSIONS).join(', '));
+    process.exit(args.help ? 0 : 1);
+  }
+
+  var calibrationMs = calibrate();
+  var results = benchmark(args);
+  printReport(results, args);
+
+  if (args.json) {
+    fs.writeFileSync(args.json, JSON.stringify(results, null, 2) + '\n');
+    console.log('\nWrote ' + path.relative(process.cwd(), args.json));
+  }
+
+  if (args.updateBaseline) {
+    var baseline = {
+      course: path.relative(path.dirname(args.baseline), args.course).split(path.sep).join('/'),
+      integration: args.integration,
+      node: process.version,
+      calibrationMs: Math.round(calibrationMs * 1000) / 1000,
+      results: {}
+    };
+    Object.keys(results).forEach(function(id) {
+      var flat = flatten(results[id]);
+      Object.keys(flat).forEach(function(k) {
+        if (isTiming(k)) flat[k] = Math.round(flat[k] * 1000) / 1000;
+      });
+      baseline.results[id] = flat;
+    });
+    fs.writeFileSync(args.baseline, JSON.stringify(baseline, null, 2) + '\n');
+    console.log('\nBaseline updated: ' + path.relative(process.cwd(), args.baseline));
+    return;
+  }
+
+  if (fs.existsSync(args.baseline)) {
+    var saved = JSON.parse(fs.readFileSync(args.baseline, 'utf8'));
+    if (saved.integration !== args.integration) {
+      console.log('\nBaseline was recorded ' + (saved.integration ? 'with' : 'without') +
+        ' integration; skipping comparison.');
+      return;
+    }
+    var options = { tolerance: args.tolerance, calibrationMs: calibrationMs };
+    var report = compare(results, saved, options);
+    for (var pass = 0; pass < CONFIG.TIME_RECHECKS && args.failOnTiming && report.slower.length; pass++) {
+      var slow = [];
+      report.slower.forEach(function(e) {
+        if (slow.indexOf(e.id) === -1) slow.push(e.id);
+      });
+      console.log('\nRe-running ' + slow.length + ' session(s) with slower timings');
+      recheck(results, slow, args);
+      /* A calibration pass that happened to run fast inflates every
+         timing; only count what is slow under both calibrations */
+      options.calibrationMs = Math.max(options.calibrationMs, calibrate());
+      report = compare(results, saved, options);
+    }
+    printComparison(report, args.baseline);
+    if (report.slower.length) {
+      console.log('  Timings over ' + Math.round(args.tolerance * 100) + '% slower ' +
+        (args.failOnTiming ? 'fail the run (--tolerance to adjust).'
+                           : 'are only reported (--fail-on-timing to fail the run).'));
+    }
+    if (report.regressions.length || (args.failOnTiming && report.slower.length)) process.exitCode = 1;
+  } else {
+    console.log('\nNo baseline at ' + path.relative(process.cwd(), args.baseline) +
+      ' (record one with --update-baseline)');
+  }
+}
+
+if (require.main === module) {
+  main();
+}
+
+module.exports = {
+  benchmark: benchmark,
+  runSession: runSession,
+  compare: compare,
+  Page: Page
+};
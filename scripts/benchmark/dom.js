@@ -0,0 +1,1445 @@
+/**
+ * Minimal DOM for the benchmark harness
+ * ====================================================================
+ * Just enough of the browser for the generated SCO pages and shared
+ * engines to run under Node's vm module: an HTML parser, element tree,
+ * selectors, events (with inline on* handlers), style/classList, a
+ * virtual clock driving timers and animation frames, and window globals.
+ *
+ * It is not a layout engine. Geometry reads (clientHeight, scrollHeight,
+ * getBoundingClientRect, getComputedStyle...) return fixed viewport-sized
+ * values and are counted as layout reads; every tree, attribute, class,
+ * style and text change is counted as a DOM mutation.
+ */
+
+'use strict';
+
+var vm = require('vm');
+
+// =========================================================
+// CONFIGURATION
+// =========================================================
+
+var CONFIG = {
+  VIEWPORT_WIDTH: 1280,
+  VIEWPORT_HEIGHT: 720,
+
+  // Scrollable document height used for scroll-depth tracking
+  DOCUMENT_HEIGHT: 2160,
+
+  FRAME_MS: 1000 / 60,
+
+  VOID_TAGS: ['area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'source', 'track', 'wbr'],
+
+  RAW_TEXT_TAGS: ['script', 'style', 'textarea', 'title'],
+
+  ENTITIES: { amp: '&', lt: '<', gt: '>', quot: '"', apos: '\'', nbsp: ' ', copy: '©',
+    mdash: '—', ndash: '–', hellip: '…', rarr: '→', larr: '←',
+    times: '×', check: '✓' }
+};
+
+var ELEMENT_NODE = 1;
+var TEXT_NODE = 3;
+var COMMENT_NODE = 8;
+var DOCUMENT_NODE = 9;
+var DOCUMENT_FRAGMENT_NODE = 11;
+
+// =========================================================
+// EVENT LOOP (virtual clock)
+// =========================================================
+
+/**
+ * Timers, idle callbacks and animation frames on a virtual clock, so a
+ * scripted session can "wait" minutes in milliseconds of real time.
+ *
+ * @param {object} [hooks]
+ * @param {function(string, function)} [hooks.runTask] - Wraps every task
+ *   the loop runs (used by the profiler); defaults to calling it.
+ */
+function EventLoop(hooks) {
+  this.now = 0;
+  this._nextId = 1;
+  this._timers = [];
+  this._frames = [];
+  this._nextFrameAt = 0;
+  this._runTask = (hooks && hooks.runTask) || function(label, fn) { fn(); };
+}
+
+EventLoop.prototype.setTimeout = function(fn, ms, repeat) {
+  var id = this._nextId++;
+  ms = Math.max(0, Number(ms) || 0);
+  this._timers.push({ id: id, at: this.now + ms, fn: fn, every: repeat ? Math.max(ms, 1) : 0, seq: id });
+  return id;
+};
+
+EventLoop.prototype.clearTimeout = function(id) {
+  for (var i = 0; i < this._timers.length; i++) {
+    if (this._timers[i].id === id) {
+      this._timers.splice(i, 1);
+      return;
+    }
+  }
+};
+
+EventLoop.prototype.requestAnimationFrame = function(fn) {
+  var id = this._nextId++;
+  if (!this._frames.length) {
+    this._nextFrameAt = Math.ceil((this.now + 0.001) / CONFIG.FRAME_MS) * CONFIG.FRAME_MS;
+  }
+  this._frames.push({ id: id, fn: fn });
+  return id;
+};
+
+EventLoop.prototype.cancelAnimationFrame = function(id) {
+  this._frames = this._frames.filter(function(f) { return f.id !== id; });
+};
+
+/** Idle callbacks run as soon as nothing else is due. */
+EventLoop.prototype.requestIdleCallback = function(fn) {
+  return this.setTimeout(function() {
+    fn({ didTimeout: false, timeRemaining: function() { return 50; } });
+  }, 1);
+};
+
+/**
+ * Run everything due in the next `ms` of virtual time, in time order.
+ * @param {number} ms
+ */
+EventLoop.prototype.advance = function(ms) {
+  var target = this.now + Math.max(0, ms);
+
+  for (;;) {
+    var timer = this._earliestTimer();
+    var frameAt = this._frames.length ? this._nextFrameAt : Infinity;
+    var timerAt = timer ? timer.at : Infinity;
+    var at = Math.min(timerAt, frameAt);
+    if (at > target) break;
+
+    this.now = Math.max(this.now, at);
+    if (frameAt <= timerAt) {
+      this._runFrame();
+    } else {
+      this._runTimer(timer);
+    }
+  }
+
+  this.now = target;
+};
+
+/** @returns {boolean} Whether anything is scheduled within `ms`. */
+EventLoop.prototype.hasWorkWithin = function(ms) {
+  var timer = this._earliestTimer();
+  var at = Math.min(timer ? timer.at : Infinity, this._frames.length ? this._nextFrameAt : Infinity);
+  return at <= this.now + ms;
+};
+
+EventLoop.prototype._earliestTimer = function() {
+  var best = null;
+  for (var i = 0; i < this._timers.length; i++) {
+    var t = this._timers[i];
+    if (!best || t.at < best.at || (t.at === best.at && t.seq < best.seq)) best = t;
+  }
+  return best;
+};
+
+EventLoop.prototype._runTimer = function(timer) {
+  if (timer.every) {
+    timer.at += timer.every;
+    timer.seq = this._nextId++;
+  } else {
+    this.clearTimeout(timer.id);
+  }
+  this._runTask('timer', timer.fn);
+};
+
+EventLoop.prototype._runFrame = function() {
+  var frames = this._frames;
+  var now = this._nextFrameAt;
+  this._frames = [];
+  this._nextFrameAt = now + CONFIG.FRAME_MS;
+  this._runTask('frame', function() {
+    for (var i = 0; i < frames.length; i++) {
+      frames[i].fn(now);
+    }
+  });
+};
+
+// =========================================================
+// EVENTS
+// =========================================================
+
+function Event(type, init) {
+  init = init || {};
+  this.type = type;
+  this.bubbles = !!init.bubbles;
+  this.cancelable = !!init.cancelable;
+  this.defaultPrevented = false;
+  this.target = null;
+  this.currentTarget = null;
+  this.eventPhase = 0;
+  this.timeStamp = 0;
+  this.isTrusted = false;
+  this._stop = false;
+  this._stopNow = false;
+  for (var key in init) {
+    if (!(key in this)) this[key] = init[key];
+  }
+}
+
+Event.prototype.preventDefault = function() {
+  if (this.cancelable) this.defaultPrevented = true;
+};
+Event.prototype.stopPropagation = function() { this._stop = true; };
+Event.prototype.stopImmediatePropagation = function() { this._stop = true; this._stopNow = true; };
+
+function DataTransfer() {
+  this._data = {};
+  this.dropEffect = 'move';
+  this.effectAllowed = 'all';
+}
+DataTransfer.prototype.setData = function(type, value) { this._data[type] = String(value); };
+DataTransfer.prototype.getData = function(type) { return this._data[type] || ''; };
+DataTransfer.prototype.clearData = function() { this._data = {}; };
+
+/** Listener storage shared by nodes and window. */
+function EventTarget() {}
+
+EventTarget.prototype.addEventListener = function(type, fn, options) {
+  if (!fn) return;
+  var capture = typeof options === 'boolean' ? options : !!(options && options.capture);
+  var once = !!(options && typeof options === 'object' && options.once);
+  var list = (this._listeners || (this._listeners = {}))[type] || (this._listeners[type] = []);
+  for (var i = 0; i < list.length; i++) {
+    if (list[i].fn === fn && list[i].capture === capture) return;
+  }
+  list.push({ fn: fn, capture: capture, once: once });
+};
+
+EventTarget.prototype.removeEventListener = function(type, fn, options) {
+  var capture = typeof options === 'boolean' ? options : !!(options && options.capture);
+  var list = this._listeners && this._listeners[type];
+  if (!list) return;
+  for (var i = 0; i < list.length; i++) {
+    if (list[i].fn === fn && list[i].capture === capture) {
+      list.splice(i, 1);
+      return;
+    }
+  }
+};
+
+EventTarget.prototype.dispatchEvent = function(event) {
+  var path = [];
+  for (var node = this; node; node = parentForEvents(node)) path.push(node);
+
+  event.target = this;
+  var i;
+
+  /* Capture */
+  for (i = path.length - 1; i > 0 && !event._stop; i--) {
+    invokeListeners(path[i], event, 1, true);
+  }
+  /* Target */
+  if (!event._stop) {
+    invokeListeners(this, event, 2, null);
+  }
+  /* Bubble */
+  if (event.bubbles) {
+    for (i = 1; i < path.length && !event._stop; i++) {
+      invokeListeners(path[i], event, 3, false);
+    }
+  }
+
+  event.currentTarget = null;
+  event.eventPhase = 0;
+  return !event.defaultPrevented;
+};
+
+function parentForEvents(node) {
+  if (node.nodeType === DOCUMENT_NODE) return node.defaultView || null;
+  return node.parentNode || null;
+}
+
+function invokeListeners(target, event, phase, capture) {
+  event.currentTarget = target;
+  event.eventPhase = phase;
+
+  var list = target._listeners && target._listeners[event.type];
+  if (list) {
+    list = list.slice();
+    for (var i = 0; i < list.length && !event._stopNow; i++) {
+      var l = list[i];
+      if (capture !== null && l.capture !== capture) continue;
+      if (l.once) target.removeEventListener(event.type, l.fn, l.capture);
+      callListener(target, l.fn, event);
+    }
+  }
+
+  /* Inline on* handler (attribute) runs with the bubble-phase listeners */
+  if (capture !== true && !event._stopNow && target.nodeType === ELEMENT_NODE) {
+    var handler = target._inlineHandler(event.type);
+    if (handler && callListener(target, handler, event) === false) {
+      event.preventDefault();
+    }
+  }
+}
+
+function callListener(target, fn, event) {
+  var doc = target.ownerDocument || (target.nodeType === DOCUMENT_NODE ? target : target.document);
+  try {
+    return typeof fn === 'function' ? fn.call(target, event) : fn.handleEvent(event);
+  } catch (e) {
+    if (doc && doc._reportError) doc._reportError(e);
+    else throw e;
+  }
+}
+
+// =========================================================
+// SELECTORS
+// =========================================================
+
+var selectorCache = {};
+
+/**
+ * Parse a selector list into [[{combinator, compound}...]...].
+ * Supports tag, #id, .class, [attr], [attr=|~=|^=|$=|*=val], *, the
+ * descendant / child / sibling combinators, :not(), :first-child,
+ * :last-child, :checked, :disabled.
+ */
+function parseSelector(text) {
+  if (selectorCache[text]) return selectorCache[text];
+
+  var groups = [];
+  var chain = [];
+  var combinator = ' ';
+  var i = 0;
+  var s = text.trim();
+
+  function readName() {
+    var m = /^[-\w\u00a0-\uffff\\]+/.exec(s.slice(i));
+    if (!m) throw new SyntaxError('Unsupported selector: ' + text);
+    i += m[0].length;
+    return m[0].replace(/\\/g, '');
+  }
+
+  function readCompound() {
+    var c = { tag: null, id: null, classes: [], attrs: [], pseudos: [] };
+    var any = false;
+    while (i < s.length) {
+      var ch = s[i];
+      if (ch === '*') { i++; any = true; }
+      else if (ch === '#') { i++; c.id = readName(); any = true; }
+      else if (ch === '.') { i++; c.classes.push(readName()); any = true; }
+      else if (ch === '[') {
+        var end = s.indexOf(']', i);
+        var m = /^\s*([-\w:]+)\s*(?:([~^$*|]?=)\s*(?:"([^"]*)"|'([^']*)'|([^\]\s]*)))?\s*$/.exec(s.slice(i + 1, end));
+        if (!m) throw new SyntaxError('Unsupported selector: ' + text);
+        c.attrs.push({ name: m[1].toLowerCase(), op: m[2] || null,
+          value: m[3] !== undefined ? m[3] : (m[4] !== undefined ? m[4] : m[5]) });
+        i = end + 1;
+        any = true;
+      } else if (ch === ':') {
+        i++;
+        var name = readName();
+        var arg = null;
+        if (s[i] === '(') {
+          var depth = 1;
+          var start = ++i;
+          while (i < s.length && depth) {
+            if (s[i] === '(') depth++;
+            if (s[i] === ')') depth--;
+            i++;
+          }
+          arg = s.slice(start, i - 1);
+        }
+        c.pseudos.push({ name: name, arg: name === 'not' ? parseSelector(arg) : arg });
+        any = true;
+      } else if (/[-\w]/.test(ch)) {
+        c.tag = readName().toLowerCase();
+        any = true;
+      } else {
+        break;
+      }
+    }
+    if (!any) throw new SyntaxError('Unsupported selector: ' + text);
+    return c;
+  }
+
+  while (i < s.length) {
+    chain.push({ combinator: combinator, compound: readCompound() });
+    var ws = /^\s*/.exec(s.slice(i))[0];
+    i += ws.length;
+    if (i >= s.length) break;
+    if (s[i] === ',') {
+      groups.push(chain);
+      chain = [];
+      combinator = ' ';
+      i++;
+      i += /^\s*/.exec(s.slice(i))[0].length;
+    } else if (s[i] === '>' || s[i] === '+' || s[i] === '~') {
+      combinator = s[i++];
+      i += /^\s*/.exec(s.slice(i))[0].length;
+    } else {
+      combinator = ' ';
+    }
+  }
+  groups.push(chain);
+
+  selectorCache[text] = groups;
+  return groups;
+}
+
+function matchesCompound(el, c) {
+  if (c.tag && el.localName !== c.tag) return false;
+  if (c.id && el.getAttribute('id') !== c.id) return false;
+  for (var i = 0; i < c.classes.length; i++) {
+    if (el._classes().indexOf(c.classes[i]) === -1) return false;
+  }
+  for (i = 0; i < c.attrs.length; i++) {
+    var a = c.attrs[i];
+    var v = el.getAttribute(a.name);
+    if (v === null) return false;
+    if (!a.op) continue;
+    if (a.op === '=' && v !== a.value) return false;
+    if (a.op === '~=' && v.split(/\s+/).indexOf(a.value) === -1) return false;
+    if (a.op === '^=' && v.indexOf(a.value) !== 0) return false;
+    if (a.op === '$=' && v.slice(-a.value.length) !== a.value) return false;
+    if (a.op === '*=' && v.indexOf(a.value) === -1) return false;
+    if (a.op === '|=' && v !== a.value && v.indexOf(a.value + '-') !== 0) return false;
+  }
+  for (i = 0; i < c.pseudos.length; i++) {
+    var p = c.pseudos[i];
+    if (p.name === 'not') { if (matchesGroups(el, p.arg)) return false; }
+    else if (p.name === 'first-child') { if (el.previousElementSibling) return false; }
+    else if (p.name === 'last-child') { if (el.nextElementSibling) return false; }
+    else if (p.name === 'checked') { if (!el.checked && !el.selected) return false; }
+    else if (p.name === 'disabled') { if (!el.disabled) return false; }
+    else throw new SyntaxError('Unsupported pseudo-class :' + p.name);
+  }
+  return true;
+}
+
+function matchesChain(el, chain, index) {
+  if (!matchesCompound(el, chain[index].compound)) return false;
+  if (index === 0) return true;
+
+  var combinator = chain[index].combinator;
+  var node;
+  if (combinator === '>') {
+    node = el.parentElement;
+    return !!node && matchesChain(node, chain, index - 1);
+  }
+  if (combinator === '+') {
+    node = el.previousElementSibling;
+    return !!node && matchesChain(node, chain, index - 1);
+  }
+  if (combinator === '~') {
+    for (node = el.previousElementSibling; node; node = node.previousElementSibling) {
+      if (matchesChain(node, chain, index - 1)) return true;
+    }
+    return false;
+  }
+  for (node = el.parentElement; node; node = node.parentElement) {
+    if (matchesChain(node, chain, index - 1)) return true;
+  }
+  return false;
+}
+
+function matchesGroups(el, groups) {
+  for (var g = 0; g < groups.length; g++) {
+    if (matchesChain(el, groups[g], groups[g].length - 1)) return true;
+  }
+  return false;
+}
+
+function querySelectorAll(root, selector, first) {
+  var groups = parseSelector(selector);
+  var out = [];
+  (function walk(node) {
+    for (var i = 0; i < node.childNodes.length; i++) {
+      var child = node.childNodes[i];
+      if (child.nodeType !== ELEMENT_NODE) continue;
+      if (matchesGroups(child, groups)) {
+        out.push(child);
+        if (first) return true;
+      }
+      if (walk(child)) return true;
+    }
+    return false;
+  })(root);
+  return out;
+}
+
+// =========================================================
+// NODES
+// =========================================================
+
+function Node() {}
+Node.prototype = Object.create(EventTarget.prototype);
+
+Node.prototype._init = function(doc, type) {
+  this.ownerDocument = doc;
+  this.nodeType = type;
+  this.parentNode = null;
+  this.childNodes = [];
+};
+
+Node.prototype._mutated = function() {
+  if (this.ownerDocument) this.ownerDocument._stats.mutations++;
+};
+
+Object.defineProperties(Node.prototype, {
+  firstChild: { get: function() { return this.childNodes[0] || null; } },
+  lastChild: { get: function() { return this.childNodes[this.childNodes.length - 1] || null; } },
+  parentElement: { get: function() {
+    return this.parentNode && this.parentNode.nodeType === ELEMENT_NODE ? this.parentNode : null;
+  } },
+  nextSibling: { get: function() { return sibling(this, 1, false); } },
+  previousSibling: { get: function() { return sibling(this, -1, false); } },
+  nextElementSibling: { get: function() { return sibling(this, 1, true); } },
+  previousElementSibling: { get: function() { return sibling(this, -1, true); } },
+  children: { get: function() {
+    return this.childNodes.filter(function(n) { return n.nodeType === ELEMENT_NODE; });
+  } },
+  firstElementChild: { get: function() { return this.children[0] || null; } },
+  lastElementChild: { get: function() { var c = this.children; return c[c.length - 1] || null; } },
+  childElementCount: { get: function() { return this.children.length; } },
+  isConnected: { get: function() {
+    for (var n = this; n; n = n.parentNode) if (n.nodeType === DOCUMENT_NODE) return true;
+    return false;
+  } },
+  textContent: {
+    get: function() {
+      if (this.nodeType === TEXT_NODE || this.nodeType === COMMENT_NODE) return this.data;
+      return this.childNodes.map(function(n) {
+        return n.nodeType === COMMENT_NODE ? '' : n.textContent;
+      }).join('');
+    },
+    set: function(value) {
+      if (this.nodeType === TEXT_NODE || this.nodeType === COMMENT_NODE) {
+        this.data = String(value);
+        this._mutated();
+        return;
+      }
+      this._removeAllChildren();
+      if (value !== '' && value != null) {
+        this._append(this.ownerDocument.createTextNode(String(value)));
+      }
+      this._mutated();
+    }
+  },
+  nodeValue: {
+    get: function() { return this.nodeType === TEXT_NODE || this.nodeType === COMMENT_NODE ? this.data : null; },
+    set: function(value) { if (this.nodeType === TEXT_NODE) this.textContent = value; }
+  }
+});
+
+function sibling(node, dir, elementsOnly) {
+  var parent = node.parentNode;
+  if (!parent) return null;
+  var list = parent.childNodes;
+  for (var i = list.indexOf(node) + dir; i >= 0 && i < list.length; i += dir) {
+    if (!elementsOnly || list[i].nodeType === ELEMENT_NODE) return list[i];
+  }
+  return null;
+}
+
+Node.prototype._removeAllChildren = function() {
+  for (var i = 0; i < this.childNodes.length; i++) this.childNodes[i].parentNode = null;
+  this.childNodes = [];
+};
+
+/** Append without counting (parser use). */
+Node.prototype._append = function(child) {
+  child.parentNode = this;
+  this.childNodes.push(child);
+};
+
+Node.prototype.appendChild = function(child) {
+  return this.insertBefore(child, null);
+};
+
+Node.prototype.insertBefore = function(child, ref) {
+  if (child.nodeType === DOCUMENT_FRAGMENT_NODE) {
+    var kids = child.childNodes.slice();
+    for (var k = 0; k < kids.length; k++) this.insertBefore(kids[k], ref);
+    return child;
+  }
+  if (child.parentNode) child.parentNode.removeChild(child, true);
+  var index = ref ? this.childNodes.indexOf(ref) : -1;
+  if (index === -1) this.childNodes.push(child);
+  else this.childNodes.splice(index, 0, child);
+  child.parentNode = this;
+  this._mutated();
+  return child;
+};
+
+Node.prototype.removeChild = function(child, moving) {
+  var index = this.childNodes.indexOf(child);
+  if (index === -1) throw new Error('NotFoundError: node is not a child');
+  this.childNodes.splice(index, 1);
+  child.parentNode = null;
+  if (!moving) this._mutated();
+  return child;
+};
+
+Node.prototype.replaceChild = function(child, old) {
+  this.insertBefore(child, old);
+  return this.removeChild(old, true);
+};
+
+Node.prototype.remove = function() {
+  if (this.parentNode) this.parentNode.removeChild(this);
+};
+
+Node.prototype.append = function() {
+  for (var i = 0; i < arguments.length; i++) {
+    var a = arguments[i];
+    this.appendChild(typeof a === 'string' ? this.ownerDocument.createTextNode(a) : a);
+  }
+};
+
+Node.prototype.contains = function(other) {
+  for (var n = other; n; n = n.parentNode) if (n === this) return true;
+  return false;
+};
+
+Node.prototype.hasChildNodes = function() {
+  return this.childNodes.length > 0;
+};
+
+Node.prototype.cloneNode = function(deep) {
+  var doc = this.ownerDocument;
+  var copy;
+  if (this.nodeType === TEXT_NODE) return doc.createTextNode(this.data);
+  if (this.nodeType === COMMENT_NODE) return doc.createComment(this.data);
+  if (this.nodeType === DOCUMENT_FRAGMENT_NODE) {
+    copy = doc.createDocumentFragment();
+  } else {
+    copy = doc.createElement(this.localName);
+    copy._attrs = Object.assign({}, this._attrs);
+    copy._attrOrder = this._attrOrder.slice();
+    if (this.content) copy.content = this.content.cloneNode(true);
+  }
+  if (deep) {
+    for (var i = 0; i < this.childNodes.length; i++) {
+      copy._append(this.childNodes[i].cloneNode(true));
+    }
+  }
+  return copy;
+};
+
+Node.prototype.querySelector = function(selector) {
+  return querySelectorAll(this, selector, true)[0] || null;
+};
+
+Node.prototype.querySelectorAll = function(selector) {
+  return querySelectorAll(this, selector, false);
+};
+
+Node.prototype.getElementsByTagName = function(tag) {
+  return querySelectorAll(this, tag === '*' ? '*' : tag.toLowerCase(), false);
+};
+
+Node.prototype.getElementsByClassName = function(names) {
+  return querySelectorAll(this, names.trim().split(/\s+/).map(function(n) { return '.' + n; }).join(''), false);
+};
+
+function Text(doc, data) {
+  this._init(doc, TEXT_NODE);
+  this.data = data;
+  this.nodeName = '#text';
+}
+Text.prototype = Object.create(Node.prototype);
+
+function Comment(doc, data) {
+  this._init(doc, COMMENT_NODE);
+  this.data = data;
+  this.nodeName = '#comment';
+}
+Comment.prototype = Object.create(Node.prototype);
+
+function DocumentFragment(doc) {
+  this._init(doc, DOCUMENT_FRAGMENT_NODE);
+  this.nodeName = '#document-fragment';
+}
+DocumentFragment.prototype = Object.create(Node.prototype);
+
+// =========================================================
+// ELEMENTS
+// =========================================================
+
+function Element(doc, tag) {
+  this._init(doc, ELEMENT_NODE);
+  this.localName = tag.toLowerCase();
+  this.tagName = this.localName.toUpperCase();
+  this.nodeName = this.tagName;
+  this._attrs = {};
+  this._attrOrder = [];
+  this._style = null;
+  this._handlers = {};
+  if (this.localName === 'template') this.content = new DocumentFragment(doc);
+  if (this.localName === 'canvas') { this.width = 300; this.height = 150; }
+}
+Element.prototype = Object.create(Node.prototype);
+
+Element.prototype.getAttribute = function(name) {
+  name = name.toLowerCase();
+  return Object.prototype.hasOwnProperty.call(this._attrs, name) ? this._attrs[name] : null;
+};
+
+Element.prototype.setAttribute = function(name, value) {
+  name = name.toLowerCase();
+  if (!Object.prototype.hasOwnProperty.call(this._attrs, name)) this._attrOrder.push(name);
+  this._attrs[name] = String(value);
+  if (name === 'style' && this._style) this._style._parse(String(value));
+  this._mutated();
+};
+
+Element.prototype.removeAttribute = function(name) {
+  name = name.toLowerCase();
+  if (!Object.prototype.hasOwnProperty.call(this._attrs, name)) return;
+  delete this._attrs[name];
+  this._attrOrder.splice(this._attrOrder.indexOf(name), 1);
+  if (name === 'style' && this._style) this._style._parse('');
+  this._mutated();
+};
+
+Element.prototype.hasAttribute = function(name) {
+  return Object.prototype.hasOwnProperty.call(this._attrs, name.toLowerCase());
+};
+
+Element.prototype.toggleAttribute = function(name, force) {
+  var has = this.hasAttribute(name);
+  var want = force === undefined ? !has : !!force;
+  if (want && !has) this.setAttribute(name, '');
+  if (!want && has) this.removeAttribute(name);
+  return want;
+};
+
+Element.prototype.getAttributeNames = function() {
+  return this._attrOrder.slice();
+};
+
+Element.prototype._classes = function() {
+  var c = this._attrs['class'];
+  return c ? c.split(/\s+/).filter(Boolean) : [];
+};
+
+Element.prototype.matches = function(selector) {
+  return matchesGroups(this, parseSelector(selector));
+};
+
+Element.prototype.closest = function(selector) {
+  var groups = parseSelector(selector);
+  for (var n = this; n && n.nodeType === ELEMENT_NODE; n = n.parentNode) {
+    if (matchesGroups(n, groups)) return n;
+  }
+  return null;
+};
+
+/** Compiled inline handler for an on* attribute, or null. */
+Element.prototype._inlineHandler = function(type) {
+  var code = this._attrs['on' + type];
+  if (!code) return null;
+  var cached = this._handlers[type];
+  if (cached && cached.code === code) return cached.fn;
+  var fn = this.ownerDocument._compileHandler(code);
+  this._handlers[type] = { code: code, fn: fn };
+  return fn;
+};
+
+Element.prototype.insertAdjacentHTML = function(position, html) {
+  var fragment = this.ownerDocument._parseFragment(html);
+  position = position.toLowerCase();
+  if (position === 'beforebegin') this.parentNode.insertBefore(fragment, this);
+  else if (position === 'afterbegin') this.insertBefore(fragment, this.firstChild);
+  else if (position === 'beforeend') this.appendChild(fragment);
+  else if (position === 'afterend') this.parentNode.insertBefore(fragment, this.nextSibling);
+};
+
+Element.prototype.click = function() {
+  if (this.disabled) return;
+  this.dispatchEvent(new Event('click', { bubbles: true, cancelable: true }));
+};
+
+Element.prototype.focus = function() {
+  var doc = this.ownerDocument;
+  if (doc.activeElement === this) return;
+  doc.activeElement = this;
+  this.dispatchEvent(new Event('focus'));
+  this.dispatchEvent(new Event('focusin', { bubbles: true }));
+};
+
+Element.prototype.blur = function() {
+  var doc = this.ownerDocument;
+  if (doc.activeElement !== this) return;
+  doc.activeElement = doc.body;
+  this.dispatchEvent(new Event('blur'));
+};
+
+Element.prototype.getBoundingClientRect = function() {
+  this.ownerDocument._stats.layoutReads++;
+  return { x: 0, y: 0, top: 0, left: 0, right: CONFIG.VIEWPORT_WIDTH, bottom: CONFIG.VIEWPORT_HEIGHT / 4,
+    width: CONFIG.VIEWPORT_WIDTH, height: CONFIG.VIEWPORT_HEIGHT / 4 };
+};
+
+Element.prototype.scrollIntoView = function() {
+  this.ownerDocument._stats.layoutReads++;
+};
+
+Element.prototype.scrollTo = function(x, y) {
+  if (typeof x === 'object' && x) y = x.top;
+  this._scrollTop = Number(y) || 0;
+  this._mutated();
+};
+
+Element.prototype.getContext = function() {
+  return this.localName === 'canvas' ? this.ownerDocument._canvasContext() : null;
+};
+
+function reflect(prop, attr, kind) {
+  Object.defineProperty(Element.prototype, prop, {
+    get: function() {
+      var v = this.getAttribute(attr);
+      if (kind === 'bool') return v !== null;
+      if (kind === 'int') return v === null ? -1 : parseInt(v, 10);
+      return v === null ? '' : v;
+    },
+    set: function(value) {
+      if (kind === 'bool') {
+        if (value) this.setAttribute(attr, '');
+        else this.removeAttribute(attr);
+      } else {
+        this.setAttribute(attr, value);
+      }
+    }
+  });
+}
+
+reflect('id', 'id');
+reflect('className', 'class');
+reflect('title', 'title');
+reflect('lang', 'lang');
+reflect('dir', 'dir');
+reflect('type', 'type');
+reflect('name', 'name');
+reflect('rel', 'rel');
+reflect('role', 'role');
+reflect('tabIndex', 'tabindex', 'int');
+reflect('disabled', 'disabled', 'bool');
+reflect('hidden', 'hidden', 'bool');
+reflect('draggable', 'draggable');
+
+/* URL attributes resolve against the document */
+['href', 'src'].forEach(function(attr) {
+  Object.defineProperty(Element.prototype, attr, {
+    get: function() {
+      var v = this.getAttribute(attr);
+      if (v === null) return '';
+      try { return new URL(v, this.ownerDocument.URL).href; } catch (e) { return v; }
+    },
+    set: function(value) { this.setAttribute(attr, value); }
+  });
+});
+
+Object.defineProperties(Element.prototype, {
+  classList: { get: function() { return new ClassList(this); } },
+
+  style: { get: function() {
+    if (!this._style) {
+      this._style = createStyle(this);
+      this._style._parse(this._attrs.style || '');
+    }
+    return this._style;
+  } },
+
+  dataset: { get: function() {
+    var el = this;
+    return new Proxy({}, {
+      get: function(t, key) {
+        return typeof key === 'string' ? (el.getAttribute('data-' + toKebab(key)) || undefined) : undefined;
+      },
+      set: function(t, key, value) { el.setAttribute('data-' + toKebab(key), value); return true; },
+      has: function(t, key) { return el.hasAttribute('data-' + toKebab(key)); },
+      deleteProperty: function(t, key) { el.removeAttribute('data-' + toKebab(key)); return true; }
+    });
+  } },
+
+  innerHTML: {
+    get: function() {
+      var target = this.content || this;
+      return target.childNodes.map(serialize).join('');
+    },
+    set: function(html) {
+      var target = this.content || this;
+      target._removeAllChildren();
+      var fragment = this.ownerDocument._parseFragment(String(html));
+      fragment.childNodes.slice().forEach(function(n) { target._append(n); });
+      this._mutated();
+    }
+  },
+
+  outerHTML: { get: function() { return serialize(this); } },
+
+  innerText: {
+    get: function() { return this.textContent; },
+    set: function(value) { this.textContent = value; }
+  },
+
+  value: {
+    get: function() {
+      if (this.localName === 'select') {
+        var opt = this._selectedOption();
+        return opt ? opt.value : '';
+      }
+      if (this.localName === 'option') {
+        var v = this.getAttribute('value');
+        return v !== null ? v : this.textContent.trim();
+      }
+      if (this._value !== undefined) return this._value;
+      return this.localName === 'textarea' ? this.textContent : (this.getAttribute('value') || '');
+    },
+    set: function(value) {
+      value = String(value);
+      if (this.localName === 'select') {
+        this.options.forEach(function(o) { o._selected = o.value === value; });
+      } else {
+        this._value = value;
+      }
+      this._mutated();
+    }
+  },
+
+  checked: {
+    get: function() { return this._checked !== undefined ? this._checked : this.hasAttribute('checked'); },
+    set: function(value) { this._checked = !!value; this._mutated(); }
+  },
+
+  selected: {
+    get: function() { return this._selected !== undefined ? this._selected : this.hasAttribute('selected'); },
+    set: function(value) { this._selected = !!value; this._mutated(); }
+  },
+
+  options: { get: function() { return this.querySelectorAll('option'); } },
+
+  selectedIndex: {
+    get: function() { return this.options.indexOf(this._selectedOption()); },
+    set: function(index) {
+      this.options.forEach(function(o, i) { o._selected = i === index; });
+      this._mutated();
+    }
+  },
+
+  scrollTop: {
+    get: function() { this.ownerDocument._stats.layoutReads++; return this._scrollTop || 0; },
+    set: function(value) { this._scrollTop = Number(value) || 0; this._mutated(); }
+  }
+});
+
+/* Geometry: fixed viewport-sized answers, every read counted */
+['clientWidth', 'offsetWidth', 'scrollWidth'].forEach(function(prop) {
+  Object.defineProperty(Element.prototype, prop, { get: function() {
+    this.ownerDocument._stats.layoutReads++;
+    return CONFIG.VIEWPORT_WIDTH;
+  } });
+});
+['clientHeight', 'offsetHeight', 'scrollHeight'].forEach(function(prop) {
+  Object.defineProperty(Element.prototype, prop, { get: function() {
+    var doc = this.ownerDocument;
+    doc._stats.layoutReads++;
+    var isRoot = this === doc.documentElement || this === doc.body;
+    return isRoot && prop === 'scrollHeight' ? CONFIG.DOCUMENT_HEIGHT : CONFIG.VIEWPORT_HEIGHT;
+  } });
+});
+['offsetTop', 'offsetLeft', 'clientTop', 'clientLeft', 'scrollLeft'].forEach(function(prop) {
+  Object.defineProperty(Element.prototype, prop, { get: function() {
+    this.ownerDocument._stats.layoutReads++;
+    return 0;
+  } });
+});
+
+Element.prototype._selectedOption = function() {
+  var options = this.options;
+  for (var i = 0; i < options.length; i++) if (options[i].selected) return options[i];
+  return options[0] || null;
+};
+
+function toKebab(key) {
+  return String(key).replace(/[A-Z]/g, function(c) { return '-' + c.toLowerCase(); });
+}
+
+function ClassList(el) {
+  this._el = el;
+}
+
+ClassList.prototype._write = function(classes) {
+  this._el.setAttribute('class', classes.join(' '));
+};
+
+ClassList.prototype.add = function() {
+  var classes = this._el._classes();
+  var changed = false;
+  for (var i = 0; i < arguments.length; i++) {
+    if (classes.indexOf(arguments[i]) === -1) { classes.push(arguments[i]); changed = true; }
+  }
+  if (changed) this._write(classes);
+};
+
+ClassList.prototype.remove = function() {
+  var classes = this._el._classes();
+  var remove = Array.prototype.slice.call(arguments);
+  var kept = classes.filter(function(c) { return remove.indexOf(c) === -1; });
+  if (kept.length !== classes.length) this._write(kept);
+};
+
+ClassList.prototype.toggle = function(name, force) {
+  var has = this.contains(name);
+  var want = force === undefined ? !has : !!force;
+  if (want && !has) this.add(name);
+  if (!want && has) this.remove(name);
+  return want;
+};
+
+ClassList.prototype.contains = function(name) {
+  return this._el._classes().indexOf(name) !== -1;
+};
+
+ClassList.prototype.replace = function(a, b) {
+  if (!this.contains(a)) return false;
+  this.remove(a);
+  this.add(b);
+  return true;
+};
+
+Object.defineProperty(ClassList.prototype, 'length', { get: function() { return this._el._classes().length; } });
+ClassList.prototype.item = function(i) { return this._el._classes()[i] || null; };
+ClassList.prototype.toString = function() { return this._el.className; };
+
+/**
+ * Inline style declaration. Property writes update the style attribute
+ * and count as a mutation, like CSSOM does.
+ */
+function createStyle(el) {
+  var props = {};
+
+  function write() {
+    el._attrs.style = Object.keys(props).map(function(k) { return k + ': ' + props[k]; }).join('; ');
+    if (el._attrOrder.indexOf('style') === -1) el._attrOrder.push('style');
+    el._mutated();
+  }
+
+  var api = {
+    _parse: function(text) {
+      props = {};
+      text.split(';').forEach(function(decl) {
+        var colon = decl.indexOf(':');
+        if (colon === -1) return;
+        var name = decl.slice(0, colon).trim().toLowerCase();
+        if (name) props[name] = decl.slice(colon + 1).trim();
+      });
+    },
+    setProperty: function(name, value) {
+      if (value === '' || value == null) delete props[name];
+      else props[name] = String(value);
+      write();
+    },
+    removeProperty: function(name) {
+      var old = props[name] || '';
+      delete props[name];
+      write();
+      return old;
+    },
+    getPropertyValue: function(name) {
+      return props[name] || '';
+    }
+  };
+
+  return new Proxy(api, {
+    get: function(target, key) {
+      if (key in target) return target[key];
+      if (key === 'cssText') return el._attrs.style || '';
+      if (typeof key !== 'string') return undefined;
+      return props[toKebab(key)] || '';
+    },
+    set: function(target, key, value) {
+      if (key === 'cssText') {
+        api._parse(String(value));
+        write();
+      } else {
+        api.setProperty(toKebab(key), value);
+      }
+      return true;
+    }
+  });
+}
+
+// =========================================================
+// HTML PARSER / SERIALIZER
+// =========================================================
+
+function decodeEntities(text) {
+  return text.replace(/&(#x[0-9a-f]+|#\d+|\w+);/gi, function(m, name) {
+    if (name[0] === '#') {
+      return String.fromCodePoint(name[1] === 'x' || name[1] === 'X'
+        ? parseInt(name.slice(2), 16) : parseInt(name.slice(1), 10));
+    }
+    return Object.prototype.hasOwnProperty.call(CONFIG.ENTITIES, name) ? CONFIG.ENTITIES[name] : m;
+  });
+}
+
+function escapeText(text) {
+  return text.replace(/&/g, '&amp;').replace(/</g, '&lt;').replace(/>/g, '&gt;');
+}
+
+function escapeAttr(text) {
+  return text.replace(/&/g, '&amp;').replace(/"/g, '&quot;');
+}
+
+/**
+ * Parse markup into `parent` (tolerant: unknown end tags are ignored and
+ * an end tag closes any unclosed elements opened after its match).
+ */
+function parseInto(doc, parent, html) {
+  var stack = [parent];
+  var re = /<!--([\s\S]*?)-->|<!\w[^>]*>|<\/([\w:-]+)\s*>|<([\w:-]+)((?:\s+[^\s"'>\/=]+(?:\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+))?)*)\s*(\/?)>/g;
+  var attrRe = /([^\s"'>\/=]+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?/g;
+  var last = 0;
+  var m;
+
+  function top() {
+    var node = stack[stack.length - 1];
+    return node.content || node;
+  }
+
+  function text(str) {
+    if (str) top()._append(doc.createTextNode(decodeEntities(str)));
+  }
+
+  while ((m = re.exec(html))) {
+    text(html.slice(last, m.index));
+    last = re.lastIndex;
+
+    if (m[1] !== undefined) {
+      top()._append(doc.createComment(m[1]));
+    } else if (m[2]) {
+      var name = m[2].toLowerCase();
+      for (var i = stack.length - 1; i > 0; i--) {
+        if (stack[i].localName === name) {
+          stack.length = i;
+          break;
+        }
+      }
+    } else if (m[3]) {
+      var el = doc.createElement(m[3]);
+      var am;
+      attrRe.lastIndex = 0;
+      while ((am = attrRe.exec(m[4]))) {
+        var value = am[2] !== undefined ? am[2] : (am[3] !== undefined ? am[3] : (am[4] || ''));
+        var attr = am[1].toLowerCase();
+        if (!Object.prototype.hasOwnProperty.call(el._attrs, attr)) el._attrOrder.push(attr);
+        el._attrs[attr] = decodeEntities(value);
+      }
+      top()._append(el);
+
+      if (CONFIG.RAW_TEXT_TAGS.indexOf(el.localName) !== -1) {
+        var close = new RegExp('</' + el.localName + '\\s*>', 'ig');
+        close.lastIndex = last;
+        var end = close.exec(html);
+        var raw = html.slice(last, end ? end.index : html.length);
+        if (raw) el._append(doc.createTextNode(el.localName === 'textarea' || el.localName === 'title' ? decodeEntities(raw) : raw));
+        last = end ? close.lastIndex : html.length;
+        re.lastIndex = last;
+      } else if (!m[5] && CONFIG.VOID_TAGS.indexOf(el.localName) === -1) {
+        stack.push(el);
+      }
+    }
+  }
+  text(html.slice(last));
+}
+
+function serialize(node) {
+  if (node.nodeType === TEXT_NODE) {
+    var p = node.parentNode;
+    return p && CONFIG.RAW_TEXT_TAGS.indexOf(p.localName) !== -1 && p.localName !== 'textarea'
+      ? node.data : escapeText(node.data);
+  }
+  if (node.nodeType === COMMENT_NODE) return '<!--' + node.data + '-->';
+  if (node.nodeType === DOCUMENT_FRAGMENT_NODE) return node.childNodes.map(serialize).join('');
+
+  var html = '<' + node.localName;
+  node._attrOrder.forEach(function(name) {
+    html += ' ' + name + '="' + escapeAttr(node._attrs[name]) + '"';
+  });
+  html += '>';
+  if (CONFIG.VOID_TAGS.indexOf(node.localName) !== -1) return html;
+  return html + (node.content || node).childNodes.map(serialize).join('') + '</' + node.localName + '>';
+}
+
+// =========================================================
+// DOCUMENT
+// =========================================================
+
+function Document(url, stats) {
+  this._init(null, DOCUMENT_NODE);
+  this.ownerDocument = null;
+  this.nodeName = '#document';
+  this.URL = url;
+  this.readyState = 'loading';
+  this.visibilityState = 'visible';
+  this.hidden = false;
+  this.title = '';
+  this.cookie = '';
+  this.activeElement = null;
+  this.defaultView = null;
+  this._stats = stats;
+  this._compileHandler = null;
+  this._reportError = null;
+}
+Document.prototype = Object.create(Node.prototype);
+
+Document.prototype._mutated = function() {
+  this._stats.mutations++;
+};
+
+Document.prototype.createElement = function(tag) {
+  return new Element(this, tag);
+};
+Document.prototype.createElementNS = function(ns, tag) {
+  return new Element(this, tag);
+};
+Document.prototype.createTextNode = function(data) {
+  return new Text(this, String(data));
+};
+Document.prototype.createComment = function(data) {
+  return new Comment(this, String(data));
+};
+Document.prototype.createDocumentFragment = function() {
+  return new DocumentFragment(this);
+};
+Document.prototype.importNode = function(node, deep) {
+  return node.cloneNode(deep);
+};
+Document.prototype.getElementById = function(id) {
+  return this.querySelector('#' + id.replace(/([^-\w\u00a0-\uffff])/g, '\\$1'));
+};
+Document.prototype.hasFocus = function() {
+  return this.visibilityState === 'visible';
+};
+Document.prototype.execCommand = function() {
+  return false;
+};
+
+Document.prototype._parseFragment = function(html) {
+  var fragment = this.createDocumentFragment();
+  parseInto(this, fragment, html);
+  return fragment;
+};
+
+Object.defineProperties(Document.prototype, {
+  documentElement: { get: function() { return this.querySelector('html'); } },
+  head: { get: function() { return this.querySelector('head'); } },
+  body: { get: function() { return this.querySelector('body'); } },
+  scrollingElement: { get: function() { return this.documentElement; } }
+});
+
+/** Minimal 2D context: records draw calls, draws nothing. */
+Document.prototype._canvasContext = function() {
+  var stats = this._stats;
+  var noop = function() { stats.drawCalls++; };
+  var ctx = { canvas: null, globalAlpha: 1, fillStyle: '#000', strokeStyle: '#000', lineWidth: 1, font: '' };
+  ['save', 'restore', 'translate', 'rotate', 'scale', 'setTransform', 'resetTransform', 'transform',
+    'clearRect', 'fillRect', 'strokeRect', 'beginPath', 'closePath', 'moveTo', 'lineTo', 'arc',
+    'fill', 'stroke', 'fillText', 'drawImage'].forEach(function(name) { ctx[name] = noop; });
+  ctx.measureText = function(t) { return { width: String(t).length * 8 }; };
+  return ctx;
+};
+
+// =========================================================
+// WINDOW
+// =========================================================
+
+function Storage() {
+  this._data = {};
+}
+Storage.prototype.getItem = function(k) {
+  return Object.prototype.hasOwnProperty.call(this._data, k) ? this._data[k] : null;
+};
+Storage.prototype.setItem = function(k, v) { this._data[k] = String(v); };
+Storage.prototype.removeItem = function(k) { delete this._data[k]; };
+Storage.prototype.clear = function() { this._data = {}; };
+
+/** Deterministic Math.random replacement (mulberry32). */
+function seededRandom(seed) {
+  var a = seed >>> 0;
+  return function() {
+    a = (a + 0x6D2B79F5) >>> 0;
+    var t = a;
+    t = Math.imul(t ^ (t >>> 15), t | 1);
+    t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+    return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+  };
+}
+
+/**
+ * Build a window for a page and parse its markup.
+ *
+ * @param {object} options
+ * @param {string} options.html - Page markup
+ * @param {string} options.url - Page URL (file:// is fine)
+ * @param {EventLoop} options.loop
+ * @param {number} [options.seed=1] - Seed for Math.random
+ * @param {function(Error)} [options.onError]
+ * @param {object} [options.console] - Console for page scripts
+ * @returns {{window: object, document: Document, context: object, stats: object}}
+ */
+function createWindow(options) {
+  var loop = options.loop;
+  var stats = { mutations: 0, layoutReads: 0, styleReads: 0, drawCalls: 0, errors: [] };
+  var doc = new Document(options.url, stats);
+  var win = Object.create(EventTarget.prototype);
+  var baseDate = Date.UTC(2026, 0, 5, 8, 0, 0);
+
+  function reportError(e) {
+    if (options.onError) options.onError(e);
+    else stats.errors.push(e && e.stack ? e.stack.split('\n').slice(0, 2).join(' | ') : String(e));
+  }
+
+  doc.defaultView = win;
+  doc._reportError = reportError;
+  parseInto(doc, doc, options.html);
+  if (!doc.documentElement) doc._append(doc.createElement('html'));
+  doc.activeElement = doc.body;
+  doc.title = doc.querySelector('title') ? doc.querySelector('title').textContent : '';
+
+  var url = new URL(options.url);
+  var scrollY = 0;
+
+  Object.assign(win, {
+    document: doc,
+    console: options.console || console,
+    location: { href: url.href, pathname: url.pathname, protocol: url.protocol, host: url.host,
+      hostname: url.hostname, origin: url.origin, search: url.search, hash: url.hash,
+      reload: function() {}, assign: function() {}, replace: function() {} },
+    navigator: { userAgent: 'Mozilla/5.0 (X11; CrOS x86_64) SCO-Benchmark', language: 'ar',
+      languages: ['ar', 'en'], onLine: true, hardwareConcurrency: 4, maxTouchPoints: 0,
+      sendBeacon: function() { return true; } },
+    screen: { width: CONFIG.VIEWPORT_WIDTH, height: CONFIG.VIEWPORT_HEIGHT,
+      availWidth: CONFIG.VIEWPORT_WIDTH, availHeight: CONFIG.VIEWPORT_HEIGHT },
+    innerWidth: CONFIG.VIEWPORT_WIDTH,
+    innerHeight: CONFIG.VIEWPORT_HEIGHT,
+    devicePixelRatio: 1,
+    localStorage: new Storage(),
+    sessionStorage: new Storage(),
+    Event: Event,
+    CustomEvent: Event,
+    KeyboardEvent: Event,
+    MouseEvent: Event,
+    FocusEvent: Event,
+    Node: Node,
+    Element: Element,
+    HTMLElement: Element,
+    DocumentFragment: DocumentFragment,
+    DataTransfer: DataTransfer,
+    setTimeout: function(fn, ms) {
+      var args = Array.prototype.slice.call(arguments, 2);
+      return loop.setTimeout(function() { fn.apply(null, args); }, ms, false);
+    },
+    setInterval: function(fn, ms) {
+      var args = Array.prototype.slice.call(arguments, 2);
+      return loop.setTimeout(function() { fn.apply(null, args); }, ms, true);
+    },
+    clearTimeout: function(id) { loop.clearTimeout(id); },
+    clearInterval: function(id) { loop.clearTimeout(id); },
+    requestAnimationFrame: function(fn) { return loop.requestAnimationFrame(fn); },
+    cancelAnimationFrame: function(id) { loop.cancelAnimationFrame(id); },
+    requestIdleCallback: function(fn) { return loop.requestIdleCallback(fn); },
+    cancelIdleCallback: function(id) { loop.clearTimeout(id); },
+    queueMicrotask: function(fn) { loop.setTimeout(fn, 0); },
+    btoa: function(text) { return Buffer.from(String(text), 'latin1').toString('base64'); },
+    atob: function(text) { return Buffer.from(String(text), 'base64').toString('latin1'); },
+    URL: URL,
+    matchMedia: function(query) {
+      return { matches: false, media: query, addListener: function() {}, removeListener: function() {},
+        addEventListener: function() {}, removeEventListener: function() {} };
+    },
+    getComputedStyle: function(el) {
+      stats.styleReads++;
+      var style = el && el.style;
+      return {
+        getPropertyValue: function(name) { return style ? style.getPropertyValue(name) : ''; },
+        display: style && style.display || 'block'
+      };
+    },
+    scrollTo: function(x, y) {
+      if (typeof x === 'object' && x) y = x.top;
+      scrollY = Math.max(0, Math.min(Number(y) || 0, CONFIG.DOCUMENT_HEIGHT - CONFIG.VIEWPORT_HEIGHT));
+    },
+    scrollBy: function(x, y) {
+      win.scrollTo(0, scrollY + (Number(y) || 0));
+    },
+    alert: function() {},
+    confirm: function() { return true; },
+    prompt: function() { return null; },
+    focus: function() {},
+    blur: function() {},
+    print: function() {},
+    close: function() {},
+    opener: null,
+    performance: {
+      now: function() { return loop.now; },
+      timeOrigin: baseDate,
+      mark: function() {},
+      measure: function() {},
+      getEntriesByType: function() { return []; },
+      getEntriesByName: function() { return []; }
+    }
+  });
+
+  Object.defineProperty(win, 'scrollY', { get: function() { stats.layoutReads++; return scrollY; } });
+  Object.defineProperty(win, 'pageYOffset', { get: function() { stats.layoutReads++; return scrollY; } });
+  Object.defineProperty(win, 'scrollX', { get: function() { return 0; } });
+  Object.defineProperty(win, 'pageXOffset', { get: function() { return 0; } });
+
+  win.window = win;
+  win.self = win;
+  win.top = win;
+  win.parent = win;
+  win.frames = win;
+
+  var context = vm.createContext(win);
+
+  /* Virtual Date and seeded Math.random inside the page realm */
+  vm.runInContext(
+    '(function(now, random) {' +
+    '  var RealDate = Date;' +
+    '  function VDate(a, b, c, d, e, f, g) {' +
+    '    if (!(this instanceof VDate)) return new RealDate(now()).toString();' +
+    '    var n = arguments.length;' +
+    '    return n === 0 ? new RealDate(now()) : n === 1 ? new RealDate(a) : new RealDate(a, b, c === undefined ? 1 : c, d || 0, e || 0, f || 0, g || 0);' +
+    '  }' +
+    '  VDate.prototype = RealDate.prototype;' +
+    '  VDate.now = now;' +
+    '  VDate.UTC = RealDate.UTC;' +
+    '  VDate.parse = RealDate.parse;' +
+    '  Date = VDate;' +
+    '  Math.random = random;' +
+    '})',
+    context
+  )(function() { return baseDate + Math.floor(loop.now); }, seededRandom(options.seed || 1));
+
+  doc._compileHandler = function(code) {
+    return vm.compileFunction(code, ['event'], { parsingContext: context });
+  };
+
+  return { window: win, document: doc, context: context, stats: stats };
+}
+
+module.exports = {
+  CONFIG: CONFIG,
+  EventLoop: EventLoop,
+  Event: Event,
+  DataTransfer: DataTransfer,
+  createWindow: createWindow,
+  parseSelector: parseSelector
+};
@@ -0,0 +1,212 @@
+/**
+ * Stand-in SCORM 1.2 LMS for the benchmark harness
+ * ====================================================================
+ * Implements window.API (LMSInitialize ... LMSGetDiagnostic), records
+ * every call, and charges each call a simulated latency so the report can
+ * show how long a SCO would block the main thread on a real LMS whose
+ * adapter talks to the server synchronously.
+ *
+ * Like a real LMS, only committed values survive a relaunch: reload()
+ * starts a new attempt session from the last LMSCommit/LMSFinish.
+ */
+
+'use strict';
+
+// =========================================================
+// CONFIGURATION
+// =========================================================
+
+var CONFIG = {
+  // Simulated per-call latency in ms (sync XHR adapters make commits slow)
+  LATENCY: { get: 1, set: 2, commit: 80, other: 0 },
+
+  SUSPEND_DATA_LIMIT: 4096,
+
+  // Error codes (SCORM 1.2 run-time environment)
+  ERRORS: {
+    '0': 'No error',
+    '201': 'Invalid argument error',
+    '301': 'Not initialized',
+    '401': 'Not implemented error',
+    '403': 'Element is read only',
+    '405': 'Incorrect data type'
+  },
+
+  READ_ONLY: ['cmi.core.student_id', 'cmi.core.student_name', 'cmi.core.credit', 'cmi.core.entry',
+    'cmi.core.total_time', 'cmi.core.lesson_mode', 'cmi.launch_data', 'cmi.interactions._count',
+    'cmi.objectives._count']
+};
+
+/**
+ * @param {object} [options]
+ * @param {object} [options.latency] - Overrides for CONFIG.LATENCY
+ */
+function MockLMS(options) {
+  options = options || {};
+  this.latency = Object.assign({}, CONFIG.LATENCY, options.latency);
+  this._committed = {
+    'cmi.core.student_id': 'bench-001',
+    'cmi.core.student_name': 'Learner, Benchmark',
+    'cmi.core.lesson_status': 'not attempted',
+    'cmi.core.lesson_location': '',
+    'cmi.core.credit': 'credit',
+    'cmi.core.lesson_mode': 'normal',
+    'cmi.core.total_time': '0000:00:00.00',
+    'cmi.core.score.raw': '',
+    'cmi.core.score.min': '',
+    'cmi.core.score.max': '',
+    'cmi.suspend_data': '',
+    'cmi.launch_data': ''
+  };
+  this.attempts = 0;
+  this.reload();
+}
+
+/**
+ * Start a new launch from the committed state, with fresh call counters.
+ */
+MockLMS.prototype.reload = function() {
+  this._data = Object.assign({}, this._committed);
+  var resuming = !!(this._data['cmi.suspend_data'] || this._data['cmi.core.lesson_location']);
+  this._data['cmi.core.entry'] = resuming ? 'resume' : 'ab-initio';
+  this._initialized = false;
+  this._lastError = '0';
+  this.attempts++;
+  this.log = {
+    calls: {},
+    sets: {},
+    setBytes: 0,
+    maxSuspendData: 0,
+    rejected: 0,
+    blockedMs: 0
+  };
+  this.api = this._createApi();
+};
+
+MockLMS.prototype._createApi = function() {
+  var self = this;
+
+  function call(method, kind, fn) {
+    return function() {
+      self.log.calls[method] = (self.log.calls[method] || 0) + 1;
+      self.log.blockedMs += self.latency[kind] || 0;
+      return fn.apply(self, arguments);
+    };
+  }
+
+  return {
+    LMSInitialize: call('LMSInitialize', 'other', this._initialize),
+    LMSFinish: call('LMSFinish', 'commit', this._finish),
+    LMSGetValue: call('LMSGetValue', 'get', this._getValue),
+    LMSSetValue: call('LMSSetValue', 'set', this._setValue),
+    LMSCommit: call('LMSCommit', 'commit', this._commit),
+    LMSGetLastError: call('LMSGetLastError', 'other', function() { return this._lastError; }),
+    LMSGetErrorString: call('LMSGetErrorString', 'other', function(code) {
+      return CONFIG.ERRORS[code] || '';
+    }),
+    LMSGetDiagnostic: call('LMSGetDiagnostic', 'other', function(code) {
+      return CONFIG.ERRORS[code || this._lastError] || '';
+    })
+  };
+};
+
+MockLMS.prototype._fail = function(code) {
+  this._lastError = code;
+  return code === '0' ? 'true' : 'false';
+};
+
+MockLMS.prototype._initialize = function() {
+  if (this._initialized) return this._fail('101');
+  this._initialized = true;
+  return this._fail('0');
+};
+
+MockLMS.prototype._finish = function() {
+  if (!this._initialized) return this._fail('301');
+  this._commit();
+  this._initialized = false;
+  return this._fail('0');
+};
+
+MockLMS.prototype._getValue = function(element) {
+  if (!this._initialized) {
+    this._fail('301');
+    return '';
+  }
+  this._lastError = '0';
+
+  var count = /^cmi\.(interactions|objectives)\._count$/.exec(element);
+  if (count) return String(this._count(count[1]));
+
+  if (Object.prototype.hasOwnProperty.call(this._data, element)) return this._data[element];
+  this._fail('401');
+  return '';
+};
+
+MockLMS.prototype._setValue = function(element, value) {
+  if (!this._initialized) return this._fail('301');
+  if (CONFIG.READ_ONLY.indexOf(element) !== -1) return this._fail('403');
+  if (!/^cmi\./.test(element)) return this._fail('201');
+
+  value = String(value);
+  if (element === 'cmi.suspend_data' && value.length > CONFIG.SUSPEND_DATA_LIMIT) {
+    this.log.rejected++;
+    return this._fail('405');
+  }
+
+  var group = element.replace(/\.\d+\./g, '.n.');
+  this.log.sets[group] = (this.log.sets[group] || 0) + 1;
+  this.log.setBytes += value.length;
+  this._data[element] = value;
+  if (element === 'cmi.suspend_data') {
+    this.log.maxSuspendData = Math.max(this.log.maxSuspendData, value.length);
+  }
+  return this._fail('0');
+};
+
+MockLMS.prototype._commit = function() {
+  if (!this._initialized) return this._fail('301');
+  this._committed = Object.assign({}, this._data);
+  return this._fail('0');
+};
+
+MockLMS.prototype._count = function(collection) {
+  var max = -1;
+  var re = new RegExp('^cmi\\.' + collection + '\\.(\\d+)\\.');
+  Object.keys(this._data).forEach(function(key) {
+    var m = re.exec(key);
+    if (m) max = Math.max(max, parseInt(m[1], 10));
+  });
+  return max + 1;
+};
+
+/**
+ * Summary of this launch's traffic.
+ * @returns {object}
+ */
+MockLMS.prototype.summary = function() {
+  var calls = this.log.calls;
+  return {
+    calls: Object.keys(calls).reduce(function(n, k) { return n + calls[k]; }, 0),
+    gets: calls.LMSGetValue || 0,
+    sets: calls.LMSSetValue || 0,
+    commits: (calls.LMSCommit || 0) + (calls.LMSFinish || 0),
+    setBytes: this.log.setBytes,
+    blockedMs: this.log.blockedMs,
+    suspendData: (this._committed['cmi.suspend_data'] || '').length,
+    maxSuspendData: this.log.maxSuspendData,
+    rejected: this.log.rejected,
+    interactions: this._count('interactions'),
+    setsByElement: Object.assign({}, this.log.sets)
+  };
+};
+
+/** Committed value of a data model element. */
+MockLMS.prototype.committed = function(element) {
+  return this._committed[element];
+};
+
+module.exports = {
+  CONFIG: CONFIG,
+  MockLMS: MockLMS
+};
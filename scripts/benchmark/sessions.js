@@ -0,0 +1,73 @@
+/**
+ * Scripted learner sessions replayed by scripts/benchmark.js
+ * ====================================================================
+ * Each session is a list of steps run against every SCO:
+ *
+ *   { walk: { to, dwell, scroll, interact } }
+ *       Move forward slide by slide until slide `to` (a fraction of the
+ *       SCO, 1 = the last slide). On each slide: scroll `scroll` times,
+ *       interact, dwell `dwell` ms, then press Next.
+ *       interact: 'first' clicks each control once in page order;
+ *                 'retry' tries every quiz option followed by its check
+ *                 button before moving on; false skips interaction.
+ *   { back: n }        Press Previous n times (revisits).
+ *   { idle: ms }       No input for ms (idle detection, auto-save timers).
+ *   { away: ms }       Tab hidden for ms, then visible again.
+ *   { unload: true }   visibilitychange(hidden) + pagehide + beforeunload.
+ *   { relaunch: true } Open the SCO again from the LMS's committed state.
+ *   { states: { objects, clicks, delegate, batch } }
+ *       Add a button set of `objects` options to the current slide, managed
+ *       by a StateManager with the given options, then hover, press and
+ *       select `clicks` of them.
+ */
+
+'use strict';
+
+module.exports = {
+  linear: {
+    description: 'Read every slide once: scroll, answer, move on',
+    steps: [
+      { walk: { to: 1, dwell: 6000, scroll: 12, interact: 'first' } },
+      { unload: true }
+    ]
+  },
+
+  'quiz-retry': {
+    description: 'Try every quiz option before the right one, revisit earlier slides',
+    steps: [
+      { walk: { to: 1, dwell: 4000, scroll: 4, interact: 'retry' } },
+      { back: 2 },
+      { walk: { to: 1, dwell: 2000, scroll: 0, interact: false } },
+      { unload: true }
+    ]
+  },
+
+  'idle-resume': {
+    description: 'Stop half way, go idle and switch tabs, leave, relaunch and finish',
+    steps: [
+      { walk: { to: 0.5, dwell: 8000, scroll: 20, interact: 'first' } },
+      { idle: 90000 },
+      { away: 30000 },
+      { unload: true },
+      { relaunch: true },
+      { walk: { to: 1, dwell: 6000, scroll: 8, interact: 'first' } },
+      { unload: true }
+    ]
+  },
+
+  'states-per-element': {
+    description: 'Pick options of a 200-object button set, listeners on every object',
+    steps: [
+      { states: { objects: 200, clicks: 5, delegate: false, batch: false } },
+      { unload: true }
+    ]
+  },
+
+  'states-delegated': {
+    description: 'Same button set with delegated listeners and frame-batched writes',
+    steps: [
+      { states: { objects: 200, clicks: 5, delegate: true, batch: true } },
+      { unload: true }
+    ]
+  }
+};
@@ -0,0 +1,1144 @@
+#!/usr/bin/env node
+/**
+ * Cohort Analytics — offline batch analysis of BehaviorTracker data
+ * ====================================================================
+ * Streams an LMS export of cmi.suspend_data and cmi.interactions rows,
+ * decodes the compact BehaviorTracker schema (plus the GamificationEngine
+ * "g" and AchievementSystem "ach" sections) and reports cohort metrics:
+ *
+ *   1. Attention — attention ratio distribution, focused vs session time
+ *   2. Pages     — dwell-time distribution per page (t.p), scroll depth
+ *   3. Items     — difficulty (share correct), time to first click and
+ *                  deliberation from a.q; LMS-side result and latency
+ *                  from cmi.interactions
+ *   4. Options   — option-position bias (a.op) against the answer keys
+ *   5. Bloom     — accuracy and share of learners at mastery per level
+ *   6. Gamification / achievements
+ *
+ * suspend_data is decoded with the course's own SuspendStore codec, so
+ * both "~" binary frames and legacy JSON values are read exactly as the
+ * SCOs read them. Only BehaviorTracker schema version CONFIG.SCHEMA_VERSION
+ * is analysed; other versions are counted and skipped.
+ *
+ * Memory stays bounded whatever the export size: input is read line by
+ * line, decoded records are written into fixed-size typed-array batches,
+ * and each full batch is folded into fixed-size accumulators (histograms,
+ * sums) before being reused. Distinct pages and items are capped; the
+ * excess is pooled under "(other)".
+ *
+ * Input (optionally gzipped, "-" reads stdin):
+ *   - CSV, one data model element per row, as exported from LMS tracking
+ *     tables. Header must name the learner, SCO, element and value columns
+ *     (e.g. userid,scoid,element,value). A CSV with a suspend_data column
+ *     instead of element/value is read as one record per row.
+ *   - JSON Lines, one learner attempt per line:
+ *       {"learner": "...", "sco": "...", "suspend_data": "...",
+ *        "interactions": [{"id", "result", "student_response", "latency"}]}
+ *     Flattened "cmi.*" keys are accepted in place of the last two.
+ *   Records must not contain raw line breaks. Interaction rows are joined
+ *   per learner and SCO while at most CONFIG.MAX_PENDING attempts are
+ *   open, so exports sorted by learner are joined exactly.
+ *
+ * Usage:
+ *   node scripts/cohort-analytics.js export.csv.gz [--course output/njr01-u03]
+ *                                   [--json report.json] [--top 20]
+ */
+
+'use strict';
+
+var fs = require('fs');
+var path = require('path');
+var readline = require('readline');
+var vm = require('vm');
+var zlib = require('zlib');
+
+// =========================================================
+// CONFIGURATION
+// =========================================================
+
+var CONFIG = {
+  // Course whose shared/suspend-store.js decodes suspend_data
+  DEFAULT_COURSE: path.join(__dirname, '..', 'output', 'njr01-u03'),
+
+  // BehaviorTracker compact schema version this tool understands
+  SCHEMA_VERSION: 2,
+
+  // Records per columnar batch (page/question rows get a multiple of this)
+  BATCH_SIZE: 4096,
+  PAGE_ROWS_PER_RECORD: 16,
+  QUESTION_ROWS_PER_RECORD: 8,
+
+  // Distinct keys tracked individually; the rest share an "(other)" slot
+  MAX_PAGES: 1024,
+  MAX_ITEMS: 2048,
+  MAX_ACHIEVEMENTS: 256,
+
+  // Learner attempts whose cmi.interactions rows may be open at once
+  MAX_PENDING: 1024,
+
+  // Histogram bin upper edges (last bin is open-ended)
+  DWELL_EDGES_SEC: [1, 2, 5, 10, 15, 20, 30, 45, 60, 90, 120, 180, 300, 600, 1200, 1800, 3600],
+  RESPONSE_EDGES_MS: [250, 500, 1000, 2000, 3000, 5000, 8000, 13000, 20000, 30000, 60000, 120000, 300000],
+  POINTS_EDGES: [0, 10, 25, 50, 100, 150, 200, 300, 400, 500, 750, 1000, 1500, 2000],
+  ATTENTION_BINS: 20,
+
+  OPTION_POSITIONS: 4,
+  BLOOM_LEVELS: ['remember', 'understand', 'apply', 'analyze', 'evaluate', 'create'],
+
+  // Share correct (per learner, per level) that counts as mastery
+  MASTERY_THRESHOLD: 0.8,
+
+  // Learners answering at least this many questions are checked for
+  // always picking the same position
+  POSITION_LOCK_MIN_ANSWERS: 4,
+  POSITION_LOCK_SHARE: 0.75,
+
+  // Chi-square critical value, df = 3, alpha = 0.05
+  CHI_SQUARE_CRITICAL: 7.815,
+
+  // Header aliases for LMS CSV exports
+  COLUMNS: {
+    learner: ['learner_id', 'learner', 'userid', 'user_id', 'student_id', 'cmi.core.student_id'],
+    sco: ['sco_id', 'sco', 'scoid', 'sco_identifier', 'identifier'],
+    element: ['element', 'name', 'key'],
+    value: ['value'],
+    suspendData: ['suspend_data', 'cmi.suspend_data']
+  }
+};
+
+var PAGE_STRIDE = 6;       // records, views, totalSec, focusedSec, scrollDepth, reversals
+var ITEM_STRIDE = 8;       // n, correct, hints, firstClickMs, deliberationMs, lmsN, lmsCorrect, lmsLatencyMs
+var OTHER = '(other)';
+
+// =========================================================
+// SUSPEND DATA DECODING
+// =========================================================
+
+/**
+ * Load SuspendStore.codec from a course folder without a browser.
+ * @param {string} courseDir
+ * @returns {object} codec
+ */
+function loadCodec(courseDir) {
+  var file = path.join(courseDir, 'shared', 'suspend-store.js');
+  var sandbox = {
+    btoa: function(s) { return Buffer.from(s, 'binary').toString('base64'); },
+    atob: function(s) { return Buffer.from(s, 'base64').toString('binary'); }
+  };
+  vm.runInNewContext(fs.readFileSync(file, 'utf8'), sandbox, { filename: file });
+  if (!sandbox.SuspendStore || !sandbox.SuspendStore.codec) {
+    throw new Error('No SuspendStore codec in ' + file);
+  }
+  return sandbox.SuspendStore.codec;
+}
+
+/**
+ * Decode one cmi.suspend_data value into namespace -> value
+ * ({ bt, g, ach, nav }), whichever format wrote it.
+ */
+function decodeSuspendData(codec, str) {
+  if (!str) return {};
+  return str.charAt(0) === '~' ? codec.decodeFrame(str) : codec.decodeLegacy(str);
+}
+
+/** SCORM latency ("HH:MM:SS.ss" in 1.2, "PT#H#M#S" in 2004) -> ms. */
+function parseLatency(str) {
+  if (!str) return -1;
+  var m = /^(\d+):(\d{2}):(\d{2}(?:\.\d+)?)$/.exec(str);
+  if (m) return Math.round(((+m[1]) * 3600 + (+m[2]) * 60 + parseFloat(m[3])) * 1000);
+  m = /^P(?:\d+D)?T?(?:(\d+)H)?(?:(\d+)M)?(?:(\d+(?:\.\d+)?)S)?$/.exec(str);
+  if (m) return Math.round(((+m[1] || 0) * 3600 + (+m[2] || 0) * 60 + (parseFloat(m[3]) || 0)) * 1000);
+  return -1;
+}
+
+/** cmi.interactions.n.result -> 1 correct, 0 incorrect, -1 not scored. */
+function parseResult(str) {
+  if (str === 'correct') return 1;
+  if (str === 'wrong' || str === 'incorrect') return 0;
+  return -1;
+}
+
+// =========================================================
+// KEY DICTIONARY
+// =========================================================
+
+/**
+ * Maps string keys to dense indices up to a fixed capacity. The last
+ * slot is shared by every key seen after the dictionary filled up.
+ */
+function Dictionary(capacity) {
+  this.capacity = capacity;
+  this.keys = [];
+  this._index = new Map();
+  this.overflow = 0;
+}
+
+Dictionary.prototype.indexOf = function(key) {
+  var index = this._index.get(key);
+  if (index !== undefined) return index;
+  if (this.keys.length < this.capacity - 1) {
+    index = this.keys.length;
+    this.keys.push(key);
+    this._index.set(key, index);
+    return index;
+  }
+  if (this.keys.length === this.capacity - 1) this.keys.push(OTHER);
+  this.overflow++;
+  return this.capacity - 1;
+};
+
+// =========================================================
+// COLUMNAR BATCH
+// =========================================================
+
+/**
+ * Fixed-size typed-array columns for decoded records. One row per
+ * learner attempt, plus child tables for pages, questions and
+ * cmi.interactions rows that point back at their record.
+ */
+function Batch(size) {
+  var pageRows = size * CONFIG.PAGE_ROWS_PER_RECORD;
+  var questionRows = size * CONFIG.QUESTION_ROWS_PER_RECORD;
+
+  this.size = size;
+  this.records = 0;
+  this.rec = {
+    sessionSec: new Int32Array(size),
+    focusedSec: new Int32Array(size),
+    attention: new Int16Array(size),      // e.ar, percent
+    blurs: new Int32Array(size),
+    linear: new Int16Array(size),         // n.lr, percent
+    backNavs: new Int32Array(size),
+    hasGame: new Uint8Array(size),
+    points: new Int32Array(size),
+    longestStreak: new Int32Array(size),
+    gameCorrect: new Int32Array(size),
+    gameAnswers: new Int32Array(size),
+    blooms: new Int32Array(size * 12),
+    options: new Int32Array(size * CONFIG.OPTION_POSITIONS)
+  };
+
+  this.pages = 0;
+  this.page = {
+    id: new Int32Array(pageRows),
+    views: new Int32Array(pageRows),
+    totalSec: new Int32Array(pageRows),
+    focusedSec: new Int32Array(pageRows),
+    scrollDepth: new Int16Array(pageRows),
+    reversals: new Int32Array(pageRows)
+  };
+
+  this.questions = 0;
+  this.question = {
+    item: new Int32Array(questionRows),
+    firstClickMs: new Int32Array(questionRows),
+    deliberationMs: new Int32Array(questionRows),
+    selected: new Int8Array(questionRows),
+    key: new Int8Array(questionRows),
+    correct: new Int8Array(questionRows),
+    hints: new Int32Array(questionRows)
+  };
+
+  this.interactions = 0;
+  this.interaction = {
+    item: new Int32Array(questionRows),
+    result: new Int8Array(questionRows),
+    latencyMs: new Int32Array(questionRows)
+  };
+}
+
+Batch.prototype.full = function() {
+  return this.records === this.size || this.interactions === this.interaction.item.length;
+};
+
+/** Whether one more record with this many pages and questions fits. */
+Batch.prototype.fits = function(pages, questions) {
+  return this.records < this.size &&
+    this.pages + pages <= this.page.id.length &&
+    this.questions + questions <= this.question.item.length;
+};
+
+Batch.prototype.reset = function() {
+  this.records = 0;
+  this.pages = 0;
+  this.questions = 0;
+  this.interactions = 0;
+};
+
+function int(value) {
+  return typeof value === 'number' && isFinite(value) ? Math.round(value) : 0;
+}
+
+/** Option index as stored in a.q, or -1 when not a position 0..3. */
+function position(value) {
+  return typeof value === 'number' && value >= 0 && value < CONFIG.OPTION_POSITIONS ? value : -1;
+}
+
+// =========================================================
+// COHORT
+// =========================================================
+
+/**
+ * Streaming aggregator. Feed it rows with addRow()/addRecord(), then
+ * call finish() for the report.
+ * @param {object} codec - SuspendStore.codec
+ * @param {object} [options] - { batchSize }
+ */
+function Cohort(codec, options) {
+  options = options || {};
+  this.codec = codec;
+  this.batch = new Batch(options.batchSize || CONFIG.BATCH_SIZE);
+
+  this.pageKeys = new Dictionary(CONFIG.MAX_PAGES);
+  this.itemKeys = new Dictionary(CONFIG.MAX_ITEMS);
+  this.achievementKeys = new Dictionary(CONFIG.MAX_ACHIEVEMENTS);
+
+  // Open cmi.interactions rows: "learner\u0000sco" -> { index -> fields }
+  this._pending = new Map();
+  // Recently evicted attempts, to count those whose rows arrive split
+  this._evicted = new Set();
+
+  var dwellBins = CONFIG.DWELL_EDGES_SEC.length + 1;
+  var responseBins = CONFIG.RESPONSE_EDGES_MS.length + 1;
+  var positions = CONFIG.OPTION_POSITIONS;
+
+  this.input = {
+    rows: 0,
+    suspendData: 0,
+    interactionRows: 0,
+    empty: 0,
+    decodeErrors: 0,
+    noBehaviorData: 0,
+    versions: {},
+    frames: { binary: 0, legacy: 0 },
+    splitAttempts: 0
+  };
+
+  this.acc = {
+    records: 0,
+    sessionSec: 0,
+    focusedSec: 0,
+    attentionSum: 0,
+    attentionHist: new Float64Array(CONFIG.ATTENTION_BINS + 1),
+    attentionRange: range(1),
+    blurs: 0,
+    linearSum: 0,
+    backNavs: 0,
+
+    pageStats: new Float64Array(CONFIG.MAX_PAGES * PAGE_STRIDE),
+    dwellHist: new Float64Array(CONFIG.MAX_PAGES * dwellBins),
+    dwellRange: range(CONFIG.MAX_PAGES),
+
+    itemStats: new Float64Array(CONFIG.MAX_ITEMS * ITEM_STRIDE),
+    itemPositions: new Float64Array(CONFIG.MAX_ITEMS * positions),
+    firstClickHist: new Float64Array(CONFIG.MAX_ITEMS * responseBins),
+    deliberationHist: new Float64Array(CONFIG.MAX_ITEMS * responseBins),
+    latencyHist: new Float64Array(CONFIG.MAX_ITEMS * responseBins),
+    firstClickRange: range(CONFIG.MAX_ITEMS),
+    deliberationRange: range(CONFIG.MAX_ITEMS),
+    latencyRange: range(CONFIG.MAX_ITEMS),
+
+    options: new Float64Array(positions),
+    keys: new Float64Array(positions),
+    chosen: new Float64Array(positions),
+    optionLearners: 0,
+    positionLocked: 0,
+
+    blooms: new Float64Array(12),
+    bloomAttempted: new Float64Array(6),
+    bloomMastered: new Float64Array(6),
+
+    gameRecords: 0,
+    points: 0,
+    pointsHist: new Float64Array(CONFIG.POINTS_EDGES.length + 1),
+    pointsRange: range(1),
+    longestStreak: 0,
+    gameCorrect: 0,
+    gameAnswers: 0,
+
+    achievements: new Float64Array(CONFIG.MAX_ACHIEVEMENTS),
+    achievementRecords: 0
+  };
+}
+
+/**
+ * One data model element of one learner attempt (tall CSV exports).
+ */
+Cohort.prototype.addRow = function(learner, sco, element, value) {
+  this.input.rows++;
+
+  if (element === 'cmi.suspend_data') {
+    this._addSuspendData(value);
+    return;
+  }
+
+  var m = /^cmi\.interactions\.(\d+)\.(id|result|latency)$/.exec(element);
+  if (!m) return;
+  this.input.interactionRows++;
+
+  // Attempts stay open in least-recently-used order; rows of an attempt
+  // that was evicted before all of them arrived are analysed partially
+  var attempt = learner + '\u0000' + sco;
+  var open = this._pending.get(attempt);
+  if (open) {
+    this._pending.delete(attempt);
+  } else {
+    if (this._pending.size >= CONFIG.MAX_PENDING) {
+      var oldest = this._pending.keys().next().value;
+      this._closeAttempt(oldest);
+      this._evicted.add(oldest);
+      if (this._evicted.size > CONFIG.MAX_PENDING) this._evicted.delete(this._evicted.values().next().value);
+    }
+    if (this._evicted.delete(attempt)) this.input.splitAttempts++;
+    open = {};
+  }
+  this._pending.set(attempt, open);
+  var row = open[m[1]] || (open[m[1]] = {});
+  row[m[2]] = value;
+};
+
+/**
+ * One complete learner attempt (JSON Lines exports).
+ * @param {object} record
+ */
+Cohort.prototype.addRecord = function(record) {
+  var learner = String(pick(record, CONFIG.COLUMNS.learner) || '');
+  var sco = String(pick(record, CONFIG.COLUMNS.sco) || '');
+  var self = this;
+
+  var suspendData = pick(record, CONFIG.COLUMNS.suspendData);
+  if (suspendData !== undefined) this.addRow(learner, sco, 'cmi.suspend_data', String(suspendData));
+
+  if (Array.isArray(record.interactions)) {
+    record.interactions.forEach(function(interaction, i) {
+      ['id', 'result', 'latency'].forEach(function(field) {
+        if (interaction[field] !== undefined) {
+          self.addRow(learner, sco, 'cmi.interactions.' + i + '.' + field, String(interaction[field]));
+        }
+      });
+    });
+  }
+
+  Object.keys(record).forEach(function(key) {
+    if (/^cmi\.interactions\.\d+\./.test(key)) self.addRow(learner, sco, key, String(record[key]));
+  });
+
+  this._closeAttempt(learner + '\u0000' + sco);
+};
+
+/** Decode one suspend_data value into the current batch. */
+Cohort.prototype._addSuspendData = function(value) {
+  this.input.suspendData++;
+  if (!value) {
+    this.input.empty++;
+    return;
+  }
+
+  var values;
+  try {
+    values = decodeSuspendData(this.codec, value);
+  } catch (e) {
+    this.input.decodeErrors++;
+    return;
+  }
+  this.input.frames[value.charAt(0) === '~' ? 'binary' : 'legacy']++;
+
+  var bt = values.bt;
+  if (!bt || typeof bt !== 'object') {
+    this.input.noBehaviorData++;
+    return;
+  }
+  this.input.versions[bt.v] = (this.input.versions[bt.v] || 0) + 1;
+  if (bt.v !== CONFIG.SCHEMA_VERSION) return;
+
+  var pages = bt.t && bt.t.p ? Object.keys(bt.t.p).length : 0;
+  var questions = bt.a && bt.a.q ? Object.keys(bt.a.q).length : 0;
+  if (!this.batch.fits(pages, questions)) this._flushBatch();
+  this._writeRecord(bt, values.g, values.ach);
+};
+
+/** Copy one decoded record into the batch columns. */
+Cohort.prototype._writeRecord = function(bt, g, ach) {
+  var b = this.batch;
+  var r = b.records++;
+  var rec = b.rec;
+  var t = bt.t || {};
+  var n = bt.n || {};
+  var a = bt.a || {};
+  var e = bt.e || {};
+  var i, key;
+
+  rec.sessionSec[r] = int(t.sd);
+  rec.focusedSec[r] = int(t.fd);
+  rec.attention[r] = Math.max(0, Math.min(100, int(e.ar)));
+  rec.blurs[r] = int(e.tb);
+  rec.linear[r] = int(n.lr);
+  rec.backNavs[r] = int(n.bn);
+
+  // a.bp: [correct, total] x 6 Bloom levels
+  var bp = Array.isArray(a.bp) && a.bp.length === 12 ? a.bp : null;
+  for (i = 0; i < 12; i++) rec.blooms[r * 12 + i] = bp ? int(bp[i]) : 0;
+
+  // a.op: answers per option position
+  var op = Array.isArray(a.op) ? a.op : [];
+  for (i = 0; i < CONFIG.OPTION_POSITIONS; i++) {
+    rec.options[r * CONFIG.OPTION_POSITIONS + i] = int(op[i]);
+  }
+
+  rec.hasGame[r] = g && typeof g === 'object' ? 1 : 0;
+  if (rec.hasGame[r]) {
+    rec.points[r] = int(g.tp);
+    rec.longestStreak[r] = int(g.ls);
+    rec.gameCorrect[r] = int(g.ca);
+    rec.gameAnswers[r] = int(g.ta);
+  }
+
+  // t.p.{page}: [views, totalSec, focusedSec, scrollDepth, scrollReversals]
+  var pages = t.p || {};
+  for (key in pages) {
+    if (!pages.hasOwnProperty(key) || !Array.isArray(pages[key])) continue;
+    if (b.pages === b.page.id.length) break;
+    var p = b.pages++;
+    var arr = pages[key];
+    b.page.id[p] = this.pageKeys.indexOf(key);
+    b.page.views[p] = int(arr[0]);
+    b.page.totalSec[p] = int(arr[1]);
+    b.page.focusedSec[p] = int(arr[2]);
+    b.page.scrollDepth[p] = int(arr[3]);
+    b.page.reversals[p] = int(arr[4]);
+  }
+
+  // a.q.{id}: [firstClickMs, deliberationMs, selected, correct, result, hints]
+  var questions = a.q || {};
+  for (key in questions) {
+    if (!questions.hasOwnProperty(key) || !Array.isArray(questions[key])) continue;
+    if (b.questions === b.question.item.length) break;
+    var q = b.questions++;
+    var qa = questions[key];
+    b.question.item[q] = this.itemKeys.indexOf(key);
+    b.question.firstClickMs[q] = int(qa[0]);
+    b.question.deliberationMs[q] = int(qa[1]);
+    b.question.selected[q] = position(qa[2]);
+    b.question.key[q] = position(qa[3]);
+    b.question.correct[q] = qa[4] === 1 ? 1 : 0;
+    b.question.hints[q] = int(qa[5]);
+  }
+
+  // Achievements are few and small: count them straight away
+  if (Array.isArray(ach)) {
+    this.acc.achievementRecords++;
+    for (i = 0; i < ach.length; i++) {
+      this.acc.achievements[this.achievementKeys.indexOf(String(ach[i]))]++;
+    }
+  }
+};
+
+/** Move an attempt's cmi.interactions rows into the batch. */
+Cohort.prototype._closeAttempt = function(attempt) {
+  var open = this._pending.get(attempt);
+  if (!open) return;
+  this._pending.delete(attempt);
+
+  var b = this.batch;
+  for (var index in open) {
+    var row = open[index];
+    if (!row.id || row.result === undefined) continue;
+    var k = b.interactions++;
+    b.interaction.item[k] = this.itemKeys.indexOf(row.id);
+    b.interaction.result[k] = parseResult(row.result);
+    b.interaction.latencyMs[k] = parseLatency(row.latency);
+    if (b.full()) this._flushBatch();
+  }
+};
+
+// =========================================================
+// AGGREGATION
+// =========================================================
+
+/**
+ * Observed [min, max] pairs for n histograms, so quantiles interpolated
+ * inside a bin can be clamped to values that actually occurred.
+ */
+function range(n) {
+  var r = new Float64Array(n * 2);
+  for (var i = 0; i < n; i++) {
+    r[i * 2] = Infinity;
+    r[i * 2 + 1] = -Infinity;
+  }
+  return r;
+}
+
+function track(r, index, value) {
+  if (value < r[index * 2]) r[index * 2] = value;
+  if (value > r[index * 2 + 1]) r[index * 2 + 1] = value;
+}
+
+/** Index of the histogram bin for value (edges are upper bounds). */
+function bin(edges, value) {
+  var lo = 0;
+  var hi = edges.length;
+  while (lo < hi) {
+    var mid = (lo + hi) >> 1;
+    if (value <= edges[mid]) hi = mid;
+    else lo = mid + 1;
+  }
+  return lo;
+}
+
+/** Fold the batch into the accumulators column by column, then reuse it. */
+Cohort.prototype._flushBatch = function() {
+  var b = this.batch;
+  var acc = this.acc;
+  var n = b.records;
+  var positions = CONFIG.OPTION_POSITIONS;
+  var dwellBins = CONFIG.DWELL_EDGES_SEC.length + 1;
+  var responseBins = CONFIG.RESPONSE_EDGES_MS.length + 1;
+  var i, j, base;
+
+  // ── Records ──────────────────────────────────────────────
+  var rec = b.rec;
+  acc.records += n;
+  for (i = 0; i < n; i++) {
+    acc.sessionSec += rec.sessionSec[i];
+    acc.focusedSec += rec.focusedSec[i];
+    acc.attentionSum += rec.attention[i];
+    // Edges are upper-inclusive like bin(): 100% goes in the last closed bin
+    acc.attentionHist[Math.max(0, Math.ceil(rec.attention[i] * CONFIG.ATTENTION_BINS / 100) - 1)]++;
+    track(acc.attentionRange, 0, rec.attention[i]);
+    acc.blurs += rec.blurs[i];
+    acc.linearSum += rec.linear[i];
+    acc.backNavs += rec.backNavs[i];
+  }
+
+  for (i = 0; i < n; i++) {
+    base = i * 12;
+    for (j = 0; j < 6; j++) {
+      var correct = rec.blooms[base + j * 2];
+      var total = rec.blooms[base + j * 2 + 1];
+      acc.blooms[j * 2] += correct;
+      acc.blooms[j * 2 + 1] += total;
+      if (total > 0) {
+        acc.bloomAttempted[j]++;
+        if (correct / total >= CONFIG.MASTERY_THRESHOLD) acc.bloomMastered[j]++;
+      }
+    }
+  }
+
+  for (i = 0; i < n; i++) {
+    base = i * positions;
+    var answers = 0;
+    var most = 0;
+    for (j = 0; j < positions; j++) {
+      var count = rec.options[base + j];
+      acc.options[j] += count;
+      answers += count;
+      if (count > most) most = count;
+    }
+    if (answers >= CONFIG.POSITION_LOCK_MIN_ANSWERS) {
+      acc.optionLearners++;
+      if (most / answers >= CONFIG.POSITION_LOCK_SHARE) acc.positionLocked++;
+    }
+  }
+
+  for (i = 0; i < n; i++) {
+    if (!rec.hasGame[i]) continue;
+    acc.gameRecords++;
+    acc.points += rec.points[i];
+    acc.pointsHist[bin(CONFIG.POINTS_EDGES, rec.points[i])]++;
+    track(acc.pointsRange, 0, rec.points[i]);
+    acc.longestStreak += rec.longestStreak[i];
+    acc.gameCorrect += rec.gameCorrect[i];
+    acc.gameAnswers += rec.gameAnswers[i];
+  }
+
+  // ── Pages ────────────────────────────────────────────────
+  var page = b.page;
+  for (i = 0; i < b.pages; i++) {
+    var id = page.id[i];
+    base = id * PAGE_STRIDE;
+    acc.pageStats[base]++;
+    acc.pageStats[base + 1] += page.views[i];
+    acc.pageStats[base + 2] += page.totalSec[i];
+    acc.pageStats[base + 3] += page.focusedSec[i];
+    acc.pageStats[base + 4] += page.scrollDepth[i];
+    acc.pageStats[base + 5] += page.reversals[i];
+    acc.dwellHist[id * dwellBins + bin(CONFIG.DWELL_EDGES_SEC, page.totalSec[i])]++;
+    track(acc.dwellRange, id, page.totalSec[i]);
+  }
+
+  // ── Questions (a.q) ──────────────────────────────────────
+  var question = b.question;
+  for (i = 0; i < b.questions; i++) {
+    var item = question.item[i];
+    base = item * ITEM_STRIDE;
+    acc.itemStats[base]++;
+    acc.itemStats[base + 1] += question.correct[i];
+    acc.itemStats[base + 2] += question.hints[i];
+    acc.itemStats[base + 3] += question.firstClickMs[i];
+    acc.itemStats[base + 4] += question.deliberationMs[i];
+    acc.firstClickHist[item * responseBins + bin(CONFIG.RESPONSE_EDGES_MS, question.firstClickMs[i])]++;
+    acc.deliberationHist[item * responseBins + bin(CONFIG.RESPONSE_EDGES_MS, question.deliberationMs[i])]++;
+    track(acc.firstClickRange, item, question.firstClickMs[i]);
+    track(acc.deliberationRange, item, question.deliberationMs[i]);
+
+    if (question.selected[i] >= 0) {
+      acc.itemPositions[item * positions + question.selected[i]]++;
+      acc.chosen[question.selected[i]]++;
+    }
+    if (question.key[i] >= 0) acc.keys[question.key[i]]++;
+  }
+
+  // ── cmi.interactions ─────────────────────────────────────
+  var interaction = b.interaction;
+  for (i = 0; i < b.interactions; i++) {
+    if (interaction.result[i] < 0) continue;
+    base = interaction.item[i] * ITEM_STRIDE;
+    acc.itemStats[base + 5]++;
+    acc.itemStats[base + 6] += interaction.result[i];
+    if (interaction.latencyMs[i] >= 0) {
+      acc.itemStats[base + 7] += interaction.latencyMs[i];
+      acc.latencyHist[interaction.item[i] * responseBins +
+        bin(CONFIG.RESPONSE_EDGES_MS, interaction.latencyMs[i])]++;
+      track(acc.latencyRange, interaction.item[i], interaction.latencyMs[i]);
+    }
+  }
+
+  b.reset();
+};
+
+// =========================================================
+// REPORT
+// =========================================================
+
+function round(value, digits) {
+  var f = Math.pow(10, digits === undefined ? 2 : digits);
+  return Math.round(value * f) / f;
+}
+
+function ratio(a, b) {
+  return b ? round(a / b, 3) : null;
+}
+
+/**
+ * Estimate a quantile from a histogram slice, interpolating inside the bin.
+ * The open-ended last bin reports its lower edge. The estimate is clamped
+ * to the observed range r[index] (see range()).
+ */
+function quantile(hist, offset, edges, q, r, index) {
+  var value = binQuantile(hist, offset, edges, q);
+  if (value === null) return null;
+  return Math.min(r[index * 2 + 1], Math.max(r[index * 2], value));
+}
+
+function binQuantile(hist, offset, edges, q) {
+  var bins = edges.length + 1;
+  var total = 0;
+  var i;
+  for (i = 0; i < bins; i++) total += hist[offset + i];
+  if (!total) return null;
+
+  var target = q * total;
+  var seen = 0;
+  for (i = 0; i < bins; i++) {
+    var count = hist[offset + i];
+    if (seen + count >= target && count > 0) {
+      if (i === edges.length) return edges[i - 1];
+      var lower = i ? edges[i - 1] : 0;
+      return round(lower + (edges[i] - lower) * (target - seen) / count, 1);
+    }
+    seen += count;
+  }
+  return edges[edges.length - 1];
+}
+
+function histogram(hist, offset, edges) {
+  var out = [];
+  for (var i = 0; i <= edges.length; i++) {
+    out.push({ le: i < edges.length ? edges[i] : null, count: hist[offset + i] });
+  }
+  return out;
+}
+
+/** Chi-square statistic of observed counts against expected shares. */
+function chiSquare(observed, expectedShare) {
+  var total = 0;
+  var i;
+  for (i = 0; i < observed.length; i++) total += observed[i];
+  if (!total) return null;
+  var x = 0;
+  for (i = 0; i < observed.length; i++) {
+    var expected = total * expectedShare[i];
+    if (expected > 0) x += Math.pow(observed[i] - expected, 2) / expected;
+  }
+  return round(x, 3);
+}
+
+/** Close open attempts, fold the last batch and build the report. */
+Cohort.prototype.finish = function() {
+  var self = this;
+  Array.from(this._pending.keys()).forEach(function(attempt) { self._closeAttempt(attempt); });
+  this._flushBatch();
+
+  var acc = this.acc;
+  var positions = CONFIG.OPTION_POSITIONS;
+  var dwellBins = CONFIG.DWELL_EDGES_SEC.length + 1;
+  var responseBins = CONFIG.RESPONSE_EDGES_MS.length + 1;
+  var attentionEdges = [];
+  for (var e = 1; e <= CONFIG.ATTENTION_BINS; e++) attentionEdges.push(e * 100 / CONFIG.ATTENTION_BINS);
+
+  var pages = this.pageKeys.keys.map(function(key, id) {
+    var base = id * PAGE_STRIDE;
+    var s = acc.pageStats;
+    var records = s[base];
+    return {
+      page: key,
+      records: records,
+      views: round(s[base + 1] / records),
+      dwellSec: {
+        mean: round(s[base + 2] / records, 1),
+        p50: quantile(acc.dwellHist, id * dwellBins, CONFIG.DWELL_EDGES_SEC, 0.5, acc.dwellRange, id),
+        p90: quantile(acc.dwellHist, id * dwellBins, CONFIG.DWELL_EDGES_SEC, 0.9, acc.dwellRange, id)
+      },
+      focusedShare: ratio(s[base + 3], s[base + 2]),
+      scrollDepth: round(s[base + 4] / records, 1),
+      scrollReversals: round(s[base + 5] / records),
+      histogram: histogram(acc.dwellHist, id * dwellBins, CONFIG.DWELL_EDGES_SEC)
+    };
+  });
+
+  var items = this.itemKeys.keys.map(function(key, id) {
+    var base = id * ITEM_STRIDE;
+    var s = acc.itemStats;
+    var offset = id * responseBins;
+    var chosen = Array.prototype.slice.call(acc.itemPositions, id * positions, (id + 1) * positions);
+    return {
+      id: key,
+      tracked: s[base] ? {
+        n: s[base],
+        difficulty: ratio(s[base + 1], s[base]),
+        hintsPerAnswer: ratio(s[base + 2], s[base]),
+        firstClickMs: { mean: Math.round(s[base + 3] / s[base]),
+          p50: quantile(acc.firstClickHist, offset, CONFIG.RESPONSE_EDGES_MS, 0.5, acc.firstClickRange, id) },
+        deliberationMs: { mean: Math.round(s[base + 4] / s[base]),
+          p50: quantile(acc.deliberationHist, offset, CONFIG.RESPONSE_EDGES_MS, 0.5, acc.deliberationRange, id) },
+        chosenPositions: chosen
+      } : null,
+      lms: s[base + 5] ? {
+        n: s[base + 5],
+        difficulty: ratio(s[base + 6], s[base + 5]),
+        latencyMs: { p50: quantile(acc.latencyHist, offset, CONFIG.RESPONSE_EDGES_MS, 0.5, acc.latencyRange, id) }
+      } : null
+    };
+  });
+
+  // Compare chosen positions with where the right answers actually were;
+  // add-one smoothing keeps unused key positions in the test and falls
+  // back to a uniform key when a.q carried no answer keys
+  var keyTotal = 0;
+  var i;
+  for (i = 0; i < positions; i++) keyTotal += acc.keys[i];
+  var expected = [];
+  for (i = 0; i < positions; i++) expected.push((acc.keys[i] + 1) / (keyTotal + positions));
+  var optionTotal = 0;
+  for (i = 0; i < positions; i++) optionTotal += acc.options[i];
+  var chi = chiSquare(acc.options, expected);
+
+  var blooms = CONFIG.BLOOM_LEVELS.map(function(level, j) {
+    return {
+      level: level,
+      correct: acc.blooms[j * 2],
+      total: acc.blooms[j * 2 + 1],
+      accuracy: ratio(acc.blooms[j * 2], acc.blooms[j * 2 + 1]),
+      learners: acc.bloomAttempted[j],
+      masteryRate: ratio(acc.bloomMastered[j], acc.bloomAttempted[j])
+    };
+  });
+
+  var achievements = this.achievementKeys.keys.map(function(key, id) {
+    return { id: key, records: acc.achievements[id], share: ratio(acc.achievements[id], acc.achievementRecords) };
+  });
+
+  return {
+    input: Object.assign({}, this.input, {
+      records: acc.records,
+      pooled: { pages: this.pageKeys.overflow, items: this.itemKeys.overflow,
+        achievements: this.achievementKeys.overflow }
+    }),
+    attention: {
+      records: acc.records,
+      mean: acc.records ? round(acc.attentionSum / acc.records / 100, 3) : null,
+      p10: ratio(quantile(acc.attentionHist, 0, attentionEdges, 0.1, acc.attentionRange, 0), 100),
+      p50: ratio(quantile(acc.attentionHist, 0, attentionEdges, 0.5, acc.attentionRange, 0), 100),
+      p90: ratio(quantile(acc.attentionHist, 0, attentionEdges, 0.9, acc.attentionRange, 0), 100),
+      focusedShare: ratio(acc.focusedSec, acc.sessionSec),
+      meanSessionSec: acc.records ? Math.round(acc.sessionSec / acc.records) : null,
+      blursPerRecord: ratio(acc.blurs, acc.records),
+      linearRatio: acc.records ? round(acc.linearSum / acc.records / 100, 3) : null,
+      backNavsPerRecord: ratio(acc.backNavs, acc.records),
+      histogram: histogram(acc.attentionHist, 0, attentionEdges)
+    },
+    pages: pages,
+    items: items,
+    optionPosition: {
+      counts: Array.from(acc.options),
+      share: Array.from(acc.options).map(function(c) { return ratio(c, optionTotal); }),
+      expectedShare: expected.map(function(s) { return round(s, 3); }),
+      expectedFrom: keyTotal ? 'answer keys' : 'uniform',
+      chiSquare: chi,
+      biased: chi !== null && chi > CONFIG.CHI_SQUARE_CRITICAL,
+      positionLockedLearners: acc.positionLocked,
+      positionLockedShare: ratio(acc.positionLocked, acc.optionLearners)
+    },
+    blooms: blooms,
+    gamification: {
+      records: acc.gameRecords,
+      meanPoints: acc.gameRecords ? round(acc.points / acc.gameRecords, 1) : null,
+      p50Points: quantile(acc.pointsHist, 0, CONFIG.POINTS_EDGES, 0.5, acc.pointsRange, 0),
+      meanLongestStreak: acc.gameRecords ? round(acc.longestStreak / acc.gameRecords, 1) : null,
+      accuracy: ratio(acc.gameCorrect, acc.gameAnswers)
+    },
+    achievements: achievements
+  };
+};
+
+// =========================================================
+// INPUT
+// =========================================================
+
+function pick(record, names) {
+  for (var i = 0; i < names.length; i++) {
+    if (record[names[i]] !== undefined) return record[names[i]];
+  }
+  return undefined;
+}
+
+/** Split one CSV line (RFC 4180 quoting, no embedded line breaks). */
+function parseCsvLine(line) {
+  var fields = [];
+  var field = '';
+  var quoted = false;
+  for (var i = 0; i < line.length; i++) {
+    var ch = line.charAt(i);
+    if (quoted) {
+      if (ch === '"') {
+        if (line.charAt(i + 1) === '"') {
+          field += '"';
+          i++;
+        } else {
+          quoted = false;
+        }
+      } else {
+        field += ch;
+      }
+    } else if (ch === '"') {
+      quoted = true;
+    } else if (ch === ',') {
+      fields.push(field);
+      field = '';
+    } else {
+      field += ch;
+    }
+  }
+  fields.push(field);
+  return fields;
+}
+
+function columnIndex(header, names) {
+  for (var i = 0; i < names.length; i++) {
+    var index = header.indexOf(names[i]);
+    if (index !== -1) return index;
+  }
+  return -1;
+}
+
+/**
+ * Returns a line handler for the export format, chosen from its first line.
+ */
+function createLineReader(cohort, firstLine) {
+  if (firstLine.charAt(0) === '{') {
+    return function(line) {
+      cohort.addRecord(JSON.parse(line));
+    };
+  }
+
+  var header = parseCsvLine(firstLine).map(function(h) { return h.trim().toLowerCase(); });
+  var col = {};
+  Object.keys(CONFIG.COLUMNS).forEach(function(name) {
+    col[name] = columnIndex(header, CONFIG.COLUMNS[name]);
+  });
+
+  if (col.element !== -1 && col.value !== -1) {
+    return function(line) {
+      var f = parseCsvLine(line);
+      cohort.addRow(f[col.learner] || '', f[col.sco] || '', f[col.element], f[col.value] || '');
+    };
+  }
+  if (col.suspendData !== -1) {
+    return function(line) {
+      var f = parseCsvLine(line);
+      var record = { learner: f[col.learner] || '', sco: f[col.sco] || '', suspend_data: f[col.suspendData] };
+      cohort.addRecord(record);
+    };
+  }
+  throw new Error('CSV header needs element and value columns, or a suspend_data column: ' + firstLine);
+}
+
+function openInput(file) {
+  var stream = file === '-' ? process.stdin : fs.createReadStream(file);
+  return /\.gz$/.test(file) ? stream.pipe(zlib.createGunzip()) : stream;
+}
+
+/**
+ * Stream an export through a Cohort.
+ * @param {string|stream.Readable} input - File path ("-" for stdin) or stream
+ * @param {object} [options] - { course, batchSize }
+ * @returns {Promise<object>} report
+ */
+async function analyze(input, options) {
+  options = options || {};
+  var cohort = new Cohort(loadCodec(options.course || CONFIG.DEFAULT_COURSE), options);
+  var stream = typeof input === 'string' ? openInput(input) : input;
+  var lines = readline.createInterface({ input: stream, crlfDelay: Infinity });
+  var handle = null;
+  var lineNo = 0;
+  var malformed = 0;
+
+  for await (var line of lines) {
+    lineNo++;
+    if (!line.trim()) continue;
+    if (!handle) {
+      line = line.replace(/^\uFEFF/, '');
+      handle = createLineReader(cohort, line);
+      if (line.charAt(0) !== '{') continue;
+    }
+    try {
+      handle(line);
+    } catch (e) {
+      malformed++;
+    }
+  }
+
+  var report = cohort.finish();
+  report.input.lines = lineNo;
+  report.input.malformed = malformed;
+  return report;
+}
+
+// =========================================================
+// CLI
+// =========================================================
+
+function pad(str, len, left) {
+  str = String(str === null || str === undefined ? '-' : str);
+  while (str.length < len) str = left ? str + ' ' : ' ' + str;
+  return str;
+}
+
+function percent(value) {
+  return value === null ? '-' : Math.round(value * 100) + '%';
+}
+
+function printReport(report, top) {
+  var input = report.input;
+  console.log('Records analysed: ' + input.records + ' (' + input.suspendData + ' suspend_data values, ' +
+    input.interactionRows + ' interaction rows)');
+  console.log('Skipped: ' + input.empty + ' empty, ' + input.decodeErrors + ' undecodable, ' +
+    input.noBehaviorData + ' without tracker data, ' + input.malformed + ' malformed lines; versions ' +
+    JSON.stringify(input.versions));
+  if (input.splitAttempts) {
+    console.log('! ' + input.splitAttempts + ' attempts had cmi.interactions rows far apart; sort the export ' +
+      'by learner and SCO for exact joins');
+  }
+
+  var a = report.attention;
+  console.log('\nAttention');
+  console.log('  ratio mean ' + percent(a.mean) + '  p10 ' + percent(a.p10) + '  p50 ' + percent(a.p50) +
+    '  p90 ' + percent(a.p90) + '  focused/session ' + percent(a.focusedShare));
+
+  console.log('\nPages by median dwell (top ' + top + ')');
+  console.log('  ' + pad('page', 10, true) + pad('records', 9) + pad('mean s', 9) + pad('p50 s', 8) +
+    pad('p90 s', 8) + pad('focused', 9) + pad('scroll', 8));
+  report.pages.slice().sort(function(x, y) { return (y.dwellSec.p50 || 0) - (x.dwellSec.p50 || 0); })
+    .slice(0, top).forEach(function(p) {
+      console.log('  ' + pad(p.page, 10, true) + pad(p.records, 9) + pad(p.dwellSec.mean, 9) +
+        pad(p.dwellSec.p50, 8) + pad(p.dwellSec.p90, 8) + pad(percent(p.focusedShare), 9) +
+        pad(p.scrollDepth + '%', 8));
+    });
+
+  console.log('\nHardest items (top ' + top + ')');
+  console.log('  ' + pad('item', 24, true) + pad('n', 7) + pad('correct', 9) + pad('lms', 7) +
+    pad('1st click', 11) + pad('deliberate', 12));
+  report.items.filter(function(it) { return it.tracked || it.lms; })
+    .sort(function(x, y) { return difficulty(x) - difficulty(y); })
+    .slice(0, top).forEach(function(it) {
+      var t = it.tracked || {};
+      console.log('  ' + pad(it.id, 24, true) + pad(t.n || (it.lms && it.lms.n), 7) +
+        pad(percent(difficulty(it)), 9) + pad(it.lms ? percent(it.lms.difficulty) : '-', 7) +
+        pad(t.firstClickMs ? t.firstClickMs.p50 : '-', 11) + pad(t.deliberationMs ? t.deliberationMs.p50 : '-', 12));
+    });
+
+  var o = report.optionPosition;
+  console.log('\nOption positions');
+  console.log('  chosen ' + o.share.map(percent).join(' / ') + '  vs ' + o.expectedFrom + ' ' +
+    o.expectedShare.map(percent).join(' / '));
+  console.log('  chi-square ' + o.chiSquare + (o.biased ? ' (biased, p < 0.05)' : '') +
+    '  position-locked learners ' + o.positionLockedLearners + ' (' + percent(o.positionLockedShare) + ')');
+
+  console.log('\nBloom mastery');
+  report.blooms.forEach(function(b) {
+    console.log('  ' + pad(b.level, 12, true) + pad(b.correct + '/' + b.total, 14) + pad(percent(b.accuracy), 6) +
+      '  mastered by ' + percent(b.masteryRate) + ' of ' + b.learners);
+  });
+
+  var g = report.gamification;
+  if (g.records) {
+    console.log('\nGamification: ' + g.records + ' records, mean points ' + g.meanPoints + ', p50 ' +
+      g.p50Points + ', mean longest streak ' + g.meanLongestStreak + ', accuracy ' + percent(g.accuracy));
+  }
+}
+
+function difficulty(item) {
+  if (item.tracked) return item.tracked.difficulty;
+  return item.lms ? item.lms.difficulty : 1;
+}
+
+function parseArgs(argv) {
+  var args = { input: null, course: CONFIG.DEFAULT_COURSE, json: null, top: 20 };
+  for (var i = 0; i < argv.length; i++) {
+    var a = argv[i];
+    if (a === '--course') args.course = path.resolve(argv[++i]);
+    else if (a === '--json') args.json = path.resolve(argv[++i]);
+    else if (a === '--top') args.top = Math.max(1, parseInt(argv[++i], 10) || 20);
+    else if (a === '--help' || a === '-h') args.help = true;
+    else if (!args.input) args.input = a;
+    else throw new Error('Unexpected argument: ' + a);
+  }
+  return args;
+}
+
+if (require.main === module) {
+  var args = parseArgs(process.argv.slice(2));
+  if (args.help || !args.input) {
+    console.log('Usage: node scripts/cohort-analytics.js <export.csv|export.jsonl[.gz]|-> [--course dir]\n' +
+      '         [--json file] [--top n]');
+    process.exit(args.help ? 0 : 1);
+  }
+
+  analyze(args.input, { course: args.course }).then(function(report) {
+    printReport(report, args.top);
+    if (args.json) {
+      fs.writeFileSync(args.json, JSON.stringify(report, null, 2) + '\n');
+      console.log('\nWrote ' + path.relative(process.cwd(), args.json));
+    }
+  }).catch(function(err) {
+    console.error(err.stack || err.message);
+    process.exit(1);
+  });
+}
+
+module.exports = {
+  analyze: analyze,
+  Cohort: Cohort,
+  loadCodec: loadCodec,
+  decodeSuspendData: decodeSuspendData
+};
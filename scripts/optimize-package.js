@@ -0,0 +1,1014 @@
+#!/usr/bin/env node
+/**
+ * Package Optimizer — offline build step for a generated SCORM course
+ * ====================================================================
+ * Copies a course folder (e.g. output/njr01-u03) and rewrites the copy so
+ * each SCO loads as few bytes as possible:
+ *
+ *   1. Fonts   — Tajawal is subset to the glyphs used by any SCO (HTML +
+ *                scripts) and converted to WOFF2. One subset per weight is
+ *                shared by all SCOs so the browser cache still helps.
+ *   2. CSS     — base/player-shell/theme/course-custom are merged and pruned
+ *                per SCO to rules whose classes/ids appear in that SCO. The
+ *                rules needed by the first slide are inlined in <head>; the
+ *                full pruned sheet loads without blocking render.
+ *   3. JS      — each SCO's <script> tags become one content-hashed bundle,
+ *                minified with terser when installed, otherwise with the
+ *                built-in comment/whitespace stripper.
+ *   4. Manifest— <file> entries in imsmanifest.xml are regenerated, and
+ *                shared files no SCO references any more are removed.
+ *   5. Report  — per-SCO bytes before/after.
+ *
+ * Usage:
+ *   node scripts/optimize-package.js output/njr01-u03 [--out dist/njr01-u03]
+ *
+ *   The output folder is deleted and rebuilt, so it must lie outside the
+ *   course folder and must not contain it.
+ *
+ * Optional tools (each step is skipped with a warning when missing):
+ *   - pyftsubset (pip install fonttools brotli) for font subsetting/WOFF2
+ *   - terser     (npm install terser) for full JS minification
+ */
+
+'use strict';
+
+var fs = require('fs');
+var path = require('path');
+var crypto = require('crypto');
+var childProcess = require('child_process');
+
+// =========================================================
+// CONFIGURATION
+// =========================================================
+
+var CONFIG = {
+  // Length of the content hash in emitted file names
+  HASH_LENGTH: 8,
+
+  // Characters always kept in font subsets (page indicators, scores, etc.)
+  ALWAYS_GLYPHS: ' !"#$%&\'()*+,-./0123456789:;<=>?@ABCDEFGHIJKLMNOPQRSTUVWXYZ' +
+    '[\\]^_`abcdefghijklmnopqrstuvwxyz{|}~ ،؛؟ـ' +
+    '٠١٢٣٤٥٦٧٨٩–—✓',
+
+  // Classes toggled by the engines at runtime that never appear literally
+  SAFELIST: ['active', 'animate-in', 'align-top', 'selected', 'correct', 'incorrect',
+    'visited', 'revealed', 'show', 'hidden', 'disabled', 'open', 'dragging', 'drag-over'],
+
+  // Shared files that are never removed from the package
+  KEEP_SHARED: [/\.xsd$/]
+};
+
+// =========================================================
+// SMALL HELPERS
+// =========================================================
+
+function hash(content) {
+  return crypto.createHash('sha256').update(content).digest('hex').substr(0, CONFIG.HASH_LENGTH);
+}
+
+function toPosix(p) {
+  return p.split(path.sep).join('/');
+}
+
+function fileSize(p) {
+  try {
+    return fs.statSync(p).size;
+  } catch (e) {
+    return 0;
+  }
+}
+
+/**
+ * Absolute path with symlinks resolved. A path that doesn't exist yet is
+ * resolved through its nearest existing ancestor.
+ */
+function realPath(p) {
+  p = path.resolve(p);
+  if (fs.existsSync(p)) return fs.realpathSync(p);
+  var parent = path.dirname(p);
+  return parent === p ? p : path.join(realPath(parent), path.basename(p));
+}
+
+/** True when child is dir itself or somewhere below it. */
+function isWithin(dir, child) {
+  var rel = path.relative(dir, child);
+  return rel === '' || (rel !== '..' && rel.indexOf('..' + path.sep) !== 0 && !path.isAbsolute(rel));
+}
+
+function copyDir(src, dest) {
+  fs.mkdirSync(dest, { recursive: true });
+  fs.readdirSync(src, { withFileTypes: true }).forEach(function(entry) {
+    var from = path.join(src, entry.name);
+    var to = path.join(dest, entry.name);
+    if (entry.isDirectory()) {
+      copyDir(from, to);
+    } else {
+      fs.copyFileSync(from, to);
+    }
+  });
+}
+
+function walk(dir) {
+  var files = [];
+  fs.readdirSync(dir, { withFileTypes: true }).forEach(function(entry) {
+    var p = path.join(dir, entry.name);
+    if (entry.isDirectory()) {
+      files = files.concat(walk(p));
+    } else {
+      files.push(p);
+    }
+  });
+  return files;
+}
+
+function removeEmptyDirs(dir) {
+  fs.readdirSync(dir, { withFileTypes: true }).forEach(function(entry) {
+    if (entry.isDirectory()) removeEmptyDirs(path.join(dir, entry.name));
+  });
+  if (fs.readdirSync(dir).length === 0) fs.rmdirSync(dir);
+}
+
+function formatBytes(n) {
+  if (n >= 1024 * 1024) return (n / 1024 / 1024).toFixed(2) + ' MB';
+  if (n >= 1024) return (n / 1024).toFixed(1) + ' KB';
+  return n + ' B';
+}
+
+function pad(str, width, right) {
+  str = String(str);
+  while (str.length < width) {
+    str = right ? str + ' ' : ' ' + str;
+  }
+  return str;
+}
+
+// =========================================================
+// HTML
+// =========================================================
+
+/**
+ * List the external scripts and stylesheets of a SCO page, in order.
+ */
+function readPageAssets(html) {
+  var scripts = [];
+  var styles = [];
+  var m;
+
+  var scriptRe = /<script\b[^>]*\bsrc="([^"]+)"[^>]*>\s*<\/script>/g;
+  while ((m = scriptRe.exec(html)) !== null) {
+    scripts.push(m[1]);
+  }
+
+  var linkRe = /<link\b[^>]*>/g;
+  while ((m = linkRe.exec(html)) !== null) {
+    if (/rel="stylesheet"/.test(m[0])) {
+      var href = /href="([^"]+)"/.exec(m[0]);
+      if (href) styles.push(href[1]);
+    }
+  }
+
+  return { scripts: scripts, styles: styles };
+}
+
+/**
+ * Find the end of the element whose opening <div ...> starts at `start`.
+ */
+function findDivEnd(html, start) {
+  var re = /<div\b|<\/div>/g;
+  re.lastIndex = start;
+  var depth = 0;
+  var m;
+  while ((m = re.exec(html)) !== null) {
+    depth += m[0] === '</div>' ? -1 : 1;
+    if (depth === 0) return re.lastIndex;
+  }
+  return html.length;
+}
+
+/**
+ * Markup visible at first paint: everything except slides after the first.
+ */
+function firstPaintMarkup(html) {
+  var out = '';
+  var pos = 0;
+  var re = /<div\b[^>]*\bclass="slide\b[^"]*"[^>]*\bdata-slide="(\d+)"[^>]*>/g;
+  var m;
+  while ((m = re.exec(html)) !== null) {
+    if (m[1] === '0') continue;
+    var end = findDivEnd(html, m.index);
+    out += html.substring(pos, m.index);
+    pos = end;
+    re.lastIndex = end;
+  }
+  return out + html.substring(pos);
+}
+
+function textContent(html) {
+  return html
+    .replace(/<script\b[\s\S]*?<\/script>/g, ' ')
+    .replace(/<style\b[\s\S]*?<\/style>/g, ' ')
+    .replace(/<[^>]+>/g, ' ')
+    .replace(/&nbsp;/g, ' ')
+    .replace(/&amp;/g, '&');
+}
+
+// =========================================================
+// CSS
+// =========================================================
+
+/**
+ * Parse CSS into a flat-or-nested list of nodes:
+ *   { type: 'rule', selector, body }
+ *   { type: 'group', prelude, children }   (@media, @supports)
+ *   { type: 'raw', text }                  (@font-face, @keyframes, @import ...)
+ */
+function parseCss(text) {
+  var nodes = [];
+  var i = 0;
+  var len = text.length;
+
+  while (i < len) {
+    // Skip whitespace
+    while (i < len && /\s/.test(text[i])) i++;
+    if (i >= len) break;
+
+    // Statement at-rules without a block (@import, @charset)
+    if (text[i] === '@') {
+      var semi = text.indexOf(';', i);
+      var brace = text.indexOf('{', i);
+      if (semi !== -1 && (brace === -1 || semi < brace)) {
+        nodes.push({ type: 'raw', text: text.substring(i, semi + 1) });
+        i = semi + 1;
+        continue;
+      }
+    }
+
+    var open = text.indexOf('{', i);
+    if (open === -1) break;
+    var prelude = text.substring(i, open).trim();
+
+    // Match the closing brace, skipping strings
+    var depth = 1;
+    var j = open + 1;
+    var quote = null;
+    while (j < len && depth > 0) {
+      var c = text[j];
+      if (quote) {
+        if (c === '\\') j++;
+        else if (c === quote) quote = null;
+      } else if (c === '"' || c === '\'') {
+        quote = c;
+      } else if (c === '{') {
+        depth++;
+      } else if (c === '}') {
+        depth--;
+      }
+      j++;
+    }
+    var body = text.substring(open + 1, j - 1);
+
+    if (/^@(media|supports|layer)\b/.test(prelude)) {
+      nodes.push({ type: 'group', prelude: prelude, children: parseCss(body) });
+    } else if (prelude.charAt(0) === '@') {
+      nodes.push({ type: 'raw', prelude: prelude, text: prelude + '{' + body + '}' });
+    } else {
+      nodes.push({ type: 'rule', selector: prelude, body: body });
+    }
+    i = j;
+  }
+
+  return nodes;
+}
+
+function stripComments(css) {
+  return css.replace(/\/\*[\s\S]*?\*\//g, '');
+}
+
+/** Split a selector list on top-level commas. */
+function splitSelectors(selector) {
+  var parts = [];
+  var depth = 0;
+  var start = 0;
+  for (var i = 0; i < selector.length; i++) {
+    var c = selector[i];
+    if (c === '(' || c === '[') depth++;
+    else if (c === ')' || c === ']') depth--;
+    else if (c === ',' && depth === 0) {
+      parts.push(selector.substring(start, i).trim());
+      start = i + 1;
+    }
+  }
+  parts.push(selector.substring(start).trim());
+  return parts;
+}
+
+/**
+ * A selector can match when every class and id it requires is used.
+ * Classes inside :not() are not requirements.
+ */
+function selectorIsUsed(selector, used) {
+  var s = selector.replace(/:not\([^)]*\)/g, '').replace(/\[[^\]]*\]/g, '');
+  var re = /([.#])(-?[_a-zA-Z][\w-]*)/g;
+  var m;
+  while ((m = re.exec(s)) !== null) {
+    if (!used.has(m[2])) return false;
+  }
+  return true;
+}
+
+/**
+ * Keep rules (and the selectors within them) that can match the page.
+ * @keyframes are kept only when a kept rule references them.
+ */
+function pruneCss(nodes, used) {
+  function prune(list) {
+    var out = [];
+    list.forEach(function(node) {
+      if (node.type === 'rule') {
+        var kept = splitSelectors(node.selector).filter(function(sel) {
+          return selectorIsUsed(sel, used);
+        });
+        if (kept.length > 0) {
+          out.push({ type: 'rule', selector: kept.join(','), body: node.body });
+        }
+      } else if (node.type === 'group') {
+        var children = prune(node.children);
+        if (children.length > 0) {
+          out.push({ type: 'group', prelude: node.prelude, children: children });
+        }
+      } else {
+        out.push(node);
+      }
+    });
+    return out;
+  }
+
+  var pruned = prune(nodes);
+  var keptText = serializeCss(pruned.filter(function(n) {
+    return !(n.type === 'raw' && /^@(-webkit-)?keyframes\b/.test(n.prelude || ''));
+  }));
+
+  function dropUnusedKeyframes(list) {
+    return list.filter(function(node) {
+      if (node.type === 'group') {
+        node.children = dropUnusedKeyframes(node.children);
+        return node.children.length > 0;
+      }
+      var kf = /^@(?:-webkit-)?keyframes\s+([\w-]+)/.exec(node.prelude || '');
+      return !kf || new RegExp('\\b' + kf[1] + '\\b').test(keptText);
+    });
+  }
+
+  return dropUnusedKeyframes(pruned);
+}
+
+function minifyDeclarations(body) {
+  return body
+    .replace(/\s+/g, ' ')
+    .replace(/\s*([:;,{}>])\s*/g, '$1')
+    .replace(/;$/, '')
+    .trim();
+}
+
+function serializeCss(nodes) {
+  return nodes.map(function(node) {
+    if (node.type === 'rule') {
+      return node.selector.replace(/\s+/g, ' ') + '{' + minifyDeclarations(node.body) + '}';
+    }
+    if (node.type === 'group') {
+      return node.prelude.replace(/\s+/g, ' ') + '{' + serializeCss(node.children) + '}';
+    }
+    return node.text.replace(/\s+/g, ' ');
+  }).join('');
+}
+
+/**
+ * True for url() targets that are not files in the package: data URIs,
+ * remote URLs and fragment references (SVG filters use url(#id), which
+ * appears percent-encoded as url(%23id) inside data URIs).
+ */
+function isExternalRef(ref) {
+  return /^(data:|https?:|\/\/|#|%23)/i.test(ref);
+}
+
+/**
+ * Call fn(ref) for every top-level url(...) in a stylesheet and replace the
+ * reference with its return value (unchanged when it returns null).
+ * Quoted strings are skipped as a whole, so url() tokens inside a data URI
+ * are never seen.
+ */
+function replaceUrls(css, fn) {
+  var out = '';
+  var i = 0;
+  var len = css.length;
+
+  while (i < len) {
+    var c = css[i];
+
+    if (c === '"' || c === '\'') {
+      var end = i + 1;
+      while (end < len && css[end] !== c) {
+        if (css[end] === '\\') end++;
+        end++;
+      }
+      out += css.substring(i, end + 1);
+      i = end + 1;
+      continue;
+    }
+
+    if ((c === 'u' || c === 'U') && /^url\(/i.test(css.substr(i, 4)) &&
+        !/[\w-]/.test(css[i - 1] || '')) {
+      var j = i + 4;
+      while (j < len && /\s/.test(css[j])) j++;
+      var q = css[j] === '"' || css[j] === '\'' ? css[j] : '';
+      var start = q ? j + 1 : j;
+      var stop = start;
+      while (stop < len && (q ? css[stop] !== q : css[stop] !== ')')) {
+        if (css[stop] === '\\') stop++;
+        stop++;
+      }
+      var close = css.indexOf(')', q ? stop + 1 : stop);
+      if (close === -1) {
+        out += css.substring(i);
+        break;
+      }
+      var ref = css.substring(start, stop).trim();
+      var next = isExternalRef(ref) ? null : fn(ref);
+      out += next === null ? css.substring(i, close + 1) : 'url(' + q + next + q + ')';
+      i = close + 1;
+      continue;
+    }
+
+    out += c;
+    i++;
+  }
+
+  return out;
+}
+
+/**
+ * Rewrite url(...) references so they resolve from a new directory.
+ */
+function rebaseUrls(css, fromDir, toDir, root) {
+  return replaceUrls(css, function(ref) {
+    var abs = path.resolve(fromDir, ref);
+    if (abs.indexOf(root) !== 0) return null;
+    return toPosix(path.relative(toDir, abs));
+  });
+}
+
+// =========================================================
+// TOKENS (which classes / ids a SCO can use)
+// =========================================================
+
+function collectTokens(sources) {
+  var used = new Set(CONFIG.SAFELIST);
+  var prefixes = [];
+  sources.forEach(function(src) {
+    var re = /[_a-zA-Z][\w-]*/g;
+    var m;
+    while ((m = re.exec(src)) !== null) {
+      used.add(m[0]);
+      // 'quiz-option--' + state: treat as a class prefix
+      if (/-$/.test(m[0]) && m[0].length > 2) prefixes.push(m[0]);
+    }
+  });
+
+  if (prefixes.length === 0) return used;
+
+  // Wrap the set so prefix-built class names count as used
+  return {
+    has: function(name) {
+      if (used.has(name)) return true;
+      for (var i = 0; i < prefixes.length; i++) {
+        if (name.indexOf(prefixes[i]) === 0) return true;
+      }
+      return false;
+    }
+  };
+}
+
+// =========================================================
+// FONTS
+// =========================================================
+
+function hasCommand(cmd) {
+  var result = childProcess.spawnSync(cmd, ['--help'], { stdio: 'ignore' });
+  return !result.error;
+}
+
+/**
+ * Subset a TrueType font to the given characters and write WOFF2.
+ * @returns {boolean} true on success
+ */
+function subsetFont(src, dest, textFile) {
+  var result = childProcess.spawnSync('pyftsubset', [
+    src,
+    '--text-file=' + textFile,
+    '--flavor=woff2',
+    '--layout-features=*',
+    '--no-hinting',
+    '--desubroutinize',
+    '--output-file=' + dest
+  ], { stdio: ['ignore', 'ignore', 'pipe'] });
+
+  if (result.status !== 0) {
+    console.warn('  ! pyftsubset failed for ' + path.basename(src) + ': ' +
+      String(result.stderr || '').trim());
+    return false;
+  }
+  return true;
+}
+
+/**
+ * Subset every @font-face TrueType font referenced by the stylesheets.
+ * @returns {object} map of absolute .ttf path -> absolute .woff2 path
+ */
+function optimizeFonts(outDir, cssFiles, glyphText) {
+  var fontMap = {};
+  var fonts = [];
+
+  cssFiles.forEach(function(cssPath) {
+    var css = fs.readFileSync(cssPath, 'utf8');
+    var re = /url\(\s*['"]?([^'")]+\.ttf)['"]?\s*\)/g;
+    var m;
+    while ((m = re.exec(css)) !== null) {
+      var abs = path.resolve(path.dirname(cssPath), m[1]);
+      if (fonts.indexOf(abs) === -1 && fs.existsSync(abs)) fonts.push(abs);
+    }
+  });
+
+  if (fonts.length === 0) return fontMap;
+
+  if (!hasCommand('pyftsubset')) {
+    console.warn('! pyftsubset not found (pip install fonttools brotli); fonts left unchanged');
+    return fontMap;
+  }
+
+  var chars = Array.from(new Set(Array.from(glyphText + CONFIG.ALWAYS_GLYPHS))).join('');
+  var textFile = path.join(outDir, '.glyphs.txt');
+  fs.writeFileSync(textFile, chars, 'utf8');
+
+  fonts.forEach(function(src) {
+    var tmp = src.replace(/\.ttf$/, '.subset.woff2');
+    if (subsetFont(src, tmp, textFile)) {
+      var dest = src.replace(/\.ttf$/, '.' + hash(fs.readFileSync(tmp)) + '.woff2');
+      fs.renameSync(tmp, dest);
+      fontMap[src] = dest;
+    }
+  });
+
+  fs.unlinkSync(textFile);
+  console.log('Fonts: ' + Object.keys(fontMap).length + ' subset to ' + chars.length + ' characters');
+  return fontMap;
+}
+
+/** Absolute paths of the font files a stylesheet loads. */
+function fontFiles(css, cssDir) {
+  var files = [];
+  var re = /url\(\s*['"]?([^'")]+\.(?:ttf|woff2?|otf))['"]?\s*\)/g;
+  var m;
+  while ((m = re.exec(css)) !== null) {
+    var abs = path.resolve(cssDir, m[1]);
+    if (files.indexOf(abs) === -1) files.push(abs);
+  }
+  return files;
+}
+
+function applyFontMap(css, cssDir, fontMap) {
+  return css.replace(/url\(\s*(['"]?)([^'")]+\.ttf)\1\s*\)\s*format\(\s*['"]truetype['"]\s*\)/g,
+    function(match, q, ref) {
+      var abs = path.resolve(cssDir, ref);
+      if (!fontMap[abs]) return match;
+      return 'url(' + q + toPosix(path.relative(cssDir, fontMap[abs])) + q + ') format(\'woff2\')';
+    });
+}
+
+// =========================================================
+// JS
+// =========================================================
+
+var terser = null;
+try {
+  terser = require('terser');
+} catch (e) {
+  terser = null;
+}
+
+// Keywords after which a '/' starts a regular expression, not a division
+var REGEX_AFTER_WORD = /^(return|typeof|instanceof|in|of|new|delete|void|throw|case|do|else|yield|await)$/;
+
+function isWordChar(c) {
+  return !!c && (/[\w$]/.test(c) || c.charCodeAt(0) > 127);
+}
+
+/**
+ * Built-in fallback when terser is missing: drops comments, indentation
+ * and blank lines, and joins lines where no semicolon can be implied.
+ * Strings, template literals and regex literals are copied verbatim.
+ * Nothing is renamed, so the saving is smaller than terser's.
+ */
+function stripJs(code) {
+  var out = '';
+  var i = 0;
+  var len = code.length;
+  var lastWord = '';
+  var pendingSpace = false;
+  var pendingNewline = false;
+  // Brace depth of each open template-literal ${ } expression
+  var templates = [];
+  var depth = 0;
+
+  function last() {
+    return out[out.length - 1] || '';
+  }
+
+  function emit(text) {
+    var first = text[0];
+    if (pendingNewline && out && !/[{;,([]/.test(last()) && !/[}),;\]]/.test(first)) {
+      out += '\n';
+    } else if ((pendingSpace || pendingNewline) &&
+        ((isWordChar(last()) && isWordChar(first)) ||
+         (/[+-]/.test(last()) && /[+-]/.test(first)))) {
+      out += ' ';
+    }
+    pendingSpace = false;
+    pendingNewline = false;
+    out += text;
+  }
+
+  // Copy a template literal body from i (just after the backtick or the
+  // closing brace of a ${ } expression) until it ends or opens ${
+  function template() {
+    var start = i;
+    while (i < len) {
+      if (code[i] === '\\') {
+        i += 2;
+      } else if (code[i] === '`') {
+        i++;
+        emit(code.substring(start, i));
+        return;
+      } else if (code[i] === '$' && code[i + 1] === '{') {
+        i += 2;
+        emit(code.substring(start, i));
+        templates.push(depth);
+        depth++;
+        return;
+      } else {
+        i++;
+      }
+    }
+    emit(code.substring(start));
+  }
+
+  while (i < len) {
+    var c = code[i];
+    var next = code[i + 1];
+
+    if (c === '\n' || c === '\r') {
+      pendingNewline = true;
+      i++;
+    } else if (/\s/.test(c)) {
+      pendingSpace = true;
+      i++;
+    } else if (c === '/' && next === '/') {
+      while (i < len && code[i] !== '\n') i++;
+    } else if (c === '/' && next === '*') {
+      var endComment = code.indexOf('*/', i + 2);
+      endComment = endComment === -1 ? len : endComment + 2;
+      if (code.substring(i, endComment).indexOf('\n') !== -1) pendingNewline = true;
+      else pendingSpace = true;
+      i = endComment;
+    } else if (c === '"' || c === '\'') {
+      var endString = i + 1;
+      while (endString < len && code[endString] !== c && code[endString] !== '\n') {
+        if (code[endString] === '\\') endString++;
+        endString++;
+      }
+      emit(code.substring(i, endString + 1));
+      i = endString + 1;
+      lastWord = '';
+    } else if (c === '`') {
+      i++;
+      emit('`');
+      template();
+      lastWord = '';
+    } else if (c === '}' && templates.length && templates[templates.length - 1] === depth - 1) {
+      templates.pop();
+      depth--;
+      emit('}');
+      i++;
+      template();
+      lastWord = '';
+    } else if (c === '/' && (lastWord ? REGEX_AFTER_WORD.test(lastWord) :
+        !last() || /[(,=:[!&|?{};+\-*%<>~^]/.test(last()))) {
+      var endRegex = i + 1;
+      var inClass = false;
+      while (endRegex < len && code[endRegex] !== '\n') {
+        var r = code[endRegex];
+        if (r === '\\') {
+          endRegex++;
+        } else if (r === '[') {
+          inClass = true;
+        } else if (r === ']') {
+          inClass = false;
+        } else if (r === '/' && !inClass) {
+          break;
+        }
+        endRegex++;
+      }
+      endRegex++;
+      while (endRegex < len && /[a-z]/i.test(code[endRegex])) endRegex++;
+      emit(code.substring(i, endRegex));
+      i = endRegex;
+      lastWord = '';
+    } else if (isWordChar(c)) {
+      var endWord = i;
+      while (endWord < len && isWordChar(code[endWord])) endWord++;
+      lastWord = code.substring(i, endWord);
+      emit(lastWord);
+      i = endWord;
+    } else {
+      if (c === '{') depth++;
+      else if (c === '}') depth--;
+      emit(c);
+      i++;
+      lastWord = '';
+    }
+  }
+
+  return out;
+}
+
+function minifyJs(code) {
+  if (!terser) return Promise.resolve(stripJs(code));
+  return terser.minify(code, {
+    compress: true,
+    mangle: true,
+    format: { comments: false }
+  }).then(function(result) {
+    return result.code;
+  });
+}
+
+// =========================================================
+// MANIFEST
+// =========================================================
+
+/**
+ * Replace the <file> entries of every resource with the given lists.
+ * @param {object} filesByResource - identifier -> [href, ...]
+ */
+function rewriteManifest(xml, filesByResource) {
+  return xml.replace(
+    /(<resource\b[^>]*\bidentifier="([^"]+)"[^>]*>)([\s\S]*?)(<\/resource>)/g,
+    function(match, open, id, inner, close) {
+      if (!filesByResource[id]) return match;
+      var indent = (/\n([ \t]*)<file/.exec(inner) || [null, '      '])[1];
+      var deps = inner.match(/<dependency\b[^>]*\/>/g) || [];
+      var lines = filesByResource[id].map(function(href) {
+        return indent + '<file href="' + href + '"/>';
+      }).concat(deps.map(function(dep) {
+        return indent + dep;
+      }));
+      var closeIndent = (/\n([ \t]*)$/.exec(inner) || [null, '    '])[1];
+      return open + '\n' + lines.join('\n') + '\n' + closeIndent + close;
+    });
+}
+
+function readScoResources(xml) {
+  var scos = [];
+  var re = /<resource\b[^>]*\bidentifier="([^"]+)"[^>]*\bhref="([^"]+)"[^>]*>/g;
+  var m;
+  while ((m = re.exec(xml)) !== null) {
+    if (/adlcp:scormtype="sco"/i.test(m[0])) {
+      scos.push({ id: m[1], href: m[2] });
+    }
+  }
+  return scos;
+}
+
+// =========================================================
+// BUILD
+// =========================================================
+
+function parseArgs(argv) {
+  var args = { course: null, out: null };
+  for (var i = 0; i < argv.length; i++) {
+    if (argv[i] === '--out') {
+      args.out = argv[++i];
+    } else if (!args.course) {
+      args.course = argv[i];
+    }
+  }
+  return args;
+}
+
+async function build(courseDir, outDir) {
+  courseDir = realPath(courseDir);
+  outDir = realPath(outDir);
+
+  // The output folder is wiped first: it must not be, contain or sit
+  // inside the course (copyDir would also copy the output into itself)
+  if (isWithin(outDir, courseDir) || isWithin(courseDir, outDir)) {
+    throw new Error('Output folder must be outside the course folder and must not contain it: ' + outDir);
+  }
+
+  fs.rmSync(outDir, { recursive: true, force: true });
+  copyDir(courseDir, outDir);
+
+  var manifestPath = path.join(outDir, 'imsmanifest.xml');
+  var manifest = fs.readFileSync(manifestPath, 'utf8');
+  var scos = readScoResources(manifest);
+
+  // ── Gather every SCO's page and assets ─────────────────────
+  var pages = scos.map(function(sco) {
+    var htmlPath = path.join(outDir, sco.href);
+    var html = fs.readFileSync(htmlPath, 'utf8');
+    var assets = readPageAssets(html);
+    var dir = path.dirname(htmlPath);
+    return {
+      sco: sco,
+      htmlPath: htmlPath,
+      dir: dir,
+      html: html,
+      scripts: assets.scripts.map(function(s) { return path.resolve(dir, s); }),
+      styles: assets.styles.map(function(s) { return path.resolve(dir, s); })
+    };
+  });
+
+  // ── Before sizes (page + everything it loads) ──────────────
+  pages.forEach(function(page) {
+    var files = [page.htmlPath].concat(page.scripts, page.styles);
+    page.styles.forEach(function(cssPath) {
+      files = files.concat(fontFiles(fs.readFileSync(cssPath, 'utf8'), path.dirname(cssPath)));
+    });
+    page.before = files.reduce(function(sum, f) { return sum + fileSize(f); }, 0);
+  });
+
+  // ── 1. Fonts ───────────────────────────────────────────────
+  var allStyles = [];
+  var glyphText = '';
+  pages.forEach(function(page) {
+    page.styles.forEach(function(s) {
+      if (allStyles.indexOf(s) === -1) allStyles.push(s);
+    });
+    glyphText += textContent(page.html);
+    page.scripts.forEach(function(s) {
+      glyphText += fs.readFileSync(s, 'utf8');
+    });
+  });
+  var fontMap = optimizeFonts(outDir, allStyles, glyphText);
+
+  // ── 2 + 3. Per-SCO CSS and JS ──────────────────────────────
+  for (var p = 0; p < pages.length; p++) {
+    var page = pages[p];
+    var emitted = [];
+
+    // JS bundle, in original load order
+    var jsSources = page.scripts.map(function(s) {
+      return fs.readFileSync(s, 'utf8');
+    });
+    var bundle = await minifyJs(jsSources.join('\n;\n'));
+    var bundleName = 'sco.' + hash(bundle) + '.js';
+    fs.writeFileSync(path.join(page.dir, bundleName), bundle);
+    emitted.push(path.join(page.dir, bundleName));
+
+    // CSS: merge in cascade order, rebased to the SCO folder
+    var css = page.styles.map(function(cssPath) {
+      var text = stripComments(fs.readFileSync(cssPath, 'utf8'));
+      text = applyFontMap(text, path.dirname(cssPath), fontMap);
+      return rebaseUrls(text, path.dirname(cssPath), page.dir, outDir);
+    }).join('\n');
+    var nodes = parseCss(css);
+
+    var used = collectTokens([page.html].concat(jsSources));
+    var fullCss = serializeCss(pruneCss(nodes, used));
+    var cssName = 'sco.' + hash(fullCss) + '.css';
+    fs.writeFileSync(path.join(page.dir, cssName), fullCss);
+    emitted.push(path.join(page.dir, cssName));
+
+    // Critical CSS: what the first slide and the player chrome need
+    var critical = collectTokens([firstPaintMarkup(page.html)]);
+    var criticalCss = serializeCss(pruneCss(parseCss(css), critical));
+
+    // Rewrite the page
+    var html = page.html;
+    html = html.replace(/[ \t]*<!--[^>]*(?:CSS|SCORM API|Preload)[^>]*-->\s*\n/g, '');
+    html = html.replace(/[ \t]*<link\b[^>]*rel="(?:stylesheet|preload)"[^>]*>\s*\n/g, '');
+    html = html.replace(/[ \t]*<!--[^>]*-->\s*\n(?=\s*<script\b[^>]*\bsrc=)/g, '');
+    html = html.replace(/[ \t]*<script\b[^>]*\bsrc="[^"]+"[^>]*>\s*<\/script>\s*\n/g, '');
+    html = html.replace('</head>',
+      '  <style>' + criticalCss + '</style>\n' +
+      '  <link rel="preload" href="' + cssName + '" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n' +
+      '  <noscript><link rel="stylesheet" href="' + cssName + '"></noscript>\n' +
+      '</head>');
+    html = html.replace('</body>', '  <script src="' + bundleName + '"></script>\n\n</body>');
+    fs.writeFileSync(page.htmlPath, html);
+
+    // Loose per-SCO scripts are now inside the bundle
+    page.scripts.forEach(function(s) {
+      if (path.dirname(s) === page.dir && fs.existsSync(s)) fs.unlinkSync(s);
+    });
+
+    page.emitted = emitted;
+    page.after = [page.htmlPath].concat(emitted, fontFiles(fullCss, page.dir))
+      .reduce(function(sum, f) { return sum + fileSize(f); }, 0);
+  }
+
+  // ── 4. Remove unreferenced shared files, regenerate manifest ──
+  var sharedDir = path.join(outDir, 'shared');
+  var referenced = new Set();
+  pages.forEach(function(page) {
+    var texts = [fs.readFileSync(page.htmlPath, 'utf8')].concat(page.emitted.map(function(f) {
+      return fs.readFileSync(f, 'utf8');
+    }));
+    texts.forEach(function(text) {
+      var re = /(?:src|href)="([^"]+)"/g;
+      var m;
+      while ((m = re.exec(text)) !== null) {
+        if (isExternalRef(m[1])) continue;
+        referenced.add(path.resolve(page.dir, m[1]));
+      }
+      replaceUrls(text, function(ref) {
+        referenced.add(path.resolve(page.dir, ref));
+        return null;
+      });
+    });
+  });
+
+  var sharedFiles = [];
+  if (fs.existsSync(sharedDir)) {
+    walk(sharedDir).forEach(function(f) {
+      var keep = referenced.has(f) || CONFIG.KEEP_SHARED.some(function(re) { return re.test(f); });
+      if (keep) {
+        sharedFiles.push(toPosix(path.relative(outDir, f)));
+      } else {
+        fs.unlinkSync(f);
+      }
+    });
+  }
+
+  if (fs.existsSync(sharedDir)) removeEmptyDirs(sharedDir);
+
+  var filesByResource = { shared_resources: sharedFiles.sort() };
+  pages.forEach(function(page) {
+    filesByResource[page.sco.id] = [page.htmlPath].concat(page.emitted).map(function(f) {
+      return toPosix(path.relative(outDir, f));
+    });
+  });
+  fs.writeFileSync(manifestPath, rewriteManifest(manifest, filesByResource));
+
+  // ── 5. Report ──────────────────────────────────────────────
+  if (!terser) {
+    console.warn('! terser not installed (npm install terser); bundles only had comments and whitespace stripped');
+  }
+  console.log('');
+  console.log(pad('SCO', 12, true) + pad('before', 12) + pad('after', 12) + pad('saved', 9));
+  var totalBefore = 0;
+  var totalAfter = 0;
+  pages.forEach(function(page) {
+    totalBefore += page.before;
+    totalAfter += page.after;
+    console.log(
+      pad(page.sco.id, 12, true) +
+      pad(formatBytes(page.before), 12) +
+      pad(formatBytes(page.after), 12) +
+      pad(Math.round((1 - page.after / page.before) * 100) + '%', 9)
+    );
+  });
+  console.log(
+    pad('total', 12, true) +
+    pad(formatBytes(totalBefore), 12) +
+    pad(formatBytes(totalAfter), 12) +
+    pad(Math.round((1 - totalAfter / totalBefore) * 100) + '%', 9)
+  );
+  console.log('\nOptimized package written to ' + toPosix(path.relative(process.cwd(), outDir)));
+}
+
+// =========================================================
+// CLI
+// =========================================================
+
+if (require.main === module) {
+  var args = parseArgs(process.argv.slice(2));
+  if (!args.course) {
+    console.error('Usage: node scripts/optimize-package.js <course-folder> [--out <folder>]');
+    process.exit(1);
+  }
+  var out = args.out || path.join('dist', path.basename(path.resolve(args.course)));
+
+  build(args.course, out).catch(function(err) {
+    console.error(err.stack || err.message);
+    process.exit(1);
+  });
+}
+
+module.exports = {
+  stripJs: stripJs,
+  rebaseUrls: rebaseUrls,
+  build: build,
+  parseCss: parseCss,
+  pruneCss: pruneCss,
+  serializeCss: serializeCss
+};
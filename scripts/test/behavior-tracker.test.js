@@ -0,0 +1,81 @@
+/**
+ * Tests for output/njr01-u03/shared/behavior-tracker.js
+ * Run: node --test scripts/test/
+ */
+
+'use strict';
+
+var test = require('node:test');
+var assert = require('node:assert');
+var fs = require('fs');
+var path = require('path');
+var vm = require('vm');
+
+var dom = require('../benchmark/dom');
+var MockLMS = require('../benchmark/lms').MockLMS;
+
+var SHARED = path.join(__dirname, '..', '..', 'output', 'njr01-u03', 'shared');
+
+/**
+ * A page with the given LMS as window.API and the given shared scripts
+ * loaded.
+ */
+function createPage(scripts, lms) {
+  var loop = new dom.EventLoop();
+  var page = dom.createWindow({
+    html: '<!DOCTYPE html><html><head></head><body></body></html>',
+    url: 'file:///course/sco/index.html',
+    loop: loop
+  });
+  page.window.API = lms.api;
+  scripts.forEach(function(file) {
+    var filename = path.join(SHARED, file);
+    vm.runInContext(fs.readFileSync(filename, 'utf8'), page.context, { filename: filename });
+  });
+  return { window: page.window, loop: loop };
+}
+
+function startTracker(page) {
+  var scorm = new page.window.SCORMWrapper();
+  scorm.initialize();
+  var tracker = new page.window.BehaviorTracker(scorm);
+  tracker.startSession();
+  return tracker;
+}
+
+test('without SuspendStore the tracker writes and restores suspend_data itself', function() {
+  var lms = new MockLMS();
+  var page = createPage(['scorm-api.js', 'behavior-tracker.js'], lms);
+  var tracker = startTracker(page);
+  tracker.trackPageView('intro');
+  page.loop.advance(1000);
+  tracker.trackPageView('lesson-1');
+  tracker.endSession();
+
+  var stored = JSON.parse(lms.committed('cmi.suspend_data'));
+  assert.strictEqual(typeof stored.v, 'number');
+
+  lms.reload();
+  var resumed = startTracker(createPage(['scorm-api.js', 'behavior-tracker.js'], lms));
+  assert.strictEqual(Object.keys(resumed.data.timing.pages).length, 2);
+  assert.strictEqual(resumed.data.timing.sessionDuration, stored.t.sd * 1000);
+});
+
+test('help events keep their strings past 65,535 distinct targets', function() {
+  var page = createPage(['scorm-api.js', 'behavior-tracker.js'], new MockLMS());
+  var tracker = startTracker(page);
+  var count = 70000;
+  for (var i = 0; i < count; i++) {
+    tracker.trackHelpSeeking(i % 2 ? 'glossary' : 'reference', 'term-' + i);
+  }
+
+  assert.ok(tracker._strings.length <= 1024, 'string table grew to ' + tracker._strings.length);
+  tracker._materializeEvents();
+  var events = tracker.data.engagement.helpSeekingEvents;
+  assert.strictEqual(events.length, 50);
+  events.forEach(function(event, n) {
+    var i = count - 50 + n;
+    assert.strictEqual(event.type, i % 2 ? 'glossary' : 'reference');
+    assert.strictEqual(event.target, 'term-' + i);
+  });
+});
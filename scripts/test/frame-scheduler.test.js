@@ -0,0 +1,74 @@
+/**
+ * Tests for output/njr01-u03/shared/engine/frame-scheduler.js
+ * Run: node --test scripts/test/
+ */
+
+'use strict';
+
+var test = require('node:test');
+var assert = require('node:assert');
+var fs = require('fs');
+var path = require('path');
+var vm = require('vm');
+
+var SOURCE = path.join(__dirname, '..', '..', 'output', 'njr01-u03', 'shared', 'engine', 'frame-scheduler.js');
+
+/**
+ * A FrameScheduler on a manual clock: timeouts and animation frames only
+ * run when the test calls fireTimers() / frame().
+ */
+function createScheduler() {
+  var clock = { now: 0, frames: [], timers: [] };
+  var context = {
+    console: console,
+    performance: { now: function() { return clock.now; } },
+    requestAnimationFrame: function(fn) { clock.frames.push(fn); return clock.frames.length; },
+    setTimeout: function(fn) { clock.timers.push(fn); return clock.timers.length; },
+    clearTimeout: function() {}
+  };
+  context.window = context;
+  vm.createContext(context);
+  vm.runInContext(fs.readFileSync(SOURCE, 'utf8'), context, { filename: SOURCE });
+
+  return {
+    scheduler: new context.FrameScheduler(),
+    advance: function(ms) { clock.now += ms; },
+    fireTimers: function() {
+      var timers = clock.timers;
+      clock.timers = [];
+      timers.forEach(function(fn) { fn(); });
+    },
+    frame: function() {
+      var frames = clock.frames;
+      clock.frames = [];
+      frames.forEach(function(fn) { fn(clock.now); });
+    }
+  };
+}
+
+test('after() runs its callback in the first frame after the delay', function() {
+  var env = createScheduler();
+  var calls = 0;
+  env.scheduler.after(100, function() { calls++; });
+
+  env.advance(100);
+  env.fireTimers();
+  assert.strictEqual(calls, 0);
+  env.frame();
+  assert.strictEqual(calls, 1);
+});
+
+test('cancel() between the timer firing and the frame stops the callback', function() {
+  var env = createScheduler();
+  var calls = [];
+  var first = env.scheduler.after(100, function() { calls.push('first'); });
+  env.scheduler.after(100, function() { calls.push('second'); });
+  env.scheduler.once(function() { calls.push('once'); });
+
+  env.advance(100);
+  env.fireTimers();
+  first.cancel();
+  env.frame();
+
+  assert.deepStrictEqual(calls, ['once', 'second']);
+});
@@ -0,0 +1,63 @@
+/**
+ * Tests for scripts/optimize-package.js
+ * Run: node --test scripts/test/
+ */
+
+'use strict';
+
+var test = require('node:test');
+var assert = require('node:assert');
+var fs = require('fs');
+var os = require('os');
+var path = require('path');
+
+var build = require('../optimize-package').build;
+
+/** A throwaway course folder: <tmp>/work/course/imsmanifest.xml */
+function makeCourse() {
+  var root = fs.mkdtempSync(path.join(os.tmpdir(), 'optimize-'));
+  var course = path.join(root, 'work', 'course');
+  fs.mkdirSync(course, { recursive: true });
+  fs.writeFileSync(path.join(course, 'imsmanifest.xml'), '<manifest/>');
+  return { root: root, course: course };
+}
+
+function assertIntact(course) {
+  assert.ok(fs.existsSync(path.join(course, 'imsmanifest.xml')), 'course was modified');
+  assert.deepStrictEqual(fs.readdirSync(course), ['imsmanifest.xml']);
+}
+
+test('refuses an output folder that contains the course', async function() {
+  var t = makeCourse();
+  try {
+    await assert.rejects(build(t.course, path.dirname(t.course)), /outside the course/);
+    await assert.rejects(build(t.course, t.root), /outside the course/);
+    assertIntact(t.course);
+  } finally {
+    fs.rmSync(t.root, { recursive: true, force: true });
+  }
+});
+
+test('refuses an output folder inside the course', async function() {
+  var t = makeCourse();
+  try {
+    await assert.rejects(build(t.course, path.join(t.course, 'dist')), /outside the course/);
+    await assert.rejects(build(t.course, path.join(t.course, 'a', '..', 'dist', 'x')), /outside the course/);
+    assertIntact(t.course);
+  } finally {
+    fs.rmSync(t.root, { recursive: true, force: true });
+  }
+});
+
+test('refuses the course folder itself, also through a symlink', async function() {
+  var t = makeCourse();
+  try {
+    var link = path.join(t.root, 'link');
+    fs.symlinkSync(path.dirname(t.course), link);
+    await assert.rejects(build(t.course, t.course), /outside the course/);
+    await assert.rejects(build(t.course, link), /outside the course/);
+    assertIntact(t.course);
+  } finally {
+    fs.rmSync(t.root, { recursive: true, force: true });
+  }
+});
@@ -0,0 +1,135 @@
+/**
+ * Tests for output/njr01-u03/shared/suspend-store.js
+ * Run: node --test scripts/test/
+ */
+
+'use strict';
+
+var test = require('node:test');
+var assert = require('node:assert');
+var fs = require('fs');
+var path = require('path');
+var vm = require('vm');
+
+var dom = require('../benchmark/dom');
+var MockLMS = require('../benchmark/lms').MockLMS;
+
+var SHARED = path.join(__dirname, '..', '..', 'output', 'njr01-u03', 'shared');
+
+/**
+ * A page with the stand-in LMS as window.API and the given shared
+ * scripts loaded, resuming from suspendData when it is set.
+ */
+function createPage(scripts, suspendData) {
+  var lms = new MockLMS();
+  if (suspendData) {
+    lms._committed['cmi.suspend_data'] = suspendData;
+    lms.reload();
+  }
+  var loop = new dom.EventLoop();
+  var page = dom.createWindow({
+    html: '<!DOCTYPE html><html><head></head><body></body></html>',
+    url: 'file:///course/sco/index.html',
+    loop: loop
+  });
+  page.window.API = lms.api;
+  scripts.forEach(function(file) {
+    var filename = path.join(SHARED, file);
+    vm.runInContext(fs.readFileSync(filename, 'utf8'), page.context, { filename: filename });
+  });
+  return { window: page.window, lms: lms, loop: loop };
+}
+
+/** suspend_data as the store would write it. */
+function encodeFrame(values) {
+  return createPage(['suspend-store.js']).window.SuspendStore.codec.encodeFrame(values);
+}
+
+/** Copy a value out of the page realm so deepStrictEqual can compare it. */
+function plain(value) {
+  return JSON.parse(JSON.stringify(value));
+}
+
+function connect(window) {
+  var scorm = new window.SCORMWrapper();
+  scorm.initialize();
+  return scorm;
+}
+
+test('an AchievementSystem created before the store is bound keeps LMS badges', function() {
+  var stored = encodeFrame({ nav: 2, ach: ['first_lesson', 'quiz_ace'] });
+
+  var page = createPage(['scorm-api.js', 'suspend-store.js', 'engine/achievement-system.js'], stored);
+  var achievements = new page.window.AchievementSystem();
+  assert.strictEqual(achievements.isEarned('first_lesson'), false);
+  achievements.unlock('perfect_quiz');
+
+  // The SCO binds the shared store after the engine was created
+  var store = page.window.SuspendStore.get(connect(page.window));
+
+  assert.strictEqual(achievements.isEarned('first_lesson'), true);
+  assert.strictEqual(achievements.isEarned('perfect_quiz'), true);
+  assert.deepStrictEqual(plain(store.get('ach')).sort(), ['first_lesson', 'perfect_quiz', 'quiz_ace']);
+  assert.strictEqual(store.get('nav'), 2);
+
+  // The merged value is saved without another unlock
+  page.loop.advance(10);
+  var saved = page.window.SuspendStore.codec.decodeFrame(page.lms.committed('cmi.suspend_data'));
+  assert.deepStrictEqual(plain(saved.ach).sort(), ['first_lesson', 'perfect_quiz', 'quiz_ace']);
+  assert.strictEqual(saved.nav, 2);
+});
+
+test('a namespace set before binding without a merge hook keeps its value', function() {
+  var stored = encodeFrame({ nav: 2, g: { xp: 40 } });
+
+  var page = createPage(['scorm-api.js', 'suspend-store.js'], stored);
+  var early = page.window.SuspendStore.get();
+  var bound = [];
+  early.onBind(function(store) { bound.push(store); });
+  early.set('nav', 5);
+
+  var store = page.window.SuspendStore.get(connect(page.window));
+  assert.strictEqual(store, early);
+  assert.deepStrictEqual(bound, [store]);
+  assert.strictEqual(store.get('nav'), 5);
+  assert.deepStrictEqual(plain(store.get('g')), { xp: 40 });
+});
+
+test('a background save commits writes the wrapper has not committed yet', function() {
+  var page = createPage(['scorm-api.js', 'suspend-store.js']);
+  var scorm = connect(page.window);
+  var store = page.window.SuspendStore.get(scorm);
+  store.set('nav', 1);
+  store.flush();
+  var commits = page.lms.log.calls.LMSCommit;
+
+  // Unchanged suspend_data and nothing else pending: no round trip
+  store.save();
+  page.loop.advance(10);
+  assert.strictEqual(page.lms.log.calls.LMSCommit, commits);
+
+  // A score set without its own commit still goes out with the save
+  scorm.setScore(80, 100, 0);
+  store.save();
+  page.loop.advance(10);
+  assert.strictEqual(page.lms.log.calls.LMSCommit, commits + 1);
+  assert.strictEqual(page.lms.committed('cmi.core.score.raw'), '80');
+});
+
+test('a buffered wrapper with dirty writes is committed by a background save', function() {
+  var page = createPage(['scorm-api.js', 'suspend-store.js']);
+  var scorm = new page.window.SCORMWrapper({ buffered: true, commitDelay: 50 });
+  scorm.initialize();
+  page.loop.advance(5000);
+  var store = page.window.SuspendStore.get(scorm);
+  store.set('nav', 1);
+  store.flush();
+  page.loop.advance(5000);
+
+  scorm.setValue('cmi.core.lesson_location', '3');
+  assert.strictEqual(scorm.hasPendingWrites(), true);
+  store.save();
+  page.loop.advance(5000);
+  assert.strictEqual(scorm.hasPendingWrites(), false);
+  assert.strictEqual(page.lms.committed('cmi.core.lesson_location'), '3');
+});